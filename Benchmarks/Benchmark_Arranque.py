@@ -0,0 +1,80 @@
+"""Benchmark del tiempo de arranque de los núcleos de cómputo.
+
+Lanza un intérprete nuevo por cada medición, importa el núcleo indicado y mide
+el tiempo de importación y el tiempo total del proceso. Falla (código de salida
+1) si alguna mediana supera el límite o si el núcleo arrastra bibliotecas de
+interfaz (matplotlib, tkinter, networkx), que solo deben cargarse al construir
+un visualizador.
+
+    python Benchmarks/Benchmark_Arranque.py
+    python Benchmarks/Benchmark_Arranque.py --repeticiones 20 --limite-ms 250
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+NUCLEOS = {
+    'Pokemon': 'Primer Punto',
+    'Spotify': 'Segundo Punto',
+    'Pista_Carreras': 'Tercer Punto',
+}
+MODULOS_PROHIBIDOS = ('matplotlib', 'tkinter', 'networkx')
+
+CODIGO_MEDICION = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+segundos = time.perf_counter() - inicio
+prohibidos = sorted({{m.split('.')[0] for m in sys.modules}} & set({prohibidos!r}))
+print(json.dumps({{'importacion': segundos, 'prohibidos': prohibidos}}))
+"""
+
+
+def medir(modulo, carpeta):
+    """Devuelve (segundos de importación, segundos del proceso, módulos prohibidos)"""
+    codigo = CODIGO_MEDICION.format(modulo=modulo, prohibidos=MODULOS_PROHIBIDOS)
+    inicio = time.perf_counter()
+    resultado = subprocess.run([sys.executable, '-c', codigo], cwd=os.path.join(RAIZ, carpeta),
+                               capture_output=True, text=True, check=True)
+    total = time.perf_counter() - inicio
+    datos = json.loads(resultado.stdout.strip().splitlines()[-1])
+    return datos['importacion'], total, datos['prohibidos']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importación de los núcleos de cómputo")
+    parser.add_argument('--repeticiones', type=int, default=10)
+    parser.add_argument('--limite-ms', type=float, default=200.0,
+                        help="mediana máxima permitida del tiempo de importación")
+    args = parser.parse_args(argv)
+
+    fallos = []
+    print(f"{'Módulo':<16}{'Import (ms)':>14}{'Proceso (ms)':>14}")
+    for modulo, carpeta in NUCLEOS.items():
+        importaciones, procesos, prohibidos = [], [], set()
+        for _ in range(args.repeticiones):
+            importacion, total, cargados = medir(modulo, carpeta)
+            importaciones.append(importacion * 1000)
+            procesos.append(total * 1000)
+            prohibidos.update(cargados)
+
+        mediana = statistics.median(importaciones)
+        print(f"{modulo:<16}{mediana:>14.1f}{statistics.median(procesos):>14.1f}")
+        if mediana > args.limite_ms:
+            fallos.append(f"{modulo}: {mediana:.1f} ms supera el límite de {args.limite_ms:.1f} ms")
+        if prohibidos:
+            fallos.append(f"{modulo}: carga bibliotecas de interfaz ({', '.join(sorted(prohibidos))})")
+
+    for fallo in fallos:
+        print(f"REGRESIÓN: {fallo}", file=sys.stderr)
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
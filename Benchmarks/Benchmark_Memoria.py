@@ -0,0 +1,111 @@
+"""Benchmark de memoria por individuo de las distintas representaciones.
+
+Mide con tracemalloc los bytes reservados al construir N individuos con cada
+representación: objetos con __slots__, los mismos objetos con __dict__ (como
+referencia), la población en arreglos del motor vectorizado (float64 y float32)
+con sus proxies, y el enjambre PSO en estructura de arreglos. Para el motor
+vectorizado también informa el pico durante una generación completa.
+
+    python Benchmarks/Benchmark_Memoria.py
+    python Benchmarks/Benchmark_Memoria.py --individuos 5000000 --json
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, os.path.join(RAIZ, 'Primer Punto'))
+sys.path.insert(0, os.path.join(RAIZ, 'Tercer Punto'))
+
+import Pokemon
+import Pista_Carreras
+
+
+def medir(construir):
+    """Devuelve (objeto construido, bytes retenidos, bytes pico) de `construir()`"""
+    gc.collect()
+    tracemalloc.start()
+    resultado = construir()
+    retenidos, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, retenidos, pico
+
+
+def con_dict(clase):
+    """Subclase sin __slots__: cada instancia vuelve a tener __dict__"""
+    return type(clase.__name__ + 'ConDict', (clase,), {})
+
+
+def medir_objetos(n):
+    resultados = {}
+    casos = {
+        'Pokemon (__slots__)': Pokemon.Pokemon,
+        'Pokemon (__dict__)': con_dict(Pokemon.Pokemon),
+        'ControladorGenetico (__slots__)': Pista_Carreras.ControladorGenetico,
+        'ControladorGenetico (__dict__)': con_dict(Pista_Carreras.ControladorGenetico),
+    }
+    for nombre, clase in casos.items():
+        poblacion, retenidos, _ = medir(lambda: [clase() for _ in range(n)])
+        resultados[nombre] = {'bytes_por_individuo': retenidos / n}
+        del poblacion
+    return resultados
+
+
+def medir_vectorizado(n, dtype):
+    ag, retenidos, _ = medir(lambda: crear_vectorizado(n, dtype))
+    _, _, pico = medir(ag.ejecutar_generacion)
+
+    # Un proxy por individuo solo cuesta dos referencias
+    vista = ag.poblacion
+    proxies, bytes_proxies, _ = medir(lambda: [vista[i] for i in range(min(n, 100_000))])
+    return {'bytes_por_individuo': retenidos / n, 'pico_generacion_por_individuo': pico / n,
+            'bytes_por_proxy': bytes_proxies / len(proxies)}
+
+
+def crear_vectorizado(n, dtype):
+    ag = Pokemon.AlgoritmoGeneticoVectorizado(n, 1, Pokemon.MUTACION_PROB, Pokemon.ELITISMO, semilla=0,
+                                              dtype=dtype)
+    ag.inicializar_poblacion()
+    return ag
+
+
+def medir_pso(n):
+    enjambre, retenidos, _ = medir(lambda: Pista_Carreras.ControladorPSO(n, np.random.default_rng(0)))
+    return {'bytes_por_individuo': retenidos / n}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide los bytes por individuo de cada representación")
+    parser.add_argument('--individuos', type=int, default=1_000_000,
+                        help="tamaño de las poblaciones en arreglos")
+    parser.add_argument('--objetos', type=int, default=200_000,
+                        help="tamaño de las poblaciones de objetos (más lentas de construir)")
+    parser.add_argument('--json', action='store_true', help="imprime los resultados como JSON")
+    args = parser.parse_args(argv)
+
+    resultados = medir_objetos(args.objetos)
+    resultados['Vectorizado float64'] = medir_vectorizado(args.individuos, np.float64)
+    resultados['Vectorizado float32'] = medir_vectorizado(args.individuos, np.float32)
+    resultados['Enjambre PSO (arreglos)'] = medir_pso(args.individuos)
+
+    if args.json:
+        print(json.dumps(resultados, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"{'Representación':<34}{'Bytes/ind.':>12}{'Pico gen.':>12}{'Proxy':>8}")
+    for nombre, datos in resultados.items():
+        pico = datos.get('pico_generacion_por_individuo')
+        proxy = datos.get('bytes_por_proxy')
+        print(f"{nombre:<34}{datos['bytes_por_individuo']:>12.1f}"
+              f"{(f'{pico:.1f}' if pico is not None else '-'):>12}"
+              f"{(f'{proxy:.0f}' if proxy is not None else '-'):>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
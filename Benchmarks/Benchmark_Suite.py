@@ -0,0 +1,356 @@
+"""Suite de benchmarks reproducible de los tres simuladores.
+
+Mide, con semillas fijas y a tamaños crecientes:
+
+- `AlgoritmoGenetico.ejecutar_generacion` (objetos y vectorizado), de 20 a 10^6 individuos.
+- `UsuarioHormiga.construir_playlist` y una iteración completa de la colonia,
+  con catálogos sintéticos de 10 a 10^5 canciones, también repartida entre
+  procesos (Colonia_Paralela, un trabajador por núcleo).
+- `SistemaCarreras.ejecutar_generacion_genetica`, `ejecutar_hormigas` y
+  `ControladorPSO.decidir_adelantamiento`.
+
+Cada medición informa la mediana de segundos por llamada, el rendimiento
+(individuos/s, pasos-hormiga/s o partículas/s) y el pico de memoria medido con
+tracemalloc en una corrida aparte (tracemalloc frena el código y no debe
+contaminar los tiempos). Los resultados se guardan como JSON para comparar
+entre commits: con `--comparar` la suite falla (código de salida 1) si alguna
+mediana empeora más que `--umbral` respecto a la referencia.
+
+Los tamaños de un caso se recorren de menor a mayor y se dejan de medir en
+cuanto una llamada supera `--presupuesto` segundos, o si la memoria estimada
+del tamaño pasa de `--limite-memoria-gb` (feromonas densas de n x n).
+
+    python Benchmarks/Benchmark_Suite.py --salida base.json
+    python Benchmarks/Benchmark_Suite.py --comparar base.json --umbral 0.15
+    python Benchmarks/Benchmark_Suite.py --rapido --casos ag. carreras.pso
+"""
+import argparse
+import atexit
+import datetime
+import functools
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, os.path.join(RAIZ, 'Primer Punto'))
+sys.path.insert(0, os.path.join(RAIZ, 'Segundo Punto'))
+sys.path.insert(0, os.path.join(RAIZ, 'Tercer Punto'))
+
+import Pokemon
+import Spotify
+import Colonia_Paralela
+import Pista_Carreras
+
+SEMILLA = 12345
+TAMANO_RAPIDO = 10_000  # Tamaño máximo con --rapido
+
+# preparar(n, semilla) devuelve una función sin argumentos que ejecuta una
+# llamada y devuelve cuántas unidades procesó; memoria(n) estima los bytes
+Caso = namedtuple('Caso', ['nombre', 'unidad', 'tamanos', 'preparar', 'memoria'])
+
+
+def sembrar(semilla):
+    random.seed(semilla)
+    np.random.seed(semilla)
+
+
+# Primer punto
+def preparar_ag_objetos(n, semilla):
+    ag = Pokemon.AlgoritmoGenetico(n, 1, Pokemon.MUTACION_PROB, Pokemon.ELITISMO, semilla=semilla)
+    ag.inicializar_poblacion()
+
+    def paso():
+        ag.ejecutar_generacion()
+        return n
+    return paso
+
+
+def preparar_ag_vectorizado(n, semilla):
+    ag = Pokemon.AlgoritmoGeneticoVectorizado(n, 1, Pokemon.MUTACION_PROB, Pokemon.ELITISMO, semilla=semilla)
+    ag.inicializar_poblacion()
+
+    def paso():
+        ag.ejecutar_generacion()
+        return n
+    return paso
+
+
+# Segundo punto
+def catalogo_sintetico(n, semilla):
+    """`n` canciones con características uniformes en [0, 1)"""
+    valores = np.random.default_rng(semilla).random((n, len(Spotify.CARACTERISTICAS)))
+    return {f'song{i + 1}': dict(zip(Spotify.CARACTERISTICAS, fila)) for i, fila in enumerate(valores.tolist())}
+
+
+def memoria_feromonas(n):
+    return 16 * n * n  # Matrices densas de feromonas y similitud en float64
+
+
+def memoria_feromonas_vecinos(n):
+    return 8 * n * n  # Con listas de candidatos no hay matriz de similitud
+
+
+def memoria_feromonas_paralela(n):
+    return 32 * n * n  # Las matrices densas y su copia en memoria compartida
+
+
+def memoria_feromonas_dispersas(n):
+    return 16 * 20 * n + 32_000_000  # Vecinos (n, 20) y el bloque de la búsqueda por fuerza bruta
+
+
+def preparar_playlist(n, semilla):
+    sistema = Spotify.SistemaRecomendacion(catalogo_sintetico(n, semilla))
+    hormiga = Spotify.UsuarioHormiga(0, sistema.tipos_usuario['Rockero'])
+
+    def paso():
+        return len(hormiga.construir_playlist(sistema)) - 1
+    return paso
+
+
+def preparar_colonia(n, semilla, num_hormigas=Spotify.NUM_HORMIGAS, vecinos=None, feromonas_dispersas=False):
+    sistema = Spotify.SistemaRecomendacion(catalogo_sintetico(n, semilla), semilla, vecinos,
+                                           feromonas_dispersas=feromonas_dispersas)
+    preferencias = sistema.tipos_usuario['Rockero']
+    pasos = num_hormigas * (min(n, 8) - 1)
+
+    def paso():
+        sistema.ejecutar_iteracion(preferencias, num_hormigas)
+        return pasos
+    return paso
+
+
+colonias_abiertas = []
+
+
+def cerrar_colonias():
+    while colonias_abiertas:
+        colonias_abiertas.pop().cerrar()
+
+
+atexit.register(cerrar_colonias)
+
+
+def preparar_colonia_paralela(n, semilla, num_hormigas=500):
+    # Una colonia abierta a la vez: la del tamaño anterior se cierra aquí y la última al salir
+    cerrar_colonias()
+    sistema = Spotify.SistemaRecomendacion(catalogo_sintetico(n, semilla), semilla)
+    colonia = Colonia_Paralela.ColoniaParalela(sistema, semilla=semilla)
+    colonia.iniciar()
+    colonias_abiertas.append(colonia)
+    preferencias = sistema.tipos_usuario['Rockero']
+    pasos = num_hormigas * (min(n, 8) - 1)
+
+    def paso():
+        colonia.ejecutar_iteracion(preferencias, num_hormigas)
+        return pasos
+    return paso
+
+
+# Tercer punto
+def preparar_carreras_genetico(n, semilla):
+    sistema = Pista_Carreras.SistemaCarreras(poblacion_size=n, semilla=semilla)
+    sistema.inicializar_poblacion_genetica()
+
+    def paso():
+        sistema.ejecutar_generacion_genetica()
+        return n
+    return paso
+
+
+def preparar_carreras_hormigas(n, semilla):
+    sistema = Pista_Carreras.SistemaCarreras(semilla=semilla)
+    sistema.hormigas = [Pista_Carreras.HormigaRacing(i) for i in range(n)]
+
+    def paso():
+        sistema.ejecutar_hormigas()
+        return sum(len(hormiga.trayectoria) for hormiga in sistema.hormigas)
+    return paso
+
+
+def preparar_carreras_pso(n, semilla):
+    enjambre = Pista_Carreras.ControladorPSO(n, np.random.default_rng(semilla))
+    controlador = Pista_Carreras.ControladorGenetico(0.5, 0.3, 0.7)
+    oponentes = [2.5, 4.0, 7.5]
+
+    def paso():
+        enjambre.decidir_adelantamiento(oponentes, None, controlador)
+        return n
+    return paso
+
+
+POTENCIAS = (20, 100, 1_000, 10_000, 100_000, 1_000_000)
+CATALOGOS = (10, 100, 1_000, 10_000, 100_000)
+
+CASOS = [
+    Caso('ag.objetos.generacion', 'individuos', POTENCIAS, preparar_ag_objetos, None),
+    Caso('ag.vectorizado.generacion', 'individuos', POTENCIAS, preparar_ag_vectorizado, None),
+    Caso('aco.construir_playlist', 'pasos-hormiga', CATALOGOS, preparar_playlist, memoria_feromonas),
+    Caso('aco.iteracion', 'pasos-hormiga', CATALOGOS, preparar_colonia, memoria_feromonas),
+    Caso('aco.iteracion_500_hormigas', 'pasos-hormiga', CATALOGOS,
+         functools.partial(preparar_colonia, num_hormigas=500), memoria_feromonas),
+    Caso('aco.iteracion_500_hormigas_k20', 'pasos-hormiga', CATALOGOS,
+         functools.partial(preparar_colonia, num_hormigas=500, vecinos=20), memoria_feromonas_vecinos),
+    Caso('aco.iteracion_500_hormigas_paralela', 'pasos-hormiga', CATALOGOS, preparar_colonia_paralela,
+         memoria_feromonas_paralela),
+    Caso('aco.iteracion_500_hormigas_k20_dispersas', 'pasos-hormiga', CATALOGOS,
+         functools.partial(preparar_colonia, num_hormigas=500, vecinos=20, feromonas_dispersas=True),
+         memoria_feromonas_dispersas),
+    Caso('carreras.generacion_genetica', 'individuos', (15,) + POTENCIAS[1:-1], preparar_carreras_genetico, None),
+    Caso('carreras.hormigas', 'pasos-hormiga', (10, 100, 1_000, 10_000), preparar_carreras_hormigas, None),
+    Caso('carreras.pso', 'partículas', POTENCIAS, preparar_carreras_pso, None),
+]
+
+
+def medir_tiempo(caso, n, semilla, repeticiones, tiempo_minimo):
+    """Devuelve (mediana de segundos por llamada, unidades por segundo)
+
+    Hace al menos `repeticiones` llamadas y, si son rápidas, sigue hasta sumar
+    `tiempo_minimo` segundos para que la mediana de los tamaños chicos sea estable.
+    """
+    sembrar(semilla)
+    paso = caso.preparar(n, semilla)
+    paso()  # Calentamiento: la primera generación evalúa toda la población
+    gc.collect()
+    tiempos, unidades = [], 0
+    while len(tiempos) < repeticiones or sum(tiempos) < tiempo_minimo:
+        inicio = time.perf_counter()
+        unidades += paso()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos), unidades / sum(tiempos)
+
+
+def medir_memoria(caso, n, semilla):
+    """Pico de bytes reservados al preparar el caso y ejecutar dos llamadas"""
+    sembrar(semilla)
+    gc.collect()
+    tracemalloc.start()
+    paso = caso.preparar(n, semilla)
+    paso()
+    paso()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def ejecutar_caso(caso, args):
+    resultados = []
+    omitir = None
+    for n in caso.tamanos:
+        if n > args.tamano_maximo:
+            break
+        if omitir is None and caso.memoria is not None and caso.memoria(n) > args.limite_memoria_gb * 2**30:
+            omitir = f'memoria estimada {caso.memoria(n) / 2**30:.1f} GB'
+        if omitir is not None:
+            resultados.append({'caso': caso.nombre, 'tamano': n, 'omitido': omitir})
+            print(f"{caso.nombre:<42}{n:>10}  omitido ({omitir})")
+            continue
+
+        segundos, rendimiento = medir_tiempo(caso, n, args.semilla, args.repeticiones, args.tiempo_minimo)
+        pico = None if args.sin_memoria else medir_memoria(caso, n, args.semilla)
+        resultados.append({'caso': caso.nombre, 'tamano': n, 'segundos': segundos,
+                           'rendimiento': rendimiento, 'unidad': f'{caso.unidad}/s', 'memoria_pico': pico})
+        memoria = f'{pico / 2**20:>10.1f}' if pico is not None else f"{'-':>10}"
+        print(f"{caso.nombre:<42}{n:>10}{segundos * 1e3:>12.3f}{rendimiento:>14.3e} {caso.unidad + '/s':<16}{memoria}")
+        if segundos > args.presupuesto:
+            omitir = f'la llamada anterior tardó {segundos:.1f} s'
+    return resultados
+
+
+def commit_actual():
+    try:
+        resultado = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                                   capture_output=True, text=True, check=True)
+        return resultado.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(resultados, referencia, umbral):
+    """Lista de regresiones: mediciones cuya mediana empeora más de `umbral` (fracción)"""
+    base = {(r['caso'], r['tamano']): r for r in referencia['resultados'] if 'segundos' in r}
+    regresiones = []
+    for resultado in resultados:
+        anterior = base.get((resultado['caso'], resultado['tamano']))
+        if anterior is None or 'segundos' not in resultado:
+            continue
+        cambio = resultado['segundos'] / anterior['segundos'] - 1
+        print(f"{resultado['caso']:<42}{resultado['tamano']:>10}{cambio:>+10.1%}")
+        if cambio > umbral:
+            regresiones.append(f"{resultado['caso']} n={resultado['tamano']}: "
+                               f"{anterior['segundos'] * 1e3:.3f} ms -> {resultado['segundos'] * 1e3:.3f} ms "
+                               f"({cambio:+.1%})")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide los simuladores a tamaños crecientes con semillas fijas")
+    parser.add_argument('--casos', nargs='*', default=None,
+                        help="prefijos de los casos a medir (por defecto todos)")
+    parser.add_argument('--semilla', type=int, default=SEMILLA)
+    parser.add_argument('--repeticiones', type=int, default=3, help="llamadas medidas por tamaño, como mínimo")
+    parser.add_argument('--tiempo-minimo', type=float, default=0.25,
+                        help="segundos medidos por tamaño, como mínimo")
+    parser.add_argument('--presupuesto', type=float, default=5.0,
+                        help="segundos por llamada a partir de los cuales no se prueban tamaños mayores")
+    parser.add_argument('--limite-memoria-gb', type=float, default=2.0)
+    parser.add_argument('--tamano-maximo', type=int, default=sys.maxsize)
+    parser.add_argument('--rapido', action='store_true', help=f"equivale a --tamano-maximo {TAMANO_RAPIDO}")
+    parser.add_argument('--sin-memoria', action='store_true', help="no mide el pico de memoria")
+    parser.add_argument('--salida', default=None, help="archivo JSON donde guardar los resultados")
+    parser.add_argument('--comparar', default=None, help="JSON de referencia de una corrida anterior")
+    parser.add_argument('--umbral', type=float, default=0.2,
+                        help="empeoramiento relativo permitido antes de marcar regresión")
+    args = parser.parse_args(argv)
+    if args.rapido:
+        args.tamano_maximo = min(args.tamano_maximo, TAMANO_RAPIDO)
+
+    casos = [caso for caso in CASOS
+             if args.casos is None or any(caso.nombre.startswith(prefijo) for prefijo in args.casos)]
+    print(f"{'Caso':<42}{'Tamaño':>10}{'ms/llamada':>12}{'Rendimiento':>14} {'':<16}{'Pico (MB)':>10}")
+    resultados = []
+    for caso in casos:
+        resultados.extend(ejecutar_caso(caso, args))
+
+    informe = {
+        'meta': {
+            'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': commit_actual(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'nucleos': os.cpu_count(),
+            'semilla': args.semilla,
+            'repeticiones': args.repeticiones,
+            'tiempo_minimo': args.tiempo_minimo,
+        },
+        'resultados': resultados,
+    }
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            referencia = json.load(archivo)
+        print(f"\nCambio respecto a {args.comparar} (commit {referencia['meta'].get('commit')}):")
+        regresiones = comparar(resultados, referencia, args.umbral)
+        for regresion in regresiones:
+            print(f"REGRESIÓN: {regresion}", file=sys.stderr)
+        return 1 if regresiones else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Generador de carga para Servicio_Playlists en localhost.
+
+Abre `--clientes` conexiones y cada una envía `--pedidos` pedidos, de a uno
+(espera la respuesta antes de mandar el siguiente). Los perfiles son los
+predefinidos con un poco de ruido (`--ruido`), así que varios pedidos caen en
+el mismo perfil cuantizado y otros no; `--con-inicio` fija la canción inicial de
+una fracción de los pedidos. Informa la latencia p50/p99 vista por los clientes,
+los pedidos por segundo y las métricas del propio servicio.
+
+    python Benchmarks/Carga_Servicio.py --local --clientes 64 --pedidos 200
+    python Benchmarks/Carga_Servicio.py --puerto 8765 --clientes 256 --salida carga.json
+
+Con `--local` el servicio se levanta en este mismo proceso (en un puerto libre)
+con el catálogo de ejemplo; si no, se conecta a uno ya en marcha.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, os.path.join(RAIZ, 'Segundo Punto'))
+
+import Servicio_Playlists
+from Spotify import SistemaRecomendacion
+
+SEMILLA = 12345
+
+
+async def pedir(lector, escritor, pedido):
+    escritor.write((json.dumps(pedido) + '\n').encode('utf-8'))
+    await escritor.drain()
+    return json.loads(await lector.readline())
+
+
+async def cliente(host, puerto, numero, args, perfiles, canciones, latencias, errores):
+    rng = np.random.default_rng([args.semilla, numero])
+    lector, escritor = await asyncio.open_connection(host, puerto, limit=1 << 20)
+    try:
+        for i in range(args.pedidos):
+            base = perfiles[rng.integers(len(perfiles))]
+            preferencias = {c: float(np.clip(v + rng.normal(0, args.ruido), 0, 1)) for c, v in base.items()}
+            pedido = {'id': i, 'preferencias': preferencias, 'longitud': int(rng.integers(3, args.longitud_maxima + 1))}
+            if rng.random() < args.con_inicio:
+                pedido['inicio'] = canciones[rng.integers(len(canciones))]
+
+            t0 = time.perf_counter()
+            respuesta = await pedir(lector, escritor, pedido)
+            latencias.append(time.perf_counter() - t0)
+            if 'error' in respuesta:
+                errores.append(respuesta['error'])
+    finally:
+        escritor.close()
+
+
+async def generar_carga(host, puerto, args, perfiles, canciones):
+    latencias, errores = [], []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(host, puerto, numero, args, perfiles, canciones, latencias, errores)
+                           for numero in range(args.clientes)))
+    segundos = time.perf_counter() - inicio
+
+    lector, escritor = await asyncio.open_connection(host, puerto, limit=1 << 20)
+    metricas_servicio = await pedir(lector, escritor, {'orden': 'metricas'})
+    escritor.close()
+
+    latencias = np.array(latencias) * 1e3
+    return {
+        'clientes': args.clientes,
+        'pedidos': len(latencias),
+        'errores': len(errores),
+        'segundos': segundos,
+        'pedidos_por_segundo': len(latencias) / segundos,
+        'p50_ms': float(np.percentile(latencias, 50)),
+        'p99_ms': float(np.percentile(latencias, 99)),
+        'servicio': metricas_servicio,
+    }
+
+
+async def principal(args):
+    sistema = SistemaRecomendacion(semilla=args.semilla)
+    perfiles = list(sistema.tipos_usuario.values())
+    canciones = list(sistema.nombres)
+    if not args.local:
+        return await generar_carga(args.host, args.puerto, args, perfiles, canciones)
+
+    cache = Servicio_Playlists.CachePlaylists(args.cache, args.ttl, args.umbral_deriva) if args.cache else None
+    memoria = Servicio_Playlists.MemoriaFeromonas(args.memoria) if args.memoria else None
+    servicio = Servicio_Playlists.ServicioPlaylists(sistema, args.hormigas_por_pedido, args.max_lote,
+                                                    args.espera_maxima, cache=cache, memoria=memoria)
+    await servicio.iniciar()
+    servidor = await asyncio.start_server(servicio.atender_conexion, '127.0.0.1', 0, limit=1 << 20)
+    puerto = servidor.sockets[0].getsockname()[1]
+    try:
+        async with servidor:
+            return await generar_carga('127.0.0.1', puerto, args, perfiles, canciones)
+    finally:
+        await servicio.cerrar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera carga sobre el servicio de playlists y mide latencias")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=Servicio_Playlists.PUERTO)
+    parser.add_argument('--local', action='store_true', help="levanta el servicio en este proceso")
+    parser.add_argument('--clientes', type=int, default=32, help="conexiones concurrentes")
+    parser.add_argument('--pedidos', type=int, default=100, help="pedidos por cliente")
+    parser.add_argument('--ruido', type=float, default=0.05, help="desvío de las preferencias respecto al perfil")
+    parser.add_argument('--con-inicio', type=float, default=0.2,
+                        help="fracción de pedidos con canción inicial fija")
+    parser.add_argument('--longitud-maxima', type=int, default=8)
+    parser.add_argument('--semilla', type=int, default=SEMILLA)
+    parser.add_argument('--hormigas-por-pedido', type=int, default=Servicio_Playlists.HORMIGAS_POR_PEDIDO,
+                        help="solo con --local")
+    parser.add_argument('--max-lote', type=int, default=Servicio_Playlists.MAX_LOTE, help="solo con --local")
+    parser.add_argument('--espera-maxima', type=float, default=Servicio_Playlists.ESPERA_MAXIMA,
+                        help="solo con --local")
+    parser.add_argument('--cache', type=int, default=0, help="capacidad de la caché de playlists (solo con --local)")
+    parser.add_argument('--ttl', type=float, default=60.0, help="solo con --local y --cache")
+    parser.add_argument('--umbral-deriva', type=float, default=0.2, help="solo con --local y --cache")
+    parser.add_argument('--memoria', default=None,
+                        help="directorio de feromonas por perfil para arrancar en caliente (solo con --local)")
+    parser.add_argument('--salida', default=None, help="guarda el resultado como JSON")
+    args = parser.parse_args(argv)
+
+    resultado = asyncio.run(principal(args))
+    print(f"{resultado['pedidos']} pedidos de {resultado['clientes']} clientes en {resultado['segundos']:.2f} s "
+          f"({resultado['errores']} errores)")
+    print(f"Latencia p50 {resultado['p50_ms']:.2f} ms, p99 {resultado['p99_ms']:.2f} ms, "
+          f"{resultado['pedidos_por_segundo']:.0f} pedidos/s")
+    servicio = resultado['servicio']
+    print(f"Servicio: {servicio['lotes']} lotes, {servicio['pedidos_por_lote']:.1f} pedidos por lote, "
+          f"{servicio['perfiles_calientes']} perfiles calientes")
+    if servicio['cache']:
+        cache = servicio['cache']
+        print(f"Caché: {cache['aciertos']} aciertos, {cache['fallos']} fallos, {cache['invalidadas']} invalidadas")
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Checkpoints binarios para reanudar optimizaciones largas.
+
+Un checkpoint es un directorio con un `.npy` por arreglo (genes, fitness,
+feromonas, historial...) y un `meta.json` con los escalares, los parámetros y
+el estado de los generadores aleatorios. `np.save` escribe el búfer tal cual,
+sin pickle, y `cargar_arreglos` abre los `.npy` como memoria mapeada en modo
+copia-en-escritura: cargar no copia nada y modificar los arreglos no toca el
+archivo. Guardar reemplaza el directorio entero, y un archivo mapeado no se
+puede reemplazar (en Windows el cambio de nombre falla): quien siga usando los
+arreglos después de cargar y vaya a guardar en la misma ruta debe copiarlos.
+
+Un checkpoint nuevo se escribe aparte (`ruta.tmp`) y recién entonces reemplaza
+al anterior, que pasa un instante por `ruta.old`. Si el proceso se corta justo
+ahí, `existe_checkpoint` y `cargar_arreglos` encuentran el anterior en
+`ruta.old`; en ningún momento se queda sin un checkpoint válido.
+"""
+import json
+import os
+import random
+import shutil
+import time
+
+import numpy as np
+
+FORMATO = 1
+
+
+def ruta_vigente(ruta):
+    """`ruta`, o `ruta.old` si un guardado se cortó después de apartar el anterior"""
+    anterior = ruta + '.old'
+    if not os.path.exists(os.path.join(ruta, 'meta.json')) and os.path.exists(os.path.join(anterior, 'meta.json')):
+        return anterior
+    return ruta
+
+
+def guardar_arreglos(ruta, arreglos, meta):
+    """Escribe el checkpoint en `ruta`; si algo falla sigue valiendo el anterior (en `ruta` o `ruta.old`)"""
+    temporal = ruta + '.tmp'
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+    for nombre, arreglo in arreglos.items():
+        np.save(os.path.join(temporal, nombre + '.npy'), np.asarray(arreglo), allow_pickle=False)
+    with open(os.path.join(temporal, 'meta.json'), 'w', encoding='utf-8') as archivo:
+        json.dump({'formato': FORMATO, 'arreglos': sorted(arreglos), **meta}, archivo, ensure_ascii=False)
+
+    anterior = ruta + '.old'
+    if os.path.exists(ruta):
+        shutil.rmtree(anterior, ignore_errors=True)
+        os.replace(ruta, anterior)
+    # Si no había `ruta`, un `ruta.old` es lo único válido y se borra recién ahora
+    os.replace(temporal, ruta)
+    shutil.rmtree(anterior, ignore_errors=True)
+
+
+def leer_meta(ruta):
+    """Solo los metadatos del checkpoint, sin abrir ningún arreglo"""
+    ruta = ruta_vigente(ruta)
+    with open(os.path.join(ruta, 'meta.json'), encoding='utf-8') as archivo:
+        meta = json.load(archivo)
+    if meta.get('formato') != FORMATO:
+        raise ValueError(f"Formato de checkpoint no soportado: {meta.get('formato')}")
+    return meta
+
+
+def cargar_arreglos(ruta, mmap=True):
+    """Devuelve (arreglos, meta); con `mmap` los arreglos son mapas copia-en-escritura"""
+    ruta = ruta_vigente(ruta)
+    meta = leer_meta(ruta)
+    modo = 'c' if mmap else None
+    arreglos = {nombre: np.load(os.path.join(ruta, nombre + '.npy'), mmap_mode=modo, allow_pickle=False)
+                for nombre in meta['arreglos']}
+    return arreglos, meta
+
+
+def comprobar_tipo(meta, esperado):
+    if meta.get('tipo') != esperado:
+        raise ValueError(f"El checkpoint es de {meta.get('tipo')}, no de {esperado}")
+
+
+def existe_checkpoint(ruta):
+    return os.path.exists(os.path.join(ruta_vigente(ruta), 'meta.json'))
+
+
+def estado_rng(rng):
+    """Estado de un np.random.Generator en forma serializable a JSON"""
+    return rng.bit_generator.state
+
+
+def restaurar_rng(rng, estado):
+    rng.bit_generator.state = estado
+
+
+def estado_random(generador=random):
+    """Estado de un random.Random (por defecto el del módulo `random`) en forma serializable a JSON"""
+    version, interno, gauss = generador.getstate()
+    return [version, list(interno), gauss]
+
+
+def restaurar_random(estado, generador=random):
+    version, interno, gauss = estado
+    generador.setstate((version, tuple(interno), gauss))
+
+
+class AutoCheckpoint:
+    """Llama a `guardar(ruta)` cada `cada` pasos y/o cada `segundos` segundos"""
+    def __init__(self, ruta, guardar, cada=None, segundos=None):
+        self.ruta = ruta
+        self.guardar = guardar
+        self.cada = cada
+        self.segundos = segundos
+        self.pasos = 0
+        self.ultimo = time.perf_counter()
+
+    def paso(self):
+        """Cuenta un paso y guarda si toca; devuelve True si se guardó"""
+        self.pasos += 1
+        if (self.cada and self.pasos % self.cada == 0) or \
+                (self.segundos is not None and time.perf_counter() - self.ultimo >= self.segundos):
+            self.guardar_ahora()
+            return True
+        return False
+
+    def guardar_ahora(self):
+        self.guardar(self.ruta)
+        self.ultimo = time.perf_counter()
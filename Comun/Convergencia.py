@@ -0,0 +1,82 @@
+"""Detección de convergencia compartida por el genético, las hormigas y PSO.
+
+`MonitorConvergencia` recibe en cada iteración el mejor valor (y, si se tienen,
+la diversidad de la población y la entropía de las feromonas) y decide si
+conviene parar. El motivo queda en `motivo` para poder informarlo.
+"""
+import numpy as np
+
+
+def diversidad_genes(genes):
+    """Desviación estándar media de cada gen: 0 cuando todos los individuos son iguales"""
+    genes = np.asarray(genes, dtype=np.float64)
+    if len(genes) < 2:
+        return 0.0
+    return float(genes.std(axis=0).mean())
+
+
+def entropia_feromonas(feromonas):
+    """Entropía de Shannon normalizada (0 a 1) de las feromonas, promedio por fila
+
+    Cada fila se trata como la distribución de la siguiente elección: 1 indica
+    feromonas uniformes (exploración) y valores cercanos a 0 que casi todo el
+    rastro se concentra en un camino. Acepta un vector o una matriz.
+    """
+    matriz = np.atleast_2d(np.asarray(feromonas, dtype=np.float64))
+    positivos = matriz > 0
+    totales = matriz.sum(axis=1, keepdims=True)
+    p = np.divide(matriz, totales, out=np.zeros_like(matriz), where=totales > 0)
+    terminos = np.zeros_like(p)
+    np.multiply(p, np.log(p, where=positivos, out=np.zeros_like(p)), out=terminos, where=positivos)
+    entropias = -terminos.sum(axis=1)
+
+    opciones = positivos.sum(axis=1)
+    validas = opciones > 1
+    if not validas.any():
+        return 0.0
+    return float((entropias[validas] / np.log(opciones[validas])).mean())
+
+
+class MonitorConvergencia:
+    def __init__(self, ventana=20, tolerancia=1e-6, diversidad_minima=None, entropia_minima=None,
+                 maximizar=True, limite=None):
+        self.ventana = ventana
+        self.tolerancia = tolerancia
+        self.diversidad_minima = diversidad_minima
+        self.entropia_minima = entropia_minima
+        self.maximizar = maximizar
+        self.limite = limite
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.referencia = None  # Último valor que mejoró en más de `tolerancia`
+        self.sin_mejora = 0
+        self.iteraciones = 0
+        self.motivo = None
+
+    @property
+    def convergio(self):
+        return self.motivo is not None
+
+    def actualizar(self, mejor, diversidad=None, entropia=None):
+        """Registra una iteración; devuelve el motivo para parar o None si hay que seguir"""
+        self.iteraciones += 1
+        if self.referencia is None:
+            mejora = float('inf')
+        else:
+            mejora = mejor - self.referencia if self.maximizar else self.referencia - mejor
+        if mejora > self.tolerancia:
+            self.referencia = mejor
+            self.sin_mejora = 0
+        else:
+            self.sin_mejora += 1
+
+        if self.sin_mejora >= self.ventana:
+            self.motivo = f'estancamiento ({self.ventana} iteraciones sin mejora)'
+        elif self.diversidad_minima is not None and diversidad is not None and diversidad < self.diversidad_minima:
+            self.motivo = f'diversidad {diversidad:.2e} por debajo de {self.diversidad_minima:.2e}'
+        elif self.entropia_minima is not None and entropia is not None and entropia < self.entropia_minima:
+            self.motivo = f'entropía de feromonas {entropia:.3f} por debajo de {self.entropia_minima:.3f}'
+        elif self.limite is not None and self.iteraciones >= self.limite:
+            self.motivo = 'límite de iteraciones'
+        return self.motivo
@@ -0,0 +1,65 @@
+"""Extracción de los k mejores individuos sin ordenar toda la población.
+
+Para el elitismo, el mejor histórico y las listas de la interfaz solo hacen
+falta unos pocos individuos, así que basta una selección parcial (argpartition
+o un montículo de tamaño k) en lugar de un ordenamiento O(N log N).
+"""
+import heapq
+import math
+from operator import attrgetter
+
+import numpy as np
+
+
+def mejores_indices(fitness, cantidad):
+    """Índices de los `cantidad` mayores valores, de mayor a menor, en O(N + k log k)"""
+    n = len(fitness)
+    cantidad = min(cantidad, n)
+    if cantidad <= 0:
+        return np.empty(0, dtype=np.intp)
+    if cantidad < n:
+        candidatos = np.argpartition(-fitness, cantidad - 1)[:cantidad]
+    else:
+        candidatos = np.arange(n)
+    return candidatos[np.argsort(-fitness[candidatos], kind='stable')]
+
+
+def peores_indices(fitness, cantidad):
+    """Índices de los `cantidad` menores valores (sin orden particular)"""
+    n = len(fitness)
+    cantidad = min(cantidad, n)
+    if cantidad <= 0:
+        return np.empty(0, dtype=np.intp)
+    if cantidad < n:
+        return np.argpartition(fitness, cantidad - 1)[:cantidad]
+    return np.arange(n)
+
+
+def resumen_arreglo(fitness, mejores):
+    """(mejor, promedio, peor) de un arreglo cuyos mejores índices ya se conocen"""
+    return float(fitness[mejores[0]]), float(fitness.mean()), float(fitness.min())
+
+
+def mejores_y_resumen(individuos, cantidad, clave=attrgetter('fitness')):
+    """En una sola pasada: los `cantidad` mejores (de mayor a menor) y (mejor, promedio, peor)
+
+    Usa un montículo de tamaño `cantidad`; ante empates conserva el orden original.
+    """
+    cantidad = max(cantidad, 1)
+    monticulo = []
+    suma = 0.0
+    peor = math.inf
+    for i, individuo in enumerate(individuos):
+        valor = clave(individuo)
+        suma += valor
+        if valor < peor:
+            peor = valor
+        if len(monticulo) < cantidad:
+            heapq.heappush(monticulo, (valor, -i, individuo))
+        elif valor > monticulo[0][0]:
+            heapq.heapreplace(monticulo, (valor, -i, individuo))
+
+    if not monticulo:
+        return [], (0.0, 0.0, 0.0)
+    mejores = [individuo for _, _, individuo in sorted(monticulo, key=lambda e: (e[0], e[1]), reverse=True)]
+    return mejores, (clave(mejores[0]), suma / (i + 1), peor)
@@ -0,0 +1,142 @@
+"""Perfilado opcional por fases (evaluación, selección, hormigas, PSO, redibujado...).
+
+El código instrumentado envuelve cada fase con `perfilador.fase('ag.evaluacion')`.
+Mientras el perfilador está desactivado, `fase` devuelve un contexto vacío
+compartido, así que el costo es una comprobación de atributo por fase. Activado,
+registra tiempo de pared y número de llamadas por fase y cada evento individual,
+exportable como traza de Chrome (chrome://tracing o Perfetto) o tabla resumen.
+
+También se activa sin tocar código con la variable de entorno TALLER_PERFILADO:
+`resumen` imprime la tabla al salir, y una ruta `.json` además guarda la traza.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+
+class _FaseNula:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+FASE_NULA = _FaseNula()
+
+
+class _Fase:
+    __slots__ = ('perfilador', 'nombre', 'inicio')
+
+    def __init__(self, perfilador, nombre):
+        self.perfilador = perfilador
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.perfilador.registrar(self.nombre, self.inicio, time.perf_counter_ns() - self.inicio)
+        return False
+
+
+class Perfilador:
+    def __init__(self, max_eventos=1_000_000):
+        self.activo = False
+        self.max_eventos = max_eventos  # Los totales siguen contando aunque se llene la traza
+        self.cerrojo = threading.Lock()  # La interfaz y el hilo de cómputo registran a la vez
+        self.limpiar()
+
+    def limpiar(self):
+        self.totales = {}  # nombre -> [llamadas, total_ns, maximo_ns]
+        self.eventos = []  # (nombre, inicio_ns, duracion_ns, hilo)
+        self.eventos_descartados = 0
+        self.origen = time.perf_counter_ns()
+
+    def activar(self):
+        self.activo = True
+
+    def desactivar(self):
+        self.activo = False
+
+    def fase(self, nombre):
+        """Contexto que mide la fase `nombre` (vacío si el perfilador está desactivado)"""
+        if not self.activo:
+            return FASE_NULA
+        return _Fase(self, nombre)
+
+    def registrar(self, nombre, inicio, duracion):
+        with self.cerrojo:
+            total = self.totales.get(nombre)
+            if total is None:
+                self.totales[nombre] = [1, duracion, duracion]
+            else:
+                total[0] += 1
+                total[1] += duracion
+                if duracion > total[2]:
+                    total[2] = duracion
+            if len(self.eventos) < self.max_eventos:
+                self.eventos.append((nombre, inicio, duracion, threading.get_ident()))
+            else:
+                self.eventos_descartados += 1
+
+    def resumen(self):
+        """[(fase, llamadas, total_s, media_us, maximo_us), ...] de mayor a menor tiempo total"""
+        with self.cerrojo:
+            filas = [(nombre, llamadas, total / 1e9, total / llamadas / 1e3, maximo / 1e3)
+                     for nombre, (llamadas, total, maximo) in self.totales.items()]
+        return sorted(filas, key=lambda fila: fila[2], reverse=True)
+
+    def tabla(self):
+        lineas = [f"{'Fase':<28}{'Llamadas':>10}{'Total (s)':>12}{'Media (us)':>12}{'Máx (us)':>12}"]
+        for nombre, llamadas, total, media, maximo in self.resumen():
+            lineas.append(f"{nombre:<28}{llamadas:>10}{total:>12.4f}{media:>12.1f}{maximo:>12.1f}")
+        if self.eventos_descartados:
+            lineas.append(f"({self.eventos_descartados} eventos no entraron en la traza)")
+        return '\n'.join(lineas)
+
+    def exportar_chrome(self, ruta):
+        """Guarda los eventos en formato Trace Event (JSON) para chrome://tracing o Perfetto"""
+        pid = os.getpid()
+        with self.cerrojo:
+            eventos = [{'name': nombre, 'cat': nombre.split('.')[0], 'ph': 'X',
+                        'ts': (inicio - self.origen) / 1e3, 'dur': duracion / 1e3, 'pid': pid, 'tid': hilo}
+                       for nombre, inicio, duracion, hilo in self.eventos]
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, archivo)
+
+
+perfilador = Perfilador()
+
+
+def perfilar(nombre):
+    """Decorador equivalente a envolver toda la función en perfilador.fase(nombre)"""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not perfilador.activo:
+                return funcion(*args, **kwargs)
+            with _Fase(perfilador, nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def _informar_al_salir(destino):
+    print(perfilador.tabla(), file=sys.stderr)
+    if destino.endswith('.json'):
+        perfilador.exportar_chrome(destino)
+        print(f"Traza guardada en {destino}", file=sys.stderr)
+
+
+_destino = os.environ.get('TALLER_PERFILADO')
+if _destino:
+    perfilador.activar()
+    atexit.register(_informar_al_salir, _destino)
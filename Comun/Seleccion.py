@@ -0,0 +1,99 @@
+"""Selección de padres por lotes para los algoritmos genéticos.
+
+Cada selector se construye una sola vez por generación a partir del arreglo de
+fitness y luego entrega todos los padres necesarios en una única llamada a
+`muestrear`, en lugar de recorrer la población por cada padre.
+"""
+import numpy as np
+
+MODOS_SELECCION = ('ruleta', 'alias', 'torneo', 'rango')
+
+
+class SelectorRuleta:
+    """Ruleta con tabla de fitness acumulado: O(N) al construir, O(log N) por padre"""
+    def __init__(self, fitness, rng):
+        self.rng = rng
+        self.n = len(fitness)
+        self.acumulado = np.cumsum(fitness, dtype=np.float64)
+        self.total = self.acumulado[-1] if self.n else 0.0
+
+    def muestrear(self, cantidad):
+        if self.total <= 0:
+            return self.rng.integers(0, self.n, cantidad)
+        r = self.rng.random(cantidad) * self.total
+        indices = np.searchsorted(self.acumulado, r, side='right')
+        return np.minimum(indices, self.n - 1)
+
+
+class SelectorAlias:
+    """Tabla alias de Walker (Vose): O(N) al construir, O(1) por padre"""
+    def __init__(self, fitness, rng):
+        self.rng = rng
+        self.n = len(fitness)
+        fitness = np.asarray(fitness, dtype=np.float64)
+        total = fitness.sum()
+        self.uniforme = total <= 0
+        if self.uniforme:
+            return
+
+        q = fitness * (self.n / total)
+        self.probabilidad = np.ones(self.n)
+        self.alias = np.arange(self.n)
+
+        pequenos = np.flatnonzero(q < 1.0).tolist()
+        grandes = np.flatnonzero(q >= 1.0).tolist()
+        q = q.tolist()
+        while pequenos and grandes:
+            s = pequenos.pop()
+            g = grandes[-1]
+            self.probabilidad[s] = q[s]
+            self.alias[s] = g
+            q[g] -= 1.0 - q[s]
+            if q[g] < 1.0:
+                pequenos.append(grandes.pop())
+
+    def muestrear(self, cantidad):
+        columnas = self.rng.integers(0, self.n, cantidad)
+        if self.uniforme:
+            return columnas
+        aceptar = self.rng.random(cantidad) < self.probabilidad[columnas]
+        return np.where(aceptar, columnas, self.alias[columnas])
+
+
+class SelectorTorneo:
+    """Torneo de `tamano` participantes al azar: O(tamano) por padre, sin construcción"""
+    def __init__(self, fitness, rng, tamano=3):
+        self.rng = rng
+        self.fitness = np.asarray(fitness)
+        self.tamano = tamano
+
+    def muestrear(self, cantidad):
+        participantes = self.rng.integers(0, len(self.fitness), (cantidad, self.tamano))
+        ganadores = np.argmax(self.fitness[participantes], axis=1)
+        return participantes[np.arange(cantidad), ganadores]
+
+
+class SelectorRango(SelectorRuleta):
+    """Ruleta sobre el rango lineal en lugar del fitness crudo (presion entre 1 y 2)"""
+    def __init__(self, fitness, rng, presion=1.5):
+        n = len(fitness)
+        rangos = np.empty(n)
+        rangos[np.argsort(fitness, kind='stable')] = np.arange(n)
+        if n > 1:
+            pesos = (2 - presion) + 2 * (presion - 1) * rangos / (n - 1)
+        else:
+            pesos = np.ones(n)
+        super().__init__(pesos, rng)
+
+
+def crear_selector(modo, fitness, rng, tamano_torneo=3, presion=1.5):
+    """Construye el selector indicado por `modo` para el fitness de esta generación"""
+    if modo == 'ruleta':
+        return SelectorRuleta(fitness, rng)
+    if modo == 'alias':
+        return SelectorAlias(fitness, rng)
+    if modo == 'torneo':
+        return SelectorTorneo(fitness, rng, tamano_torneo)
+    if modo == 'rango':
+        return SelectorRango(fitness, rng, presion)
+    raise ValueError(f"Modo de selección desconocido: {modo!r} (opciones: {', '.join(MODOS_SELECCION)})")
@@ -0,0 +1,32 @@
+"""Submuestreo de series largas para dibujarlas con un costo fijo por cuadro.
+
+Cuando una serie tiene más puntos que píxeles de ancho, dibujar cada punto no
+aporta nada: basta con el mínimo y el máximo de cada columna de píxeles, que
+conservan los picos y la envolvente de la curva.
+"""
+import numpy as np
+
+
+def submuestrear_min_max(valores, cubetas, inicio=1):
+    """Devuelve (x, y) con el mínimo y el máximo de cada una de `cubetas` cubetas
+
+    `x` empieza en `inicio` (la primera generación es la 1). Si la serie ya
+    cabe en `cubetas` columnas se devuelve completa.
+    """
+    valores = np.asarray(valores)
+    n = len(valores)
+    if n <= 2 * cubetas:
+        return np.arange(inicio, inicio + n), valores
+
+    limites = np.linspace(0, n, cubetas + 1).astype(np.intp)
+    comienzos = limites[:-1]
+    minimos = np.minimum.reduceat(valores, comienzos)
+    maximos = np.maximum.reduceat(valores, comienzos)
+    centros = inicio + (comienzos + limites[1:] - 1) / 2
+
+    # Cada cubeta es un segmento vertical de su mínimo a su máximo
+    x = np.repeat(centros, 2)
+    y = np.empty(2 * cubetas, dtype=valores.dtype)
+    y[0::2] = minimos
+    y[1::2] = maximos
+    return x, y
@@ -0,0 +1 @@
+"""Utilidades compartidas por los algoritmos de los tres puntos del taller."""
@@ -0,0 +1,319 @@
+"""Ejecución sin interfaz gráfica de los tres simuladores del taller.
+
+Ejecuta el algoritmo elegido a máxima velocidad y escribe una línea JSON por
+generación o iteración, pensado para trabajos por lotes en servidores sin
+pantalla. Ejemplos:
+
+    python Ejecutar_Lote.py pokemon -n 200 --motor vectorizado --poblacion 100000
+    python Ejecutar_Lote.py pokemon -n 200 --motor islas --islas 8
+    python Ejecutar_Lote.py spotify -n 50 --perfil JazzFan
+    python Ejecutar_Lote.py spotify -n 50 --hormigas 500 --trabajadores 8
+    python Ejecutar_Lote.py spotify -n 20 --perfil JazzFan --memoria feromonas_perfiles/
+    python Ejecutar_Lote.py carreras -n 50 --semilla 7
+    python Ejecutar_Lote.py pokemon -n 5000 --motor vectorizado --checkpoint estado/ --reanudar
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+for carpeta in ('Primer Punto', 'Segundo Punto', 'Tercer Punto'):
+    sys.path.insert(0, os.path.join(RAIZ, carpeta))
+
+from Comun.Seleccion import MODOS_SELECCION
+from Comun.Checkpoint import AutoCheckpoint, existe_checkpoint
+from Comun.Convergencia import MonitorConvergencia
+from Comun.Perfilado import perfilador
+
+
+def emitir(salida, registro):
+    salida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+    salida.flush()
+
+
+def preparar_checkpoint(args, objeto):
+    """Reanuda desde --checkpoint si se pidió y devuelve el AutoCheckpoint (o None si no hay ruta)"""
+    if not args.checkpoint:
+        return None
+    if args.reanudar and existe_checkpoint(args.checkpoint):
+        objeto.cargar_checkpoint(args.checkpoint)
+    return AutoCheckpoint(args.checkpoint, objeto.guardar_checkpoint, cada=args.cada_checkpoint)
+
+
+def crear_monitor(args, maximizar=True):
+    """MonitorConvergencia según las opciones, o None si no se pidió parada temprana"""
+    if not args.hasta_converger:
+        return None
+    return MonitorConvergencia(args.ventana, args.tolerancia, args.diversidad_minima, args.entropia_minima,
+                               maximizar)
+
+
+def motivo_parada(monitor):
+    return monitor.motivo if monitor is not None and monitor.motivo else 'iteraciones completadas'
+
+
+def ejecutar_pokemon(args, salida):
+    import Pokemon
+
+    monitor = crear_monitor(args)
+    if args.motor == 'islas':
+        if args.checkpoint:
+            raise SystemExit("El motor de islas no admite checkpoints")
+        from Islas import ModeloIslas
+        modelo = ModeloIslas(args.islas, args.poblacion, args.iteraciones, args.mutacion, args.elitismo,
+                             args.intervalo_migracion, args.topologia, modo_seleccion=args.seleccion,
+                             semilla=args.semilla)
+        with modelo:
+            inicio = time.perf_counter()
+            while modelo.generacion_actual < modelo.generaciones:
+                t0 = time.perf_counter()
+                nuevas = modelo.ejecutar_epoca()
+                segundos = (time.perf_counter() - t0) / max(len(nuevas), 1)
+                primera = modelo.generacion_actual - len(nuevas)
+                for i, (mejor, promedio, peor) in enumerate(nuevas, start=primera + 1):
+                    emitir(salida, {'iteracion': i, 'mejor': mejor, 'promedio': promedio, 'peor': peor,
+                                    'segundos': segundos})
+                    if monitor and monitor.actualizar(mejor):
+                        break
+                if monitor and monitor.convergio:
+                    break
+        mejor_historico = modelo.mejor_historico
+    else:
+        cache = None
+        if args.cache:
+            from Cache_Fitness import CacheFitness
+            cache = CacheFitness(args.cache)
+
+        if args.motor == 'vectorizado':
+            ag = Pokemon.AlgoritmoGeneticoVectorizado(args.poblacion, args.iteraciones, args.mutacion, args.elitismo,
+                                                      modo_seleccion=args.seleccion, semilla=args.semilla,
+                                                      dtype=args.dtype)
+        elif args.motor == 'estacionario':
+            from Estacionario import AlgoritmoGeneticoEstacionario
+            ag = AlgoritmoGeneticoEstacionario(args.poblacion, args.iteraciones, args.mutacion, args.elitismo,
+                                               hijos_por_paso=args.hijos_por_paso, semilla=args.semilla, cache=cache)
+        else:
+            ag = Pokemon.AlgoritmoGenetico(args.poblacion, args.iteraciones, args.mutacion, args.elitismo,
+                                           modo_seleccion=args.seleccion, semilla=args.semilla, cache=cache)
+        ag.inicializar_poblacion()
+        autoguardado = preparar_checkpoint(args, ag)
+        inicio = time.perf_counter()
+        for i in range(len(ag.historial_fitness) + 1, args.iteraciones + 1):
+            t0 = time.perf_counter()
+            mejor, promedio, peor = ag.ejecutar_generacion()
+            emitir(salida, {'iteracion': i, 'mejor': mejor, 'promedio': promedio, 'peor': peor,
+                            'segundos': time.perf_counter() - t0})
+            if autoguardado:
+                autoguardado.paso()
+            # La diversidad solo se calcula si hay un umbral que comprobar
+            diversidad = ag.diversidad() if args.diversidad_minima is not None else None
+            if monitor and monitor.actualizar(mejor, diversidad):
+                break
+        if autoguardado:
+            autoguardado.guardar_ahora()
+        mejor_historico = ag.mejor_historico
+
+    resumen = {'fin': True, 'segundos_totales': time.perf_counter() - inicio, 'motivo_parada': motivo_parada(monitor),
+               'mejor_historico': Pokemon.pokemon_a_dict(mejor_historico)}
+    if args.motor != 'islas':
+        resumen['evaluaciones'] = ag.evaluaciones
+    if args.motor in ('objetos', 'estacionario') and ag.cache is not None:
+        resumen['cache'] = {'aciertos': ag.cache.aciertos, 'fallos': ag.cache.fallos}
+    emitir(salida, resumen)
+
+
+def ejecutar_spotify(args, salida):
+    import Spotify
+
+    canciones = perfiles = None
+    if args.catalogo or args.perfiles:
+        import Catalogo_Canciones
+        canciones = Catalogo_Canciones.cargar_catalogo(args.catalogo) if args.catalogo else None
+        perfiles = Catalogo_Canciones.cargar_perfiles(args.perfiles) if args.perfiles else None
+    sistema = Spotify.SistemaRecomendacion(canciones, args.semilla, args.vecinos, perfiles, args.feromonas_dispersas)
+    if args.perfil not in sistema.tipos_usuario:
+        raise SystemExit(f"Perfil desconocido: {args.perfil} (opciones: {', '.join(sistema.tipos_usuario)})")
+    preferencias = sistema.tipos_usuario[args.perfil]
+
+    memoria = None
+    en_caliente = False
+    if args.memoria:
+        from Memoria_Feromonas import MemoriaFeromonas
+        memoria = MemoriaFeromonas(args.memoria)
+        en_caliente = memoria.calentar(sistema, preferencias)  # Un checkpoint reanudado tiene prioridad
+
+    colonia = None
+    if args.trabajadores:
+        if args.checkpoint:
+            raise SystemExit("La colonia paralela no admite checkpoints")
+        from Colonia_Paralela import ColoniaParalela
+        colonia = ColoniaParalela(sistema, args.trabajadores, args.semilla)
+
+    autoguardado = preparar_checkpoint(args, sistema)
+    monitor = crear_monitor(args)
+    inicio = time.perf_counter()
+    with colonia or contextlib.nullcontext():
+        ejecutar_iteracion = colonia.ejecutar_iteracion if colonia else sistema.ejecutar_iteracion
+        for i in range(len(sistema.historial_calidad) + 1, args.iteraciones + 1):
+            t0 = time.perf_counter()
+            playlist, calidad = ejecutar_iteracion(preferencias, args.hormigas, args.longitud)
+            emitir(salida, {'iteracion': i, 'calidad': calidad, 'mejor_calidad_global': sistema.mejor_calidad_global,
+                            'playlist': playlist, 'segundos': time.perf_counter() - t0})
+            if autoguardado:
+                autoguardado.paso()
+            entropia = sistema.entropia_feromonas() if args.entropia_minima is not None else None
+            if monitor and monitor.actualizar(sistema.mejor_calidad_global, entropia=entropia):
+                break
+    if autoguardado:
+        autoguardado.guardar_ahora()
+    if memoria:
+        memoria.guardar_sistema(sistema, preferencias)
+
+    emitir(salida, {'fin': True, 'segundos_totales': time.perf_counter() - inicio,
+                    'motivo_parada': motivo_parada(monitor),
+                    'arranque_en_caliente': en_caliente,
+                    'mejor_calidad_global': sistema.mejor_calidad_global,
+                    'mejor_playlist_global': sistema.mejor_playlist_global})
+
+
+def ejecutar_carreras(args, salida):
+    import Pista_Carreras
+
+    sistema = Pista_Carreras.SistemaCarreras(args.poblacion, args.semilla)
+    sistema.inicializar_poblacion_genetica()
+
+    autoguardado = preparar_checkpoint(args, sistema)
+    # Un monitor por algoritmo: el que converge deja de ejecutarse y el resto sigue
+    monitores = {'genetico': crear_monitor(args), 'hormigas': crear_monitor(args, maximizar=False),
+                 'pso': crear_monitor(args)}
+    fitness = tiempo = trayectoria = decision = None
+    inicio = time.perf_counter()
+    for i in range(len(sistema.historial_fitness) + 1, args.iteraciones + 1):
+        t0 = time.perf_counter()
+        if not (monitores['genetico'] and monitores['genetico'].convergio):
+            fitness = sistema.ejecutar_generacion_genetica()
+            if monitores['genetico']:
+                diversidad = sistema.diversidad_genetica() if args.diversidad_minima is not None else None
+                monitores['genetico'].actualizar(fitness, diversidad)
+        if not (monitores['hormigas'] and monitores['hormigas'].convergio):
+            tiempo, trayectoria = sistema.ejecutar_hormigas()
+            if monitores['hormigas']:
+                entropia = sistema.entropia_feromonas() if args.entropia_minima is not None else None
+                monitores['hormigas'].actualizar(sistema.mejor_tiempo, entropia=entropia)
+        if not (monitores['pso'] and monitores['pso'].convergio):
+            decision = sistema.ejecutar_pso()
+            if monitores['pso']:
+                diversidad = sistema.diversidad_pso() if args.diversidad_minima is not None else None
+                monitores['pso'].actualizar(sistema.controlador_pso.mejor_global_fitness, diversidad)
+        emitir(salida, {'iteracion': i, 'fitness_genetico': fitness, 'tiempo_hormigas': tiempo,
+                        'mejor_tiempo': sistema.mejor_tiempo if mejor is not None else None, 'trayectoria': trayectoria,
+                        'pso_decision': [float(v) for v in decision],
+                        'pso_fitness': sistema.controlador_pso.mejor_global_fitness,
+                        'segundos': time.perf_counter() - t0})
+        if autoguardado:
+            autoguardado.paso()
+        if all(monitor and monitor.convergio for monitor in monitores.values()):
+            break
+    if autoguardado:
+        autoguardado.guardar_ahora()
+
+    mejor = sistema.mejor_controlador
+    if mejor is not None:  # Sin iteraciones todavía no hay mejor controlador
+        mejor = {'agresividad': mejor.agresividad, 'conservador': mejor.conservador,
+                 'adelantamiento': mejor.adelantamiento, 'fitness': mejor.fitness}
+    emitir(salida, {'fin': True, 'segundos_totales': time.perf_counter() - inicio,
+                    'motivo_parada': {nombre: motivo_parada(monitor) for nombre, monitor in monitores.items()},
+                    'mejor_controlador': mejor,
+                    'mejor_tiempo': sistema.mejor_tiempo if mejor is not None else None, 'mejor_trayectoria': sistema.mejor_trayectoria})
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Ejecuta los simuladores sin interfaz gráfica (salida JSON lines)")
+    comun = argparse.ArgumentParser(add_help=False)
+    comun.add_argument('-n', '--iteraciones', type=int, default=50, help="generaciones o iteraciones a ejecutar")
+    comun.add_argument('--semilla', type=int, default=None, help="semilla para resultados reproducibles")
+    comun.add_argument('--salida', default='-', help="archivo de salida (por defecto la salida estándar)")
+    comun.add_argument('--checkpoint', default=None, help="directorio donde guardar checkpoints periódicos")
+    comun.add_argument('--cada-checkpoint', type=int, default=10, help="iteraciones entre checkpoints")
+    comun.add_argument('--reanudar', action='store_true',
+                       help="continúa desde el checkpoint si existe (-n es el total de iteraciones)")
+    comun.add_argument('--perfilar', action='store_true',
+                       help="mide el tiempo de cada fase e imprime un resumen en la salida de error")
+    comun.add_argument('--traza', default=None, help="guarda la traza de fases en formato Chrome (JSON)")
+    comun.add_argument('--hasta-converger', action='store_true',
+                       help="para antes de -n iteraciones si la búsqueda converge (ver --ventana y umbrales)")
+    comun.add_argument('--ventana', type=int, default=20, help="iteraciones sin mejora que cuentan como estancamiento")
+    comun.add_argument('--tolerancia', type=float, default=1e-6, help="mejora mínima que reinicia la ventana")
+    comun.add_argument('--diversidad-minima', type=float, default=None,
+                       help="para si la desviación media de los genes (o partículas) cae por debajo")
+    comun.add_argument('--entropia-minima', type=float, default=None,
+                       help="para si la entropía normalizada de las feromonas (0-1) cae por debajo")
+    subparsers = parser.add_subparsers(dest='simulador', required=True)
+
+    pokemon = subparsers.add_parser('pokemon', parents=[comun], help="evolución de Pokémon (algoritmo genético)")
+    pokemon.add_argument('--motor', choices=('objetos', 'vectorizado', 'islas', 'estacionario'), default='objetos')
+    pokemon.add_argument('--poblacion', type=int, default=20)
+    pokemon.add_argument('--mutacion', type=float, default=0.1)
+    pokemon.add_argument('--elitismo', type=int, default=2)
+    pokemon.add_argument('--seleccion', choices=MODOS_SELECCION, default='ruleta')
+    pokemon.add_argument('--dtype', choices=('float64', 'float32'), default='float64',
+                         help="precisión de los genes (motor vectorizado); float32 reduce la memoria")
+    pokemon.add_argument('--cache', type=int, default=0,
+                         help="capacidad de la caché de fitness (motores objetos y estacionario, 0 la desactiva)")
+    pokemon.add_argument('--hijos-por-paso', type=int, default=2,
+                         help="hijos que reemplazan a los peores en cada paso (motor estacionario)")
+    pokemon.add_argument('--islas', type=int, default=os.cpu_count() or 1, help="número de islas (motor islas)")
+    pokemon.add_argument('--intervalo-migracion', type=int, default=10)
+    pokemon.add_argument('--topologia', choices=('anillo', 'completa'), default='anillo')
+    pokemon.set_defaults(funcion=ejecutar_pokemon)
+
+    spotify = subparsers.add_parser('spotify', parents=[comun], help="recomendación de playlists (hormigas)")
+    spotify.add_argument('--perfil', default='Rockero', help="tipo de usuario predefinido")
+    spotify.add_argument('--hormigas', type=int, default=10)
+    spotify.add_argument('--longitud', type=int, default=8, help="longitud de la playlist")
+    spotify.add_argument('--catalogo', default=None,
+                         help="CSV de canciones (columna nombre + una por característica); se convierte una vez "
+                              "a un almacén binario en memoria mapeada")
+    spotify.add_argument('--perfiles', default=None, help="CSV de tipos de usuario (columna perfil + características)")
+    spotify.add_argument('--vecinos', type=int, default=None,
+                         help="listas de candidatos: cada transición solo considera las k canciones más parecidas")
+    spotify.add_argument('--feromonas-dispersas', action='store_true',
+                         help="guardar solo las aristas reforzadas (catálogos de cientos de miles de canciones)")
+    spotify.add_argument('--trabajadores', type=int, default=None,
+                         help="reparte las hormigas entre N procesos con las matrices en memoria compartida")
+    spotify.add_argument('--memoria', default=None,
+                         help="directorio de feromonas por perfil: arranca desde lo aprendido antes y lo actualiza")
+    spotify.set_defaults(funcion=ejecutar_spotify)
+
+    carreras = subparsers.add_parser('carreras', parents=[comun], help="robot de carreras (genético, hormigas, PSO)")
+    carreras.add_argument('--poblacion', type=int, default=15)
+    carreras.set_defaults(funcion=ejecutar_carreras)
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.semilla is not None:
+        random.seed(args.semilla)
+
+    if args.perfilar or args.traza:
+        perfilador.activar()
+
+    if args.salida == '-':
+        args.funcion(args, sys.stdout)
+    else:
+        with open(args.salida, 'w', encoding='utf-8') as salida:
+            args.funcion(args, salida)
+
+    if args.perfilar:
+        print(perfilador.tabla(), file=sys.stderr)
+    if args.traza:
+        perfilador.exportar_chrome(args.traza)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Caché de fitness para Pokémon con expulsión LRU.
+
+La clave es el genoma cuantizado (genes redondeados a `decimales` más el tipo),
+así que dos Pokémon con estadísticas prácticamente iguales comparten el mismo
+resultado. Tiene sentido cuando el fitness es caro de calcular, por ejemplo si
+se obtiene simulando batallas.
+"""
+from collections import OrderedDict
+
+
+class CacheFitness:
+    def __init__(self, capacidad=100_000, decimales=6):
+        self.capacidad = capacidad
+        self.decimales = decimales
+        self.valores = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def clave(self, pokemon):
+        d = self.decimales
+        return (round(pokemon.ataque, d), round(pokemon.defensa, d),
+                round(pokemon.velocidad, d), round(pokemon.vida, d), pokemon.tipo)
+
+    def obtener(self, pokemon, calcular):
+        """Devuelve el fitness del genoma, usando `calcular()` solo si no está en la caché"""
+        clave = self.clave(pokemon)
+        fitness = self.valores.get(clave)
+        if fitness is not None:
+            self.aciertos += 1
+            self.valores.move_to_end(clave)
+            return fitness
+
+        self.fallos += 1
+        fitness = calcular()
+        self.valores[clave] = fitness
+        if len(self.valores) > self.capacidad:
+            self.valores.popitem(last=False)  # El usado hace más tiempo
+        return fitness
+
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def limpiar(self):
+        self.valores.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self.valores)
+
+    def __str__(self):
+        return f"Aciertos: {self.aciertos}, Fallos: {self.fallos}, Tasa: {self.tasa_aciertos():.1%}, " \
+               f"Entradas: {len(self)}/{self.capacidad}"
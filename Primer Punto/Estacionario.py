@@ -0,0 +1,100 @@
+"""Algoritmo genético de estado estacionario.
+
+En lugar de reconstruir la población completa, cada paso crea `hijos_por_paso`
+hijos que reemplazan a los peores individuos. La población se mantiene ordenada
+con un índice de claves (búsqueda binaria), así que el mejor, el peor y el
+promedio para `historial_fitness` se obtienen en O(1) sin reordenar ni sumar.
+"""
+import bisect
+
+from Pokemon import AlgoritmoGenetico, perfilador
+
+
+class AlgoritmoGeneticoEstacionario(AlgoritmoGenetico):
+    def __init__(self, poblacion_size, generaciones, mutacion_prob, elitismo, *, hijos_por_paso=2,
+                 tamano_torneo=3, semilla=None, cache=None):
+        super().__init__(poblacion_size, generaciones, mutacion_prob, elitismo, modo_seleccion='torneo',
+                         semilla=semilla, cache=cache)
+        # Nunca se reemplaza a las élites
+        self.hijos_por_paso = max(1, min(hijos_por_paso, poblacion_size - elitismo))
+        self.tamano_torneo = tamano_torneo
+        self.claves = []  # -fitness de cada individuo, en el mismo orden que la población
+        self.suma_fitness = 0.0
+        self.pasos_desde_resumar = 0
+
+    def evaluar_poblacion(self):
+        # Reconstrucción completa: solo ocurre al inicio o si la población se asignó desde fuera
+        if self.poblacion_evaluada:
+            return
+        super().evaluar_poblacion()
+        self.poblacion.sort(key=lambda x: x.fitness, reverse=True)
+        self.claves = [-p.fitness for p in self.poblacion]
+        self.suma_fitness = sum(p.fitness for p in self.poblacion)
+
+    def parametros(self):
+        return {**super().parametros(), 'hijos_por_paso': self.hijos_por_paso, 'tamano_torneo': self.tamano_torneo}
+
+    def mejores(self, cantidad):
+        self.evaluar_poblacion()
+        return self.poblacion[:cantidad]
+
+    def seleccion_torneo(self, cantidad):
+        """Torneos sobre la población ordenada: gana el participante de menor índice"""
+        participantes = self.rng.integers(0, len(self.poblacion), (cantidad, self.tamano_torneo))
+        return participantes.min(axis=1)
+
+    def seleccion(self):
+        return self.poblacion[self.seleccion_torneo(1)[0]]
+
+    def eliminar_peor(self):
+        peor = self.poblacion.pop()
+        self.claves.pop()
+        self.suma_fitness -= peor.fitness
+        return peor
+
+    def insertar(self, pokemon):
+        """Evalúa al individuo (si hace falta) y lo coloca en su posición ordenada"""
+        if pokemon.sucio:
+            self.evaluar_individuo(pokemon)
+        posicion = bisect.bisect_right(self.claves, -pokemon.fitness)
+        self.claves.insert(posicion, -pokemon.fitness)
+        self.poblacion.insert(posicion, pokemon)
+        self.suma_fitness += pokemon.fitness
+        if posicion == 0:
+            self.actualizar_mejor_historico(pokemon)
+
+    def calcular_estadisticas(self):
+        """Mejor, promedio y peor fitness a partir del índice ordenado"""
+        return (self.poblacion[0].fitness, self.suma_fitness / len(self.poblacion),
+                self.poblacion[-1].fitness)
+
+    def ejecutar_generacion(self):
+        """Un paso de estado estacionario: `hijos_por_paso` hijos reemplazan a los peores"""
+        self.evaluar_poblacion()
+
+        # Padres elegidos antes de modificar la población
+        with perfilador.fase('ag.seleccion'):
+            padres = self.seleccion_torneo(2 * self.hijos_por_paso)
+        with perfilador.fase('ag.cruce'):
+            hijos = [self.cruce(self.poblacion[padres[2 * i]], self.poblacion[padres[2 * i + 1]])
+                     for i in range(self.hijos_por_paso)]
+        with perfilador.fase('ag.mutacion'):
+            for hijo in hijos:
+                self.mutacion(hijo)
+
+        # Reemplazo de los peores (incluye evaluar a los hijos)
+        with perfilador.fase('ag.reemplazo'):
+            for _ in hijos:
+                self.eliminar_peor()
+            for hijo in hijos:
+                self.insertar(hijo)
+
+        # La suma incremental acumula error de redondeo: se recalcula cada N pasos (O(1) amortizado)
+        self.pasos_desde_resumar += 1
+        if self.pasos_desde_resumar * self.hijos_por_paso >= len(self.poblacion):
+            self.suma_fitness = sum(p.fitness for p in self.poblacion)
+            self.pasos_desde_resumar = 0
+
+        self.estadisticas = self.calcular_estadisticas()
+        self.historial_fitness.append(self.estadisticas)
+        return self.estadisticas
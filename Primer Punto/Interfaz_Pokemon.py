@@ -0,0 +1,313 @@
+import tkinter as tk
+from tkinter import ttk
+import os
+import sys
+
+import numpy as np
+
+from Pokemon import AlgoritmoGenetico, POBLACION_SIZE, GENERACIONES, MUTACION_PROB, ELITISMO
+from Cache_Fitness import CacheFitness
+from Trabajador_Evolucion import TrabajadorEvolucion
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from Comun.Submuestreo import submuestrear_min_max
+from Comun.Perfilado import perfilar
+
+FPS = 30  # Frecuencia con la que la interfaz revisa si hay una instantánea nueva
+
+class SimuladorEvolucion:
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("Simulador de Evolución de Pokémon")
+        self.root.geometry("1000x700")
+        
+        self.generacion_actual = 0
+        self.trabajador = None
+        self.serie = np.empty((1024, 3))  # Copia local del historial (mejor, promedio, peor)
+        self.puntos = 0
+        self.rango_y = (float('inf'), float('-inf'))  # Mínimo y máximo de toda la serie
+        self.fondo = None  # Región del gráfico sin las líneas, para el blitting
+        
+        self.setup_ui()
+        self.iniciar_trabajador()
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        self.root.after(1000 // FPS, self.sondear)
+        
+    def iniciar_trabajador(self):
+        # El algoritmo solo se toca desde el hilo del trabajador
+        self.ag = AlgoritmoGenetico(POBLACION_SIZE, GENERACIONES, MUTACION_PROB, ELITISMO,
+                                    cache=CacheFitness())
+        self.ag.inicializar_poblacion()
+        self.generacion_actual = 0
+        self.puntos = 0
+        self.rango_y = (float('inf'), float('-inf'))
+        self.trabajador = TrabajadorEvolucion(self.ag, intervalo_publicacion=1 / FPS)
+        self.trabajador.start()
+        
+    def sondear(self):
+        # Solo se dibuja la instantánea más reciente; las intermedias se descartan
+        instantanea = self.trabajador.ultima_instantanea()
+        if instantanea is not None:
+            self.actualizar_ui(instantanea)
+        self.root.after(1000 // FPS, self.sondear)
+        
+    def setup_ui(self):
+        # matplotlib solo se carga al construir la interfaz
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        # Frame principal
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Configurar grid
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+        
+        # Panel de control
+        control_frame = ttk.LabelFrame(main_frame, text="Control", padding="5")
+        control_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Button(control_frame, text="Ejecutar Una Generación", command=self.ejecutar_generacion).grid(row=0, column=0, padx=5)
+        ttk.Button(control_frame, text="Ejecutar 10 Generaciones", command=self.ejecutar_10_generaciones).grid(row=0, column=1, padx=5)
+        ttk.Button(control_frame, text="Reiniciar Simulación", command=self.reiniciar).grid(row=0, column=2, padx=5)
+        
+        ttk.Label(control_frame, text="Hasta generación:").grid(row=1, column=0, sticky=tk.E, padx=5, pady=(5, 0))
+        self.var_objetivo = tk.IntVar(value=GENERACIONES)
+        ttk.Spinbox(control_frame, from_=1, to=1_000_000, textvariable=self.var_objetivo,
+                    width=10).grid(row=1, column=1, sticky=tk.W, padx=5, pady=(5, 0))
+        ttk.Button(control_frame, text="Ejecutar Hasta N", command=self.ejecutar_hasta_n).grid(row=1, column=2, padx=5, pady=(5, 0))
+        ttk.Button(control_frame, text="Ejecutar Hasta Converger", command=self.ejecutar_hasta_convergencia).grid(row=1, column=3, padx=5, pady=(5, 0))
+        ttk.Button(control_frame, text="Detener", command=self.detener).grid(row=1, column=4, padx=5, pady=(5, 0))
+        
+        self.lbl_estado = ttk.Label(control_frame, text="Estado: listo")
+        self.lbl_estado.grid(row=0, column=3, columnspan=2, sticky=tk.W, padx=5)
+        
+        # Información de la generación actual
+        info_frame = ttk.LabelFrame(main_frame, text="Información de la Generación", padding="5")
+        info_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
+        
+        self.lbl_generacion = ttk.Label(info_frame, text="Generación: 0")
+        self.lbl_generacion.grid(row=0, column=0, sticky=tk.W, pady=2)
+        
+        self.lbl_mejor_fitness = ttk.Label(info_frame, text="Mejor Fitness: 0.00")
+        self.lbl_mejor_fitness.grid(row=1, column=0, sticky=tk.W, pady=2)
+        
+        self.lbl_promedio_fitness = ttk.Label(info_frame, text="Promedio Fitness: 0.00")
+        self.lbl_promedio_fitness.grid(row=2, column=0, sticky=tk.W, pady=2)
+        
+        self.lbl_peor_fitness = ttk.Label(info_frame, text="Peor Fitness: 0.00")
+        self.lbl_peor_fitness.grid(row=3, column=0, sticky=tk.W, pady=2)
+        
+        self.lbl_cache = ttk.Label(info_frame, text="Caché: -")
+        self.lbl_cache.grid(row=4, column=0, sticky=tk.W, pady=2)
+        
+        # Mejor Pokémon histórico
+        mejor_frame = ttk.LabelFrame(info_frame, text="Mejor Pokémon Histórico", padding="5")
+        mejor_frame.grid(row=5, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.lbl_mejor_pokemon = ttk.Label(mejor_frame, text="Tipo: -")
+        self.lbl_mejor_pokemon.grid(row=0, column=0, sticky=tk.W, pady=2)
+        
+        # Lista de Pokémon actual
+        lista_frame = ttk.LabelFrame(main_frame, text="Población Actual (Top 10)", padding="5")
+        lista_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10), pady=(10, 0))
+        
+        # Crear Treeview para mostrar los Pokémon
+        columns = ('Tipo', 'Ataque', 'Defensa', 'Velocidad', 'Vida', 'Fitness')
+        self.tree = ttk.Treeview(lista_frame, columns=columns, show='headings', height=10)
+        
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=80)
+        
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Scrollbar para el Treeview
+        scrollbar = ttk.Scrollbar(lista_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
+        # Gráfico de evolución
+        grafico_frame = ttk.LabelFrame(main_frame, text="Evolución del Fitness", padding="5")
+        grafico_frame.grid(row=1, column=1, rowspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.fig, self.ax = plt.subplots(figsize=(6, 5))
+        self.canvas = FigureCanvasTkAgg(self.fig, master=grafico_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Líneas persistentes: cada cuadro solo cambia sus datos. Son "animadas" para
+        # que el dibujo completo no las incluya y puedan pintarse encima del fondo guardado
+        self.linea_mejor, = self.ax.plot([], [], 'g-', label='Mejor', animated=True)
+        self.linea_promedio, = self.ax.plot([], [], 'b-', label='Promedio', animated=True)
+        self.linea_peor, = self.ax.plot([], [], 'r-', label='Peor', animated=True)
+        self.lineas = (self.linea_mejor, self.linea_promedio, self.linea_peor)
+        self.ax.set_xlabel('Generación')
+        self.ax.set_ylabel('Fitness')
+        self.ax.set_title('Evolución del Fitness')
+        self.ax.legend()
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+        self.ax.set_xlim(0, 10)
+        self.ax.set_ylim(0, 1)
+        self.canvas.mpl_connect('draw_event', self.al_dibujar)
+        
+        # Configurar pesos de grid
+        main_frame.rowconfigure(1, weight=1)
+        main_frame.rowconfigure(2, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        lista_frame.rowconfigure(0, weight=1)
+        lista_frame.columnconfigure(0, weight=1)
+        
+    @perfilar('ui.redibujado')
+    def actualizar_ui(self, instantanea):
+        # Actualizar información de la generación
+        self.generacion_actual = instantanea.generacion
+        self.lbl_generacion.config(text=f"Generación: {self.generacion_actual}")
+        if instantanea.en_curso:
+            self.lbl_estado.config(text="Estado: ejecutando...")
+        elif instantanea.motivo:
+            self.lbl_estado.config(text=f"Estado: {instantanea.motivo}")
+        
+        if self.generacion_actual > 0:
+            mejor, promedio, peor = instantanea.historial[self.generacion_actual - 1]
+            self.lbl_mejor_fitness.config(text=f"Mejor Fitness: {mejor:.2f}")
+            self.lbl_promedio_fitness.config(text=f"Promedio Fitness: {promedio:.2f}")
+            self.lbl_peor_fitness.config(text=f"Peor Fitness: {peor:.2f}")
+            
+            # Actualizar mejor Pokémon histórico
+            mejor_historico = instantanea.mejor_historico
+            if mejor_historico:
+                self.lbl_mejor_pokemon.config(
+                    text=f"Tipo: {mejor_historico.tipo}\n"
+                         f"Ataque: {mejor_historico.ataque:.2f}\n"
+                         f"Defensa: {mejor_historico.defensa:.2f}\n"
+                         f"Velocidad: {mejor_historico.velocidad:.2f}\n"
+                         f"Vida: {mejor_historico.vida:.2f}\n"
+                         f"Fitness: {mejor_historico.fitness:.2f}"
+                )
+        
+        # Actualizar lista de Pokémon (las filas existentes se reescriben en su lugar)
+        filas = self.tree.get_children()
+        for i, (tipo, ataque, defensa, velocidad, vida, fitness) in enumerate(instantanea.top):
+            valores = (
+                tipo,
+                f"{ataque:.2f}",
+                f"{defensa:.2f}",
+                f"{velocidad:.2f}",
+                f"{vida:.2f}",
+                f"{fitness:.2f}"
+            )
+            if i < len(filas):
+                self.tree.item(filas[i], values=valores)
+            else:
+                self.tree.insert('', tk.END, values=valores)
+        if len(filas) > len(instantanea.top):
+            self.tree.delete(*filas[len(instantanea.top):])
+        if instantanea.cache is not None:
+            aciertos, fallos = instantanea.cache
+            self.lbl_cache.config(text=f"Caché: {aciertos} aciertos, {fallos} fallos")
+            
+        # Actualizar gráfico
+        self.agregar_historial(instantanea.historial, self.generacion_actual)
+        self.actualizar_grafico()
+        
+    def agregar_historial(self, historial, cantidad):
+        """Copia a la serie local solo las entradas nuevas del historial"""
+        if cantidad > len(self.serie):
+            serie = np.empty((max(cantidad, 2 * len(self.serie)), 3))
+            serie[:self.puntos] = self.serie[:self.puntos]
+            self.serie = serie
+        if cantidad > self.puntos:
+            nuevos = self.serie[self.puntos:cantidad]
+            nuevos[:] = historial[self.puntos:cantidad]
+            self.rango_y = (min(self.rango_y[0], float(nuevos.min())), max(self.rango_y[1], float(nuevos.max())))
+            self.puntos = cantidad
+        
+    def actualizar_grafico(self):
+        # Con más puntos que píxeles se dibuja solo el mínimo y el máximo de cada columna
+        cubetas = max(int(self.ax.bbox.width), 1)
+        for columna, linea in enumerate(self.lineas):
+            linea.set_data(*submuestrear_min_max(self.serie[:self.puntos, columna], cubetas))
+        
+        if self.ajustar_limites() or self.fondo is None:
+            # Cambiaron los ejes: dibujo completo (al_dibujar guarda el nuevo fondo)
+            self.fondo = None
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self.fondo)
+            self.dibujar_lineas()
+            self.canvas.blit(self.ax.bbox)
+        
+    def ajustar_limites(self):
+        """Amplía los ejes solo cuando los datos se salen de ellos; devuelve True si cambiaron"""
+        if self.puntos == 0:
+            return False
+        x_min, x_max = self.ax.get_xlim()
+        y_min, y_max = self.ax.get_ylim()
+        nuevos_x = (x_min, x_max)
+        nuevos_y = (y_min, y_max)
+        
+        if self.puntos > x_max:
+            nuevos_x = (0, 2 * self.puntos)  # Duplicar deja margen para muchas generaciones
+        minimo, maximo = self.rango_y
+        if minimo < y_min or maximo > y_max:
+            margen = 0.05 * max(maximo - minimo, 1e-9)
+            nuevos_y = (min(y_min, minimo - margen), max(y_max, maximo + margen))
+        
+        if nuevos_x == (x_min, x_max) and nuevos_y == (y_min, y_max):
+            return False
+        self.ax.set_xlim(*nuevos_x)
+        self.ax.set_ylim(*nuevos_y)
+        return True
+        
+    def al_dibujar(self, evento):
+        # Tras cada dibujo completo (incluido un cambio de tamaño) se guarda el fondo
+        self.fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.dibujar_lineas()
+        
+    def dibujar_lineas(self):
+        for linea in self.lineas:
+            self.ax.draw_artist(linea)
+        
+    # Los botones solo envían órdenes; el cómputo ocurre en el hilo del trabajador
+    def ejecutar_generacion(self):
+        self.trabajador.avanzar(1, tope=self.ag.generaciones)
+            
+    def ejecutar_10_generaciones(self):
+        self.trabajador.avanzar(10, tope=self.ag.generaciones)
+        
+    def ejecutar_hasta_n(self):
+        try:
+            objetivo = self.var_objetivo.get()
+        except tk.TclError:
+            return
+        self.trabajador.ejecutar_hasta(objetivo)
+        
+    def ejecutar_hasta_convergencia(self):
+        self.trabajador.ejecutar_hasta_convergencia()
+        
+    def detener(self):
+        self.trabajador.detener()
+                
+    def reiniciar(self):
+        self.trabajador.terminar()
+        self.trabajador.join()
+        self.iniciar_trabajador()
+        self.ax.set_xlim(0, 10)
+        self.ax.set_ylim(0, 1)
+        self.fondo = None
+        self.lbl_estado.config(text="Estado: listo")
+        
+    def cerrar(self):
+        self.trabajador.terminar()
+        self.root.destroy()
+        
+    def run(self):
+        self.root.mainloop()
+
+# Ejecutar la aplicación
+if __name__ == "__main__":
+    app = SimuladorEvolucion()
+    app.run()
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""Modelo de islas: varias poblaciones evolucionando en paralelo con migración.
+
+Cada isla es un AlgoritmoGeneticoVectorizado que vive en su propio proceso. Cada
+`intervalo_migracion` generaciones las islas envían sus ELITISMO mejores
+individuos a sus vecinas (topología 'anillo' o 'completa'), que los usan para
+reemplazar a sus peores individuos.
+"""
+import multiprocessing as mp
+
+import numpy as np
+
+from Pokemon import (AlgoritmoGeneticoVectorizado, Pokemon, TIPOS, POBLACION_SIZE, GENERACIONES,
+                     MUTACION_PROB, ELITISMO)
+
+TOPOLOGIAS = ('anillo', 'completa')
+
+
+def _crear_algoritmo(parametros, semilla):
+    ag = AlgoritmoGeneticoVectorizado(semilla=semilla, **parametros)
+    ag.inicializar_poblacion()
+    return ag
+
+
+def _evolucionar(ag, generaciones):
+    """Avanza `generaciones` y devuelve estadísticas, emigrantes y el mejor histórico"""
+    for _ in range(generaciones):
+        ag.ejecutar_generacion()
+
+    # El mejor histórico se toma antes de evaluar a la población final: esa
+    # evaluación solo sirve para elegir emigrantes y no queda en el historial
+    mejor = ag.mejor_historico
+    mejor_historico = ([mejor.ataque, mejor.defensa, mejor.velocidad, mejor.vida],
+                       TIPOS.index(mejor.tipo), mejor.fitness)
+    ag.evaluar_poblacion()
+    return ag.historial_fitness[-generaciones:], ag.mejores(ag.elitismo), mejor_historico
+
+
+def _trabajador_isla(conexion, parametros, semilla):
+    """Bucle del proceso de una isla: atiende órdenes hasta recibir 'terminar'"""
+    ag = _crear_algoritmo(parametros, semilla)
+    while True:
+        orden, datos = conexion.recv()
+        if orden == 'evolucionar':
+            conexion.send(_evolucionar(ag, datos))
+        elif orden == 'inmigrar':
+            ag.reemplazar_peores(*datos)
+        elif orden == 'terminar':
+            break
+    conexion.close()
+
+
+class IslaLocal:
+    """Isla evaluada en el mismo proceso (útil para depurar o con pocos núcleos)"""
+    def __init__(self, parametros, semilla):
+        self.ag = _crear_algoritmo(parametros, semilla)
+        self.resultado = None
+
+    def enviar_evolucionar(self, generaciones):
+        self.resultado = _evolucionar(self.ag, generaciones)
+
+    def recibir(self):
+        return self.resultado
+
+    def inmigrar(self, genes, tipos):
+        self.ag.reemplazar_peores(genes, tipos)
+
+    def cerrar(self):
+        pass
+
+
+class IslaProceso:
+    """Isla que vive en un proceso hijo y se comunica por una tubería"""
+    def __init__(self, parametros, semilla, contexto):
+        self.conexion, extremo_hijo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_trabajador_isla, args=(extremo_hijo, parametros, semilla),
+                                        daemon=True)
+        self.proceso.start()
+        extremo_hijo.close()
+
+    def enviar_evolucionar(self, generaciones):
+        self.conexion.send(('evolucionar', generaciones))
+
+    def recibir(self):
+        return self.conexion.recv()
+
+    def inmigrar(self, genes, tipos):
+        self.conexion.send(('inmigrar', (genes, tipos)))
+
+    def cerrar(self):
+        if self.proceso.is_alive():
+            self.conexion.send(('terminar', None))
+            self.proceso.join()
+        self.conexion.close()
+
+
+class ModeloIslas:
+    def __init__(self, num_islas, poblacion_size=POBLACION_SIZE, generaciones=GENERACIONES,
+                 mutacion_prob=MUTACION_PROB, elitismo=ELITISMO, intervalo_migracion=10,
+                 topologia='anillo', *, modo_seleccion='ruleta', semilla=None, procesos=True):
+        if topologia not in TOPOLOGIAS:
+            raise ValueError(f"Topología desconocida: {topologia!r} (opciones: {', '.join(TOPOLOGIAS)})")
+        self.num_islas = num_islas
+        self.generaciones = generaciones
+        self.elitismo = elitismo
+        self.intervalo_migracion = intervalo_migracion
+        self.topologia = topologia
+        self.procesos = procesos
+        self.parametros = dict(poblacion_size=poblacion_size, generaciones=generaciones,
+                               mutacion_prob=mutacion_prob, elitismo=elitismo,
+                               modo_seleccion=modo_seleccion)
+        self.semillas = np.random.SeedSequence(semilla).spawn(num_islas)
+        self.islas = []
+        self.generacion_actual = 0
+        self.historial_fitness = []
+        self.mejor_historico = None
+
+    def iniciar(self):
+        if self.procesos:
+            contexto = mp.get_context()
+            self.islas = [IslaProceso(self.parametros, s, contexto) for s in self.semillas]
+        else:
+            self.islas = [IslaLocal(self.parametros, s) for s in self.semillas]
+
+    def cerrar(self):
+        for isla in self.islas:
+            isla.cerrar()
+        self.islas = []
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def destinos(self, origen):
+        """Islas que reciben los emigrantes de `origen` según la topología"""
+        if self.num_islas < 2:
+            return []
+        if self.topologia == 'anillo':
+            return [(origen + 1) % self.num_islas]
+        return [i for i in range(self.num_islas) if i != origen]
+
+    def migrar(self, emigrantes):
+        """Envía a cada isla los mejores emigrantes que le llegan de sus vecinas"""
+        recibidos = [[] for _ in range(self.num_islas)]
+        for origen, grupo in enumerate(emigrantes):
+            for destino in self.destinos(origen):
+                recibidos[destino].append(grupo)
+
+        for isla, grupos in zip(self.islas, recibidos):
+            if not grupos:
+                continue
+            genes = np.concatenate([g[0] for g in grupos])
+            tipos = np.concatenate([g[1] for g in grupos])
+            fitness = np.concatenate([g[2] for g in grupos])
+            mejores = np.argsort(-fitness, kind='stable')[:self.elitismo]
+            isla.inmigrar(genes[mejores], tipos[mejores])
+
+    def ejecutar_epoca(self):
+        """Evoluciona todas las islas hasta la próxima migración"""
+        generaciones = min(self.intervalo_migracion, self.generaciones - self.generacion_actual)
+        if generaciones <= 0:
+            return []
+
+        # Primero se reparten las órdenes para que las islas trabajen a la vez
+        for isla in self.islas:
+            isla.enviar_evolucionar(generaciones)
+        resultados = [isla.recibir() for isla in self.islas]
+
+        # Estadísticas globales por generación (las islas tienen el mismo tamaño)
+        nuevas = []
+        for estadisticas in zip(*(r[0] for r in resultados)):
+            mejor = max(e[0] for e in estadisticas)
+            promedio = sum(e[1] for e in estadisticas) / len(estadisticas)
+            peor = min(e[2] for e in estadisticas)
+            nuevas.append((mejor, promedio, peor))
+        self.historial_fitness.extend(nuevas)
+        self.generacion_actual += generaciones
+
+        # Mejor histórico entre todas las islas
+        for genes, tipo, fitness in (r[2] for r in resultados):
+            if self.mejor_historico is None or fitness > self.mejor_historico.fitness:
+                self.mejor_historico = Pokemon(*genes, TIPOS[tipo])
+                self.mejor_historico.fitness = fitness
+
+        if self.generacion_actual < self.generaciones:
+            self.migrar([r[1] for r in resultados])
+        return nuevas
+
+    def ejecutar(self):
+        """Ejecuta todas las generaciones configuradas"""
+        while self.generacion_actual < self.generaciones:
+            self.ejecutar_epoca()
+        return self.historial_fitness
@@ -1,10 +1,16 @@
 import random
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import tkinter as tk
-from tkinter import ttk
-import time
+from collections.abc import Sequence
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from Comun.Seleccion import crear_selector
+from Comun.Estadisticas import mejores_indices, peores_indices, resumen_arreglo, mejores_y_resumen
+from Comun.Checkpoint import (guardar_arreglos, cargar_arreglos, comprobar_tipo, estado_rng, restaurar_rng,
+                              estado_random, restaurar_random)
+from Comun.Convergencia import diversidad_genes
+from Comun.Perfilado import perfilador
 
 # Configuración inicial
 TIPOS = ['fuego', 'agua', 'planta', 'electrico', 'tierra']
@@ -13,7 +19,13 @@ GENERACIONES = 50
 MUTACION_PROB = 0.1
 ELITISMO = 2  # Número de mejores individuos que pasan directamente a la siguiente generación
 
+# Tablas para el motor vectorizado (mismo orden que TIPOS y que los genes)
+PESOS_GENES = np.array([0.3, 0.2, 0.25, 0.25])  # ataque, defensa, velocidad, vida
+BONUS_TIPOS = np.array([1.1, 1.05, 1.0, 1.03, 1.0])  # fuego, agua, planta, electrico, tierra
+
 class Pokemon:
+    __slots__ = ('ataque', 'defensa', 'velocidad', 'vida', 'tipo', 'fitness', 'sucio')
+
     def __init__(self, ataque=None, defensa=None, velocidad=None, vida=None, tipo=None):
         self.ataque = ataque if ataque is not None else random.random()
         self.defensa = defensa if defensa is not None else random.random()
@@ -21,6 +33,7 @@ class Pokemon:
         self.vida = vida if vida is not None else random.random()
         self.tipo = tipo if tipo is not None else random.choice(TIPOS)
         self.fitness = 0
+        self.sucio = True  # Genes nuevos o mutados cuyo fitness aún no se ha calculado
         
     def calcular_fitness(self):
         poder = (self.ataque * 0.3 +
@@ -37,58 +50,114 @@ class Pokemon:
             poder *= 1.03
             
         self.fitness = poder
+        self.sucio = False
         return poder
     
     def __str__(self):
         return f"Tipo: {self.tipo}, Ataque: {self.ataque:.2f}, Defensa: {self.defensa:.2f}, " \
                f"Velocidad: {self.velocidad:.2f}, Vida: {self.vida:.2f}, Fitness: {self.fitness:.2f}"
 
+def pokemon_a_dict(pokemon):
+    if pokemon is None:
+        return None
+    return {'tipo': pokemon.tipo, 'ataque': pokemon.ataque, 'defensa': pokemon.defensa,
+            'velocidad': pokemon.velocidad, 'vida': pokemon.vida, 'fitness': pokemon.fitness}
+
+def pokemon_desde_dict(datos):
+    if datos is None:
+        return None
+    pokemon = Pokemon(datos['ataque'], datos['defensa'], datos['velocidad'], datos['vida'], datos['tipo'])
+    pokemon.fitness = datos['fitness']
+    pokemon.sucio = False
+    return pokemon
+
 class AlgoritmoGenetico:
-    def __init__(self, poblacion_size, generaciones, mutacion_prob, elitismo):
+    def __init__(self, poblacion_size, generaciones, mutacion_prob, elitismo, *, modo_seleccion='ruleta',
+                 semilla=None, cache=None):
         self.poblacion_size = poblacion_size
         self.generaciones = generaciones
         self.mutacion_prob = mutacion_prob
         self.elitismo = elitismo
+        self.modo_seleccion = modo_seleccion
+        self.rng = np.random.default_rng(semilla)  # Selección
+        self.aleatorio = random.Random(semilla)  # Población inicial, cruce y mutación (sorteos de a uno)
+        self.cache = cache  # CacheFitness opcional
+        self.selector = None
         self.poblacion = []
+        self.poblacion_evaluada = False
+        self.elites = []  # Mejores individuos de la población evaluada, de mayor a menor
+        self.estadisticas = None  # (mejor, promedio, peor) de la población evaluada
+        self.evaluaciones = 0
         self.historial_fitness = []
         self.mejor_historico = None
         
     def inicializar_poblacion(self):
-        self.poblacion = [Pokemon() for _ in range(self.poblacion_size)]
+        aleatorio = self.aleatorio
+        self.poblacion = [Pokemon(aleatorio.random(), aleatorio.random(), aleatorio.random(), aleatorio.random(),
+                                  aleatorio.choice(TIPOS)) for _ in range(self.poblacion_size)]
+        self.poblacion_evaluada = False
         
     def evaluar_poblacion(self):
-        for pokemon in self.poblacion:
-            pokemon.calcular_fitness()
-        self.poblacion.sort(key=lambda x: x.fitness, reverse=True)
+        # Si la población no ha cambiado desde la última evaluación no hay nada que hacer
+        if self.poblacion_evaluada:
+            return
+        
+        # Solo se evalúan los individuos nuevos o mutados (las élites conservan su fitness)
+        with perfilador.fase('ag.evaluacion'):
+            for pokemon in self.poblacion:
+                if pokemon.sucio:
+                    self.evaluar_individuo(pokemon)
+        
+        # Élites y estadísticas en una sola pasada, sin ordenar toda la población
+        with perfilador.fase('ag.elites'):
+            self.elites, self.estadisticas = mejores_y_resumen(self.poblacion, self.elitismo)
         
         # Actualizar el mejor histórico
-        if self.mejor_historico is None or self.poblacion[0].fitness > self.mejor_historico.fitness:
+        self.actualizar_mejor_historico(self.elites[0])
+            
+        # Tabla de selección de esta generación (se construye una sola vez)
+        with perfilador.fase('ag.seleccion'):
+            fitness = np.fromiter((p.fitness for p in self.poblacion), dtype=np.float64, count=len(self.poblacion))
+            self.selector = crear_selector(self.modo_seleccion, fitness, self.rng)
+        self.poblacion_evaluada = True
+            
+    def mejores(self, cantidad):
+        """Los `cantidad` mejores Pokémon de la población evaluada, de mayor a menor"""
+        self.evaluar_poblacion()
+        if cantidad <= len(self.elites):
+            return self.elites[:cantidad]
+        return mejores_y_resumen(self.poblacion, cantidad)[0]
+            
+    def diversidad(self):
+        """Desviación estándar media de los genes numéricos de la población"""
+        return diversidad_genes([(p.ataque, p.defensa, p.velocidad, p.vida) for p in self.poblacion])
+            
+    def actualizar_mejor_historico(self, pokemon):
+        if self.mejor_historico is None or pokemon.fitness > self.mejor_historico.fitness:
             self.mejor_historico = Pokemon(
-                self.poblacion[0].ataque,
-                self.poblacion[0].defensa,
-                self.poblacion[0].velocidad,
-                self.poblacion[0].vida,
-                self.poblacion[0].tipo
+                pokemon.ataque,
+                pokemon.defensa,
+                pokemon.velocidad,
+                pokemon.vida,
+                pokemon.tipo
             )
-            self.mejor_historico.fitness = self.poblacion[0].fitness
+            self.mejor_historico.fitness = pokemon.fitness
+            
+    def evaluar_individuo(self, pokemon):
+        self.evaluaciones += 1
+        if self.cache is None:
+            return pokemon.calcular_fitness()
+        pokemon.fitness = self.cache.obtener(pokemon, pokemon.calcular_fitness)
+        pokemon.sucio = False
+        return pokemon.fitness
             
     def seleccion(self):
-        # Método de ruleta
-        total_fitness = sum(pokemon.fitness for pokemon in self.poblacion)
-        if total_fitness == 0:
-            return random.choice(self.poblacion)
-        
-        r = random.uniform(0, total_fitness)
-        acumulado = 0
-        for pokemon in self.poblacion:
-            acumulado += pokemon.fitness
-            if acumulado >= r:
-                return pokemon
-        return self.poblacion[-1]
+        # Un solo padre usando la tabla de la generación actual
+        return self.poblacion[self.selector.muestrear(1)[0]]
     
     def cruce(self, padre1, padre2):
         # Cruce de un punto
-        punto_cruce = random.randint(1, 4)
+        punto_cruce = self.aleatorio.randint(1, 4)
         
         if punto_cruce == 1:
             hijo = Pokemon(padre1.ataque, padre2.defensa, padre2.velocidad, padre2.vida, padre2.tipo)
@@ -102,218 +171,367 @@ class AlgoritmoGenetico:
         return hijo
     
     def mutacion(self, pokemon):
-        if random.random() < self.mutacion_prob:
-            gen = random.randint(1, 5)
+        aleatorio = self.aleatorio
+        if aleatorio.random() < self.mutacion_prob:
+            gen = aleatorio.randint(1, 5)
             if gen == 1:
-                pokemon.ataque = random.random()
+                pokemon.ataque = aleatorio.random()
             elif gen == 2:
-                pokemon.defensa = random.random()
+                pokemon.defensa = aleatorio.random()
             elif gen == 3:
-                pokemon.velocidad = random.random()
+                pokemon.velocidad = aleatorio.random()
             elif gen == 4:
-                pokemon.vida = random.random()
+                pokemon.vida = aleatorio.random()
             else:
-                pokemon.tipo = random.choice(TIPOS)
+                pokemon.tipo = aleatorio.choice(TIPOS)
+            pokemon.sucio = True
                 
     def ejecutar_generacion(self):
         # Evaluar la población actual
         self.evaluar_poblacion()
         
         # Guardar estadísticas
-        mejor_fitness = self.poblacion[0].fitness
-        peor_fitness = self.poblacion[-1].fitness
-        promedio_fitness = sum(p.fitness for p in self.poblacion) / len(self.poblacion)
+        mejor_fitness, promedio_fitness, peor_fitness = self.estadisticas
         self.historial_fitness.append((mejor_fitness, promedio_fitness, peor_fitness))
         
         # Crear nueva población (elitismo)
-        nueva_poblacion = self.poblacion[:self.elitismo]
-        
-        # Completar la nueva población
-        while len(nueva_poblacion) < self.poblacion_size:
-            padre1 = self.seleccion()
-            padre2 = self.seleccion()
-            hijo = self.cruce(padre1, padre2)
-            self.mutacion(hijo)
-            nueva_poblacion.append(hijo)
+        nueva_poblacion = self.elites[:self.elitismo]
+        
+        # Completar la nueva población (todos los padres en un solo sorteo)
+        num_hijos = max(self.poblacion_size - len(nueva_poblacion), 0)
+        with perfilador.fase('ag.seleccion'):
+            padres = self.selector.muestrear(2 * num_hijos)
+        with perfilador.fase('ag.cruce'):
+            hijos = [self.cruce(self.poblacion[padres[i]], self.poblacion[padres[num_hijos + i]])
+                     for i in range(num_hijos)]
+        with perfilador.fase('ag.mutacion'):
+            for hijo in hijos:
+                self.mutacion(hijo)
+        nueva_poblacion.extend(hijos)
             
         self.poblacion = nueva_poblacion
+        self.poblacion_evaluada = False
         
         return mejor_fitness, promedio_fitness, peor_fitness
 
-class SimuladorEvolucion:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Simulador de Evolución de Pokémon")
-        self.root.geometry("1000x700")
-        
-        self.ag = AlgoritmoGenetico(POBLACION_SIZE, GENERACIONES, MUTACION_PROB, ELITISMO)
-        self.generacion_actual = 0
-        
-        self.setup_ui()
-        self.ag.inicializar_poblacion()
-        self.actualizar_ui()
-        
-    def setup_ui(self):
-        # Frame principal
-        main_frame = ttk.Frame(self.root, padding="10")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Configurar grid
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(1, weight=1)
-        
-        # Panel de control
-        control_frame = ttk.LabelFrame(main_frame, text="Control", padding="5")
-        control_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
-        
-        ttk.Button(control_frame, text="Ejecutar Una Generación", command=self.ejecutar_generacion).grid(row=0, column=0, padx=5)
-        ttk.Button(control_frame, text="Ejecutar 10 Generaciones", command=self.ejecutar_10_generaciones).grid(row=0, column=1, padx=5)
-        ttk.Button(control_frame, text="Reiniciar Simulación", command=self.reiniciar).grid(row=0, column=2, padx=5)
-        
-        # Información de la generación actual
-        info_frame = ttk.LabelFrame(main_frame, text="Información de la Generación", padding="5")
-        info_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
-        
-        self.lbl_generacion = ttk.Label(info_frame, text="Generación: 0")
-        self.lbl_generacion.grid(row=0, column=0, sticky=tk.W, pady=2)
-        
-        self.lbl_mejor_fitness = ttk.Label(info_frame, text="Mejor Fitness: 0.00")
-        self.lbl_mejor_fitness.grid(row=1, column=0, sticky=tk.W, pady=2)
-        
-        self.lbl_promedio_fitness = ttk.Label(info_frame, text="Promedio Fitness: 0.00")
-        self.lbl_promedio_fitness.grid(row=2, column=0, sticky=tk.W, pady=2)
-        
-        self.lbl_peor_fitness = ttk.Label(info_frame, text="Peor Fitness: 0.00")
-        self.lbl_peor_fitness.grid(row=3, column=0, sticky=tk.W, pady=2)
-        
-        # Mejor Pokémon histórico
-        mejor_frame = ttk.LabelFrame(info_frame, text="Mejor Pokémon Histórico", padding="5")
-        mejor_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
-        
-        self.lbl_mejor_pokemon = ttk.Label(mejor_frame, text="Tipo: -")
-        self.lbl_mejor_pokemon.grid(row=0, column=0, sticky=tk.W, pady=2)
-        
-        # Lista de Pokémon actual
-        lista_frame = ttk.LabelFrame(main_frame, text="Población Actual (Top 10)", padding="5")
-        lista_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10), pady=(10, 0))
-        
-        # Crear Treeview para mostrar los Pokémon
-        columns = ('Tipo', 'Ataque', 'Defensa', 'Velocidad', 'Vida', 'Fitness')
-        self.tree = ttk.Treeview(lista_frame, columns=columns, show='headings', height=10)
-        
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=80)
-        
-        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Scrollbar para el Treeview
-        scrollbar = ttk.Scrollbar(lista_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        
-        # Gráfico de evolución
-        grafico_frame = ttk.LabelFrame(main_frame, text="Evolución del Fitness", padding="5")
-        grafico_frame.grid(row=1, column=1, rowspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        self.fig, self.ax = plt.subplots(figsize=(6, 5))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=grafico_frame)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Configurar pesos de grid
-        main_frame.rowconfigure(1, weight=1)
-        main_frame.rowconfigure(2, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        lista_frame.rowconfigure(0, weight=1)
-        lista_frame.columnconfigure(0, weight=1)
-        
-    def actualizar_ui(self):
-        # Actualizar información de la generación
-        self.lbl_generacion.config(text=f"Generación: {self.generacion_actual}")
-        
-        if self.generacion_actual > 0:
-            mejor, promedio, peor = self.ag.historial_fitness[-1]
-            self.lbl_mejor_fitness.config(text=f"Mejor Fitness: {mejor:.2f}")
-            self.lbl_promedio_fitness.config(text=f"Promedio Fitness: {promedio:.2f}")
-            self.lbl_peor_fitness.config(text=f"Peor Fitness: {peor:.2f}")
-            
-            # Actualizar mejor Pokémon histórico
-            if self.ag.mejor_historico:
-                self.lbl_mejor_pokemon.config(
-                    text=f"Tipo: {self.ag.mejor_historico.tipo}\n"
-                         f"Ataque: {self.ag.mejor_historico.ataque:.2f}\n"
-                         f"Defensa: {self.ag.mejor_historico.defensa:.2f}\n"
-                         f"Velocidad: {self.ag.mejor_historico.velocidad:.2f}\n"
-                         f"Vida: {self.ag.mejor_historico.vida:.2f}\n"
-                         f"Fitness: {self.ag.mejor_historico.fitness:.2f}"
-                )
-        
-        # Actualizar lista de Pokémon
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        self.ag.evaluar_poblacion()
-        for i, pokemon in enumerate(self.ag.poblacion[:10]):
-            self.tree.insert('', tk.END, values=(
-                pokemon.tipo,
-                f"{pokemon.ataque:.2f}",
-                f"{pokemon.defensa:.2f}",
-                f"{pokemon.velocidad:.2f}",
-                f"{pokemon.vida:.2f}",
-                f"{pokemon.fitness:.2f}"
-            ))
-            
-        # Actualizar gráfico
-        self.actualizar_grafico()
-        
-    def actualizar_grafico(self):
-        self.ax.clear()
-        
-        if len(self.ag.historial_fitness) > 0:
-            generaciones = list(range(1, len(self.ag.historial_fitness) + 1))
-            mejores = [h[0] for h in self.ag.historial_fitness]
-            promedios = [h[1] for h in self.ag.historial_fitness]
-            peores = [h[2] for h in self.ag.historial_fitness]
-            
-            self.ax.plot(generaciones, mejores, 'g-', label='Mejor')
-            self.ax.plot(generaciones, promedios, 'b-', label='Promedio')
-            self.ax.plot(generaciones, peores, 'r-', label='Peor')
-            
-            self.ax.set_xlabel('Generación')
-            self.ax.set_ylabel('Fitness')
-            self.ax.set_title('Evolución del Fitness')
-            self.ax.legend()
-            self.ax.grid(True, linestyle='--', alpha=0.7)
-            
-        self.canvas.draw()
+    def parametros(self):
+        return {'poblacion_size': self.poblacion_size, 'generaciones': self.generaciones,
+                'mutacion_prob': self.mutacion_prob, 'elitismo': self.elitismo,
+                'modo_seleccion': self.modo_seleccion}
+    
+    def guardar_checkpoint(self, ruta):
+        """Guarda población, mejor histórico, historial y estado aleatorio en el directorio `ruta`"""
+        n = len(self.poblacion)
+        genes = np.array([(p.ataque, p.defensa, p.velocidad, p.vida) for p in self.poblacion]).reshape(n, 4)
+        tipos = np.fromiter((TIPOS.index(p.tipo) for p in self.poblacion), dtype=np.int8, count=n)
+        fitness = np.fromiter((p.fitness for p in self.poblacion), dtype=np.float64, count=n)
+        sucios = np.fromiter((p.sucio for p in self.poblacion), dtype=bool, count=n)
+        historial = np.array(self.historial_fitness, dtype=np.float64).reshape(-1, 3)
+        guardar_arreglos(ruta, {'genes': genes, 'tipos': tipos, 'fitness': fitness, 'sucios': sucios,
+                                'historial': historial}, {
+            'tipo': type(self).__name__,
+            'parametros': self.parametros(),
+            'evaluaciones': self.evaluaciones,
+            'mejor_historico': pokemon_a_dict(self.mejor_historico),
+            'rng': estado_rng(self.rng),
+            'random': estado_random(self.aleatorio),
+        })
+    
+    def cargar_checkpoint(self, ruta, mmap=True):
+        """Reanuda desde un checkpoint guardado con guardar_checkpoint"""
+        arreglos, meta = cargar_arreglos(ruta, mmap)
+        comprobar_tipo(meta, type(self).__name__)
+        for nombre, valor in meta['parametros'].items():
+            setattr(self, nombre, valor)
         
+        self.poblacion = []
+        for genes, tipo, fitness, sucio in zip(arreglos['genes'].tolist(), arreglos['tipos'].tolist(),
+                                               arreglos['fitness'].tolist(), arreglos['sucios'].tolist()):
+            pokemon = Pokemon(*genes, TIPOS[tipo])
+            pokemon.fitness = fitness
+            pokemon.sucio = sucio
+            self.poblacion.append(pokemon)
+        self.poblacion_evaluada = False
+        
+        self.historial_fitness = [tuple(h) for h in arreglos['historial'].tolist()]
+        self.mejor_historico = pokemon_desde_dict(meta['mejor_historico'])
+        self.evaluaciones = meta['evaluaciones']
+        restaurar_rng(self.rng, meta['rng'])
+        restaurar_random(meta['random'], self.aleatorio)
+
+class PokemonVista:
+    """Proxy ligero de una fila de AlgoritmoGeneticoVectorizado
+
+    Lee y escribe directamente en los arreglos del algoritmo (sin copiar genes),
+    así que solo ocupa dos referencias. Asignar un gen marca la fila como sucia.
+    """
+    __slots__ = ('algoritmo', 'indice')
+
+    def __init__(self, algoritmo, indice):
+        self.algoritmo = algoritmo
+        self.indice = indice
+
+    def leer_gen(self, columna):
+        return float(self.algoritmo.genes[self.indice, columna])
+
+    def escribir_gen(self, columna, valor):
+        self.algoritmo.genes[self.indice, columna] = valor
+        self.algoritmo.marcar_sucio(self.indice)
+
+    ataque = property(lambda self: self.leer_gen(0), lambda self, v: self.escribir_gen(0, v))
+    defensa = property(lambda self: self.leer_gen(1), lambda self, v: self.escribir_gen(1, v))
+    velocidad = property(lambda self: self.leer_gen(2), lambda self, v: self.escribir_gen(2, v))
+    vida = property(lambda self: self.leer_gen(3), lambda self, v: self.escribir_gen(3, v))
+
+    @property
+    def tipo(self):
+        return TIPOS[self.algoritmo.tipos[self.indice]]
+
+    @tipo.setter
+    def tipo(self, tipo):
+        self.algoritmo.tipos[self.indice] = TIPOS.index(tipo)
+        self.algoritmo.marcar_sucio(self.indice)
+
+    @property
+    def fitness(self):
+        return float(self.algoritmo.fitness[self.indice])
+
+    @property
+    def sucio(self):
+        return bool(self.algoritmo.sucios[self.indice])
+
+    def copiar(self):
+        """Pokemon independiente con los valores actuales de la fila"""
+        return self.algoritmo.obtener_pokemon(self.indice)
+
+    def __str__(self):
+        return f"Tipo: {self.tipo}, Ataque: {self.ataque:.2f}, Defensa: {self.defensa:.2f}, " \
+               f"Velocidad: {self.velocidad:.2f}, Vida: {self.vida:.2f}, Fitness: {self.fitness:.2f}"
+
+class VistaPoblacion(Sequence):
+    """Población de AlgoritmoGeneticoVectorizado vista como lista de PokemonVista
+
+    Los proxies se crean al acceder a cada posición, de modo que recorrer
+    millones de individuos no duplica la población en objetos de Python.
+    """
+    __slots__ = ('algoritmo',)
+
+    def __init__(self, algoritmo):
+        self.algoritmo = algoritmo
+
+    def __len__(self):
+        return len(self.algoritmo.genes)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [PokemonVista(self.algoritmo, i) for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+        return PokemonVista(self.algoritmo, indice)
+
+class AlgoritmoGeneticoVectorizado:
+    """Algoritmo genético con la población guardada en arreglos de NumPy.
+
+    Los genes (ataque, defensa, velocidad, vida) viven en una matriz (N, 4) y el
+    tipo como índice int8 en TIPOS, de modo que fitness, cruce y mutación se
+    calculan en una sola pasada vectorizada por generación. Con `dtype=np.float32`
+    los genes ocupan la mitad (unos 26 bytes por individuo en total).
+    """
+    def __init__(self, poblacion_size, generaciones, mutacion_prob, elitismo, *, modo_seleccion='ruleta',
+                 semilla=None, dtype=np.float64):
+        self.poblacion_size = poblacion_size
+        self.generaciones = generaciones
+        self.mutacion_prob = mutacion_prob
+        self.elitismo = elitismo
+        self.modo_seleccion = modo_seleccion
+        self.dtype = np.dtype(dtype)
+        self.pesos_genes = PESOS_GENES.astype(self.dtype)
+        self.rng = np.random.default_rng(semilla)
+        self.selector = None
+        self.genes = np.empty((0, 4), dtype=self.dtype)
+        self.tipos = np.empty(0, dtype=np.int8)
+        self.fitness = np.empty(0)
+        self.sucios = np.empty(0, dtype=bool)  # Filas nuevas o mutadas sin fitness calculado
+        self.poblacion_evaluada = False
+        self.indices_elite = np.empty(0, dtype=np.intp)  # Mejores filas, de mayor a menor fitness
+        self.estadisticas = None  # (mejor, promedio, peor) de la población evaluada
+        self.evaluaciones = 0
+        self.historial_fitness = []
+        self.mejor_historico = None
+
+    def inicializar_poblacion(self):
+        self.genes = self.rng.random((self.poblacion_size, 4), dtype=self.dtype)
+        self.tipos = self.rng.integers(0, len(TIPOS), self.poblacion_size, dtype=np.int8)
+        self.fitness = np.zeros(self.poblacion_size)
+        self.sucios = np.ones(self.poblacion_size, dtype=bool)
+        self.poblacion_evaluada = False
+
+    def obtener_pokemon(self, indice):
+        """Construye un objeto Pokemon a partir de una fila de la población"""
+        ataque, defensa, velocidad, vida = self.genes[indice].tolist()
+        pokemon = Pokemon(ataque, defensa, velocidad, vida, TIPOS[self.tipos[indice]])
+        pokemon.fitness = float(self.fitness[indice])
+        return pokemon
+
+    @property
+    def poblacion(self):
+        """Vista de la población con proxies PokemonVista (no copia los genes)"""
+        return VistaPoblacion(self)
+
+    def marcar_sucio(self, indice):
+        self.sucios[indice] = True
+        self.poblacion_evaluada = False
+
+    def calcular_fitness(self, genes, tipos):
+        self.evaluaciones += len(genes)
+        return (genes @ self.pesos_genes) * BONUS_TIPOS[tipos]
+
+    def evaluar_poblacion(self):
+        # Si la población no ha cambiado desde la última evaluación no hay nada que hacer
+        if self.poblacion_evaluada:
+            return
+
+        # Solo se evalúan las filas nuevas o mutadas (las élites conservan su fitness)
+        with perfilador.fase('ag.evaluacion'):
+            sucios = np.flatnonzero(self.sucios)
+            self.fitness[sucios] = self.calcular_fitness(self.genes[sucios], self.tipos[sucios])
+            self.sucios[:] = False
+
+        # Élites por selección parcial, sin ordenar toda la población
+        with perfilador.fase('ag.elites'):
+            self.indices_elite = mejores_indices(self.fitness, max(self.elitismo, 1))
+            self.estadisticas = resumen_arreglo(self.fitness, self.indices_elite)
+
+        # Actualizar el mejor histórico
+        mejor = self.indices_elite[0]
+        if self.mejor_historico is None or self.fitness[mejor] > self.mejor_historico.fitness:
+            self.mejor_historico = self.obtener_pokemon(mejor)
+
+        with perfilador.fase('ag.seleccion'):
+            self.selector = crear_selector(self.modo_seleccion, self.fitness, self.rng)
+        self.poblacion_evaluada = True
+
+    def seleccion(self, cantidad):
+        """Selecciona `cantidad` padres en un solo sorteo, devuelve sus índices"""
+        return self.selector.muestrear(cantidad)
+
+    def mejores(self, cantidad):
+        """Genes, tipos y fitness de los `cantidad` mejores, de mayor a menor fitness"""
+        self.evaluar_poblacion()
+        if cantidad <= len(self.indices_elite):
+            indices = self.indices_elite[:cantidad]
+        else:
+            indices = mejores_indices(self.fitness, cantidad)
+        return self.genes[indices], self.tipos[indices], self.fitness[indices]
+
+    def diversidad(self):
+        """Desviación estándar media de los genes numéricos de la población"""
+        return diversidad_genes(self.genes)
+
+    def reemplazar_peores(self, genes, tipos):
+        """Sustituye a los peores individuos por los recibidos y los evalúa"""
+        self.evaluar_poblacion()
+        cantidad = max(min(len(genes), len(self.genes) - self.elitismo), 0)
+        if cantidad <= 0:
+            return
+        peores = peores_indices(self.fitness, cantidad)
+        self.genes[peores] = genes[:cantidad]
+        self.tipos[peores] = tipos[:cantidad]
+        self.fitness[peores] = self.calcular_fitness(self.genes[peores], self.tipos[peores])
+        self.poblacion_evaluada = False  # Hay que recalcular élites y estadísticas
+
+    def cruce(self, padres1, padres2):
+        """Cruce de un punto para todas las parejas a la vez"""
+        puntos_cruce = self.rng.integers(1, 5, len(padres1))
+        mascara = np.arange(4) < puntos_cruce[:, None]
+        genes = np.where(mascara, self.genes[padres1], self.genes[padres2])
+        tipos = self.tipos[padres2]
+        return genes, tipos
+
+    def mutacion(self, genes, tipos):
+        """Muta en el sitio un gen (o el tipo) de cada hijo con probabilidad mutacion_prob"""
+        mutados = np.flatnonzero(self.rng.random(len(genes)) < self.mutacion_prob)
+        gen = self.rng.integers(0, 5, len(mutados))
+
+        # Genes numéricos (0-3) y tipo (4)
+        numericos = gen < 4
+        genes[mutados[numericos], gen[numericos]] = self.rng.random(numericos.sum())
+        cambian_tipo = mutados[~numericos]
+        tipos[cambian_tipo] = self.rng.integers(0, len(TIPOS), len(cambian_tipo), dtype=np.int8)
+
     def ejecutar_generacion(self):
-        if self.generacion_actual < self.ag.generaciones:
-            self.ag.ejecutar_generacion()
-            self.generacion_actual += 1
-            self.actualizar_ui()
-            
-    def ejecutar_10_generaciones(self):
-        for _ in range(10):
-            if self.generacion_actual < self.ag.generaciones:
-                self.ag.ejecutar_generacion()
-                self.generacion_actual += 1
-                self.actualizar_ui()
-                self.root.update()
-                time.sleep(0.1)  # Pequeña pausa para visualización
-                
-    def reiniciar(self):
-        self.ag = AlgoritmoGenetico(POBLACION_SIZE, GENERACIONES, MUTACION_PROB, ELITISMO)
-        self.generacion_actual = 0
-        self.ag.inicializar_poblacion()
-        self.actualizar_ui()
-        
-    def run(self):
-        self.root.mainloop()
+        # Evaluar la población actual
+        self.evaluar_poblacion()
+
+        # Guardar estadísticas
+        mejor_fitness, promedio_fitness, peor_fitness = self.estadisticas
+        self.historial_fitness.append((mejor_fitness, promedio_fitness, peor_fitness))
+
+        # Hijos necesarios para completar la nueva población
+        elites = self.indices_elite[:self.elitismo]
+        num_hijos = max(self.poblacion_size - len(elites), 0)
+        with perfilador.fase('ag.seleccion'):
+            padres = self.seleccion(2 * num_hijos)
+        with perfilador.fase('ag.cruce'):
+            genes_hijos, tipos_hijos = self.cruce(padres[:num_hijos], padres[num_hijos:])
+        with perfilador.fase('ag.mutacion'):
+            self.mutacion(genes_hijos, tipos_hijos)
+
+        # Nueva población (elitismo + hijos)
+        with perfilador.fase('ag.reemplazo'):
+            self.genes = np.concatenate([self.genes[elites], genes_hijos])
+            self.tipos = np.concatenate([self.tipos[elites], tipos_hijos])
+            self.fitness = np.concatenate([self.fitness[elites], np.zeros(num_hijos)])
+            self.sucios = np.concatenate([np.zeros(len(elites), dtype=bool), np.ones(num_hijos, dtype=bool)])
+        self.poblacion_evaluada = False
+
+        return mejor_fitness, promedio_fitness, peor_fitness
+
+    def parametros(self):
+        return {'poblacion_size': self.poblacion_size, 'generaciones': self.generaciones,
+                'mutacion_prob': self.mutacion_prob, 'elitismo': self.elitismo,
+                'modo_seleccion': self.modo_seleccion}
+
+    def guardar_checkpoint(self, ruta):
+        """Guarda los arreglos de la población tal cual (sin conversión ni pickle)"""
+        historial = np.array(self.historial_fitness, dtype=np.float64).reshape(-1, 3)
+        guardar_arreglos(ruta, {'genes': self.genes, 'tipos': self.tipos, 'fitness': self.fitness,
+                                'sucios': self.sucios, 'historial': historial}, {
+            'tipo': type(self).__name__,
+            'parametros': self.parametros(),
+            'evaluaciones': self.evaluaciones,
+            'mejor_historico': pokemon_a_dict(self.mejor_historico),
+            'rng': estado_rng(self.rng),
+        })
+
+    def cargar_checkpoint(self, ruta, mmap=True):
+        """Reanuda desde un checkpoint guardado con guardar_checkpoint
+
+        La población se copia del mapa: si quedara mapeada, el próximo
+        guardar_checkpoint en la misma ruta no podría reemplazar los archivos.
+        """
+        arreglos, meta = cargar_arreglos(ruta, mmap)
+        comprobar_tipo(meta, type(self).__name__)
+        for nombre, valor in meta['parametros'].items():
+            setattr(self, nombre, valor)
+
+        self.genes = np.array(arreglos['genes'])
+        self.dtype = self.genes.dtype
+        self.pesos_genes = PESOS_GENES.astype(self.dtype)
+        self.tipos = np.array(arreglos['tipos'])
+        self.fitness = np.array(arreglos['fitness'])
+        self.sucios = np.array(arreglos['sucios'])
+        self.poblacion_evaluada = False
+
+        self.historial_fitness = [tuple(h) for h in arreglos['historial'].tolist()]
+        self.mejor_historico = pokemon_desde_dict(meta['mejor_historico'])
+        self.evaluaciones = meta['evaluaciones']
+        restaurar_rng(self.rng, meta['rng'])
 
-# Ejecutar la aplicación
+# Ejecutar la aplicación (la interfaz vive en Interfaz_Pokemon.py)
 if __name__ == "__main__":
+    from Interfaz_Pokemon import SimuladorEvolucion
     app = SimuladorEvolucion()
-    app.run()
\ No newline at end of file
+    app.run()
@@ -0,0 +1,128 @@
+"""Ejecución del algoritmo genético en un hilo aparte.
+
+La interfaz no toca el algoritmo mientras corre: le envía órdenes por una cola
+y recibe instantáneas (`Instantanea`) por otra. El hilo publica como mucho una
+instantánea cada `intervalo_publicacion` segundos, así que el ritmo de cómputo
+no depende de lo que tarde la interfaz en dibujar. El historial no se copia en
+cada instantánea: la lista solo crece, así que la interfaz lee las entradas
+nuevas desde la última que ya tiene.
+"""
+import queue
+import threading
+import time
+import os
+import sys
+from collections import namedtuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from Comun.Convergencia import MonitorConvergencia
+
+Instantanea = namedtuple('Instantanea', [
+    'generacion',       # Generaciones ejecutadas
+    'historial',        # historial_fitness del algoritmo (solo crece): leer solo las primeras `generacion` entradas
+    'mejor_historico',  # Pokemon independiente o None
+    'top',              # [(tipo, ataque, defensa, velocidad, vida, fitness), ...] de mayor a menor
+    'cache',            # (aciertos, fallos) o None si no hay caché
+    'en_curso',         # True mientras se atiende una orden
+    'motivo',           # Por qué terminó la última orden (None mientras sigue en curso)
+])
+
+
+class TrabajadorEvolucion(threading.Thread):
+    def __init__(self, ag, intervalo_publicacion=1 / 60, tamano_top=10):
+        super().__init__(daemon=True)
+        self.ag = ag
+        self.generacion_actual = 0
+        self.intervalo_publicacion = intervalo_publicacion
+        self.tamano_top = tamano_top
+        self.ordenes = queue.Queue()
+        self.instantaneas = queue.Queue()
+        self.evento_detener = threading.Event()
+        self.evento_terminar = threading.Event()
+        self.ultima_publicacion = 0.0
+
+    # Órdenes (se pueden llamar desde cualquier hilo)
+    def avanzar(self, cantidad, tope=None):
+        """Ejecuta `cantidad` generaciones más, sin pasar de `tope`"""
+        self.ordenes.put(('avanzar', cantidad, tope))
+
+    def ejecutar_hasta(self, objetivo):
+        """Ejecuta hasta llegar a la generación `objetivo`"""
+        self.ordenes.put(('hasta', objetivo))
+
+    def ejecutar_hasta_convergencia(self, ventana=20, tolerancia=1e-6, diversidad_minima=1e-3, limite=10_000):
+        """Ejecuta hasta que el mejor fitness se estanque o la población pierda diversidad"""
+        self.ordenes.put(('convergencia', ventana, tolerancia, diversidad_minima, limite))
+
+    def detener(self):
+        """Interrumpe la orden en curso (las pendientes se siguen atendiendo)"""
+        self.evento_detener.set()
+
+    def terminar(self):
+        """Interrumpe la orden en curso, descarta las pendientes y cierra el hilo"""
+        self.evento_terminar.set()
+        self.evento_detener.set()
+        self.ordenes.put(('terminar',))
+
+    def ultima_instantanea(self):
+        """La instantánea más reciente de la cola (descarta las intermedias) o None"""
+        ultima = None
+        while True:
+            try:
+                ultima = self.instantaneas.get_nowait()
+            except queue.Empty:
+                return ultima
+
+    # Hilo de cómputo
+    def run(self):
+        self.publicar(False, None)
+        while True:
+            orden = self.ordenes.get()
+            if orden[0] == 'terminar' or self.evento_terminar.is_set():
+                return
+            self.evento_detener.clear()
+            if orden[0] == 'avanzar':
+                _, cantidad, tope = orden
+                objetivo = self.generacion_actual + cantidad
+                motivo = self.ejecutar(objetivo if tope is None else min(objetivo, tope))
+            elif orden[0] == 'hasta':
+                motivo = self.ejecutar(orden[1])
+            else:
+                motivo = self.ejecutar_convergencia(*orden[1:])
+            self.publicar(False, motivo)
+
+    def paso(self):
+        self.ag.ejecutar_generacion()
+        self.generacion_actual += 1
+        if time.perf_counter() - self.ultima_publicacion >= self.intervalo_publicacion:
+            self.publicar(True, None)
+
+    def ejecutar(self, objetivo):
+        while self.generacion_actual < objetivo:
+            if self.evento_detener.is_set():
+                return 'detenido'
+            self.paso()
+        return 'objetivo alcanzado'
+
+    def ejecutar_convergencia(self, ventana, tolerancia, diversidad_minima, limite):
+        monitor = MonitorConvergencia(ventana, tolerancia, diversidad_minima)
+        while self.generacion_actual < limite:
+            if self.evento_detener.is_set():
+                return 'detenido'
+            self.paso()
+            if monitor.actualizar(self.ag.historial_fitness[-1][0], self.ag.diversidad()):
+                return f'convergió: {monitor.motivo}'
+        return 'límite de generaciones'
+
+    def publicar(self, en_curso, motivo):
+        ag = self.ag
+        top = [(p.tipo, p.ataque, p.defensa, p.velocidad, p.vida, p.fitness)
+               for p in ag.mejores(self.tamano_top)]
+        mejor = ag.mejor_historico
+        if mejor is not None:
+            mejor = type(mejor)(mejor.ataque, mejor.defensa, mejor.velocidad, mejor.vida, mejor.tipo)
+            mejor.fitness = ag.mejor_historico.fitness
+        cache = (ag.cache.aciertos, ag.cache.fallos) if ag.cache is not None else None
+        self.instantaneas.put(Instantanea(self.generacion_actual, ag.historial_fitness, mejor,
+                                          top, cache, en_curso, motivo))
+        self.ultima_publicacion = time.perf_counter()
@@ -0,0 +1,347 @@
+"""Almacenes de feromonas de la colonia de playlists.
+
+Los dos exponen la misma interfaz (valores, filas, evaporar, depositar...):
+
+- `FeromonasDensas`: matriz (n, n). Simple y rápida para catálogos de hasta
+  unas decenas de miles de canciones.
+- `FeromonasDispersas`: solo guarda las aristas reforzadas; el resto vale la
+  feromona por defecto. La evaporación es perezosa: en vez de multiplicar cada
+  arista, se multiplica una escala global y los valores se guardan divididos
+  por ella, así que evaporar cuesta O(1). Las aristas nuevas van a un tramo
+  pendiente chico que se fusiona con el principal de una sola pasada cuando
+  crece, así que depositar no copia todo el almacén. Cuando la escala se acerca
+  al desbordamiento por abajo se renormaliza todo el almacén. El resultado es
+  el mismo que con la matriz densa.
+
+Los dos acumulan además cuánto cambian las proporciones de feromona de cada
+fila al depositar, así que `deriva(marca)` dice en O(1) cuánto pudieron cambiar
+desde `marca()` (por ejemplo para invalidar playlists en caché).
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from Comun.Convergencia import entropia_feromonas
+
+ESCALA_MINIMA = 1e-150  # Por debajo se renormaliza para no perder precisión
+MIN_PENDIENTES = 1024  # Aristas nuevas que se acumulan como mínimo antes de fusionarlas
+
+
+def tramos(claves, origenes, n):
+    """(fila, posición) de cada clave de `claves` (ordenadas) cuyo origen está en `origenes`
+
+    `fila` es el índice en `origenes`; todo sale de un solo searchsorted.
+    """
+    inicios = np.searchsorted(claves, origenes * n)
+    largos = np.searchsorted(claves, (origenes + 1) * n) - inicios
+    filas = np.repeat(np.arange(len(origenes)), largos)
+    desplazamientos = np.arange(len(filas)) - np.repeat(np.cumsum(largos) - largos, largos)
+    return filas, np.repeat(inicios, largos) + desplazamientos
+
+
+class AlmacenFeromonas:
+    """Medición de la deriva común a los dos almacenes
+
+    Evaporar multiplica todas las feromonas por igual y no cambia las
+    probabilidades; lo que las cambia es depositar. En cada depósito se calcula,
+    para cada fila tocada, la distancia de variación total entre sus
+    proporciones de feromona antes y después, y se acumula la mayor. La
+    diferencia entre dos valores acumulados acota cuánto cambió cualquier fila
+    entre medio. Las subclases llaman a `acumular_deriva` antes de depositar.
+    """
+    def iniciar_deriva(self):
+        self.deriva_acumulada = 0.0
+        self.ediciones = 0  # Asignaciones y restauraciones: cambios que no se miden
+
+    def marca(self):
+        return (self.deriva_acumulada, self.ediciones)
+
+    def deriva(self, marca):
+        """Cota (0 a 1) del cambio de proporciones de cualquier fila desde `marca`
+
+        Cualquier asignación o restauración posterior cuenta como deriva total.
+        """
+        deriva_acumulada, ediciones = marca
+        if ediciones != self.ediciones:
+            return 1.0
+        return min(1.0, self.deriva_acumulada - deriva_acumulada)
+
+    def acumular_deriva(self, filas, deltas, previos, masas_filas):
+        """`deltas` por arista (sin repetir) de `filas`, con sus valores `previos` y la masa de cada fila tocada
+
+        `masas_filas[i]` es la suma de la fila `np.unique(filas)[i]`. Las unidades dan
+        igual (el almacén disperso usa valores crudos) mientras sean las mismas.
+        """
+        tocadas, grupo = np.unique(filas, return_inverse=True)
+        masas = np.asarray(masas_filas, dtype=np.float64)
+        depositos = np.bincount(grupo, weights=deltas, minlength=len(tocadas))
+        previas = np.bincount(grupo, weights=previos, minlength=len(tocadas))
+        desvios = np.bincount(grupo, weights=np.abs(deltas * masas[grupo] - previos * depositos[grupo]),
+                              minlength=len(tocadas))
+        # TV = (sum_e |tau'_e / M' - tau_e / M|) / 2 con M' = M + D, separando las aristas sin depósito
+        numerador = (masas - previas) * depositos + desvios
+        denominador = masas * (masas + depositos)
+        cambios = np.divide(numerador, 2 * denominador, out=np.ones(len(tocadas)), where=denominador > 0)
+        if len(cambios):
+            self.deriva_acumulada += float(cambios.max())
+
+
+class FeromonasDensas(AlmacenFeromonas):
+    def __init__(self, n, inicial):
+        self.matriz = np.full((n, n), inicial)
+        np.fill_diagonal(self.matriz, 0)  # No hay transición a sí misma
+        self.iniciar_deriva()
+
+    @property
+    def n(self):
+        return len(self.matriz)
+
+    def valores(self, origenes, destinos):
+        return self.matriz[origenes, destinos]
+
+    def filas(self, origenes):
+        return self.matriz[origenes]
+
+    def asignar(self, origen, destino, valor):
+        self.matriz[origen, destino] = valor
+        self.ediciones += 1
+
+    def evaporar(self, factor):
+        self.matriz *= factor
+
+    def depositar(self, origenes, destinos, delta):
+        claves, repeticiones = np.unique(np.asarray(origenes) * self.n + np.asarray(destinos), return_counts=True)
+        filas, columnas = np.divmod(claves, self.n)
+        deltas = repeticiones * delta
+        self.acumular_deriva(filas, deltas, self.matriz[filas, columnas], self.matriz[np.unique(filas)].sum(axis=1))
+        self.matriz[filas, columnas] += deltas
+
+    def combinar(self, otro, peso):
+        """Almacén nuevo con (1 - peso) * self + peso * otro"""
+        combinado = FeromonasDensas(0, 0.0)
+        combinado.matriz = (1 - peso) * self.matriz + peso * otro.matriz
+        return combinado
+
+    def densa(self):
+        """La matriz viva (n, n), sin copiar"""
+        return self.matriz
+
+    def entropia(self):
+        return entropia_feromonas(self.matriz)
+
+    def arreglos(self):
+        return {'feromonas': self.matriz}, {}
+
+    def restaurar(self, arreglos, meta):
+        # Copia: si fuera un mapa del checkpoint, guardar otro en la misma ruta no podría reemplazarlo
+        self.matriz = np.array(arreglos['feromonas'])
+        self.ediciones += 1
+
+
+class FeromonasDispersas(AlmacenFeromonas):
+    """Aristas reforzadas en arreglos ordenados por clave origen * n + destino
+
+    `crudos` guarda cada valor dividido por la escala global, de modo que el
+    valor real es `crudo * escala`; las aristas no guardadas valen
+    `base * escala`. `iteraciones` marca la última evaporación en que se reforzó
+    cada arista: con `max_aristas` el almacén descarta las que llevan más tiempo
+    sin refuerzo al pasarse de ese tamaño.
+
+    Las aristas nuevas se insertan en un segundo juego de arreglos ordenados
+    (`pendientes`), con claves distintas de las del principal. Cuando pasa de
+    max(MIN_PENDIENTES, raíz de las aristas guardadas) se fusiona con el
+    principal: insertar cuesta O(pendientes) y fusionar O(aristas) cada tantas
+    inserciones, en vez de copiar el almacén entero en cada depósito.
+    """
+    def __init__(self, n, inicial, max_aristas=None):
+        self.n = n
+        self.max_aristas = max_aristas
+        self.claves = np.empty(0, dtype=np.int64)
+        self.crudos = np.empty(0)
+        self.iteraciones = np.empty(0, dtype=np.int64)
+        self.vaciar_pendientes()
+        self.base = float(inicial)
+        self.escala = 1.0
+        self.iteracion = 0
+        self.iniciar_deriva()
+
+    def vaciar_pendientes(self):
+        self.claves_pendientes = np.empty(0, dtype=np.int64)
+        self.crudos_pendientes = np.empty(0)
+        self.iteraciones_pendientes = np.empty(0, dtype=np.int64)
+
+    @property
+    def num_aristas(self):
+        return len(self.claves) + len(self.claves_pendientes)
+
+    @staticmethod
+    def buscar_en(claves_guardadas, claves):
+        """(posiciones, encontradas) de `claves` en el arreglo ordenado `claves_guardadas`"""
+        posiciones = np.searchsorted(claves_guardadas, claves)
+        encontradas = np.zeros(np.shape(claves), dtype=bool)
+        dentro = posiciones < len(claves_guardadas)
+        encontradas[dentro] = claves_guardadas[posiciones[dentro]] == np.asarray(claves)[dentro]
+        return posiciones, encontradas
+
+    def crudos_de(self, claves):
+        """Valores crudos de `claves` (la base si no están guardadas)"""
+        crudos = np.full(np.shape(claves), self.base)
+        for guardadas, valores in ((self.claves, self.crudos), (self.claves_pendientes, self.crudos_pendientes)):
+            posiciones, encontradas = self.buscar_en(guardadas, claves)
+            crudos[encontradas] = valores[posiciones[encontradas]]
+        return crudos
+
+    def valores(self, origenes, destinos):
+        origenes, destinos = np.broadcast_arrays(np.asarray(origenes, dtype=np.int64),
+                                                 np.asarray(destinos, dtype=np.int64))
+        crudos = self.crudos_de(origenes * self.n + destinos)
+        crudos[origenes == destinos] = 0
+        return crudos * self.escala
+
+    def filas(self, origenes):
+        origenes = np.asarray(origenes, dtype=np.int64)
+        resultado = np.full((len(origenes), self.n), self.base)
+        for claves, crudos in ((self.claves, self.crudos), (self.claves_pendientes, self.crudos_pendientes)):
+            filas, posiciones = tramos(claves, origenes, self.n)
+            resultado[filas, claves[posiciones] - origenes[filas] * self.n] = crudos[posiciones]
+        resultado[np.arange(len(origenes)), origenes] = 0
+        resultado *= self.escala
+        return resultado
+
+    def asignar(self, origen, destino, valor):
+        self.ediciones += 1
+        self.actualizar(np.array([origen * self.n + destino]), np.array([valor / self.escala]), sumar=False)
+
+    def evaporar(self, factor):
+        self.escala *= factor
+        self.iteracion += 1
+        if self.escala < ESCALA_MINIMA:
+            self.renormalizar()
+
+    def renormalizar(self):
+        """Pasa la escala global a los valores guardados (O(aristas))"""
+        self.crudos *= self.escala
+        self.crudos_pendientes *= self.escala
+        self.base *= self.escala
+        self.escala = 1.0
+
+    def depositar(self, origenes, destinos, delta):
+        claves = np.asarray(origenes, dtype=np.int64) * self.n + np.asarray(destinos, dtype=np.int64)
+        claves, repeticiones = np.unique(claves, return_counts=True)
+        crudos = repeticiones * (delta / self.escala)
+        filas = claves // self.n
+        self.acumular_deriva(filas, crudos, self.crudos_de(claves), self.masas_crudas(np.unique(filas)))
+        self.actualizar(claves, crudos, sumar=True)
+
+    def masas_crudas(self, origenes):
+        """Suma de cada fila de `origenes` en valores crudos (sin la escala global)"""
+        origenes = np.asarray(origenes, dtype=np.int64)
+        guardadas = np.zeros(len(origenes))
+        cantidades = np.zeros(len(origenes), dtype=np.int64)
+        for claves, crudos in ((self.claves, self.crudos), (self.claves_pendientes, self.crudos_pendientes)):
+            filas, posiciones = tramos(claves, origenes, self.n)
+            guardadas += np.bincount(filas, weights=crudos[posiciones], minlength=len(origenes))
+            cantidades += np.bincount(filas, minlength=len(origenes))
+        return guardadas + (self.n - 1 - cantidades) * self.base
+
+    def actualizar(self, claves, crudos, sumar):
+        """Suma o asigna `crudos` en `claves` (ordenadas y sin repetir), creando las que falten"""
+        nuevas = np.ones(len(claves), dtype=bool)
+        for guardadas, valores, iteraciones in ((self.claves, self.crudos, self.iteraciones),
+                                                (self.claves_pendientes, self.crudos_pendientes,
+                                                 self.iteraciones_pendientes)):
+            posiciones, encontradas = self.buscar_en(guardadas, claves)
+            existentes = posiciones[encontradas]
+            if sumar:
+                valores[existentes] += crudos[encontradas]
+            else:
+                valores[existentes] = crudos[encontradas]
+            iteraciones[existentes] = self.iteracion
+            nuevas &= ~encontradas
+
+        if nuevas.any():
+            # Solo se copia el tramo pendiente, que es chico
+            posiciones = np.searchsorted(self.claves_pendientes, claves[nuevas])
+            self.claves_pendientes = np.insert(self.claves_pendientes, posiciones, claves[nuevas])
+            self.crudos_pendientes = np.insert(self.crudos_pendientes, posiciones,
+                                               crudos[nuevas] + (self.base if sumar else 0))
+            self.iteraciones_pendientes = np.insert(self.iteraciones_pendientes, posiciones, self.iteracion)
+            if len(self.claves_pendientes) > max(MIN_PENDIENTES, int(np.sqrt(len(self.claves)))):
+                self.fusionar()
+            if self.max_aristas is not None and self.num_aristas > self.max_aristas:
+                self.podar(self.max_aristas)
+
+    def fusionar(self):
+        """Inserta las aristas pendientes en los arreglos principales (una sola pasada)"""
+        if not len(self.claves_pendientes):
+            return
+        posiciones = np.searchsorted(self.claves, self.claves_pendientes)
+        self.claves = np.insert(self.claves, posiciones, self.claves_pendientes)
+        self.crudos = np.insert(self.crudos, posiciones, self.crudos_pendientes)
+        self.iteraciones = np.insert(self.iteraciones, posiciones, self.iteraciones_pendientes)
+        self.vaciar_pendientes()
+
+    def podar(self, conservar):
+        """Deja solo las `conservar` aristas reforzadas más recientemente"""
+        self.fusionar()
+        recientes = np.sort(np.argpartition(-self.iteraciones, conservar - 1)[:conservar])
+        self.claves = self.claves[recientes]
+        self.crudos = self.crudos[recientes]
+        self.iteraciones = self.iteraciones[recientes]
+
+    def combinar(self, otro, peso):
+        """Almacén nuevo con (1 - peso) * self + peso * otro (en valores reales, escala 1)"""
+        self.fusionar()
+        otro.fusionar()
+        base = (1 - peso) * self.base * self.escala + peso * otro.base * otro.escala
+        combinado = FeromonasDispersas(self.n, base, self.max_aristas)
+        combinado.claves = np.union1d(self.claves, otro.claves)
+        origenes, destinos = np.divmod(combinado.claves, self.n)
+        combinado.crudos = (1 - peso) * self.valores(origenes, destinos) + peso * otro.valores(origenes, destinos)
+        combinado.iteraciones = np.zeros(len(combinado.claves), dtype=np.int64)
+        return combinado
+
+    def densa(self):
+        """Copia (n, n) con los valores reales; solo para catálogos chicos"""
+        return self.filas(np.arange(self.n))
+
+    def entropia(self):
+        """Entropía normalizada media por fila (como entropia_feromonas) sin construir la matriz
+
+        Cuesta O(aristas + n). La escala global no cambia las proporciones de
+        cada fila, así que se trabaja con los valores crudos.
+        """
+        self.fusionar()
+        origenes = self.claves // self.n
+        fuera_diagonal = origenes != self.claves % self.n
+        guardadas = np.bincount(origenes[fuera_diagonal], minlength=self.n)
+        por_defecto = (self.n - 1) - guardadas if self.base > 0 else np.zeros(self.n, dtype=np.int64)
+        validas = fuera_diagonal & (self.crudos > 0)
+        origenes, crudos = origenes[validas], self.crudos[validas]
+        totales = np.bincount(origenes, weights=crudos, minlength=self.n) + por_defecto * self.base
+        opciones = np.bincount(origenes, minlength=self.n) + por_defecto
+        filas = opciones > 1
+        if not filas.any():
+            return 0.0
+
+        p = crudos / totales[origenes]
+        terminos = np.bincount(origenes, weights=p * np.log(p), minlength=self.n)
+        p_base = np.divide(self.base, totales, out=np.zeros(self.n), where=totales > 0)
+        terminos += por_defecto * p_base * np.log(p_base, out=np.zeros(self.n), where=p_base > 0)
+        return float((-terminos[filas] / np.log(opciones[filas])).mean())
+
+    def arreglos(self):
+        self.fusionar()
+        return {'claves': self.claves, 'crudos': self.crudos, 'iteraciones': self.iteraciones}, {
+            'base': self.base, 'escala': self.escala, 'iteracion': self.iteracion, 'max_aristas': self.max_aristas}
+
+    def restaurar(self, arreglos, meta):
+        self.claves = np.array(arreglos['claves'])
+        self.crudos = np.array(arreglos['crudos'])
+        self.iteraciones = np.array(arreglos['iteraciones'])
+        self.vaciar_pendientes()
+        self.base, self.escala, self.iteracion = meta['base'], meta['escala'], meta['iteracion']
+        self.max_aristas = meta['max_aristas']
+        self.ediciones += 1
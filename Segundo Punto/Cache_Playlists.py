@@ -0,0 +1,91 @@
+"""Caché de playlists terminadas con expulsión LRU, vencimiento y control de deriva.
+
+La clave es (preferencias cuantizadas, canción inicial, longitud), así que dos
+pedidos con preferencias prácticamente iguales comparten resultado. Cada
+entrada guarda la playlist, su calidad y una marca del almacén de feromonas con
+el que se calculó; deja de servirse cuando:
+
+- pasaron más de `ttl` segundos desde que se guardó,
+- el almacén cambió (otro perfil, se reinició o se restauró un checkpoint), o
+- las feromonas derivaron más de `umbral_deriva` desde la marca
+  (AlmacenFeromonas.deriva: fracción de la masa depositada después).
+
+El servicio la consulta desde el bucle de eventos y la llena desde el hilo de
+la colonia, por eso cada operación toma un cerrojo.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+
+from Spotify import cuantizar_preferencias, clave_perfil, PASO_CUANTIZACION
+
+Entrada = namedtuple('Entrada', ['resultado', 'vence', 'almacen', 'marca'])
+
+
+class CachePlaylists:
+    def __init__(self, capacidad=10_000, ttl=60.0, umbral_deriva=0.2, paso=PASO_CUANTIZACION):
+        self.capacidad = capacidad
+        self.ttl = ttl  # None: no vencen por tiempo
+        self.umbral_deriva = umbral_deriva  # None: no se invalidan por deriva
+        self.paso = paso
+        self.valores = OrderedDict()
+        self.cerrojo = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidadas = 0
+
+    def clave(self, preferencias, inicio, longitud):
+        return (clave_perfil(cuantizar_preferencias(preferencias, self.paso)), inicio, longitud)
+
+    def obtener(self, clave, almacen):
+        """Resultado guardado para `clave` si sigue vigente con las feromonas de `almacen`, o None"""
+        with self.cerrojo:
+            entrada = self.valores.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            if not self.vigente(entrada, almacen):
+                del self.valores[clave]
+                self.invalidadas += 1
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+            self.valores.move_to_end(clave)
+            return entrada.resultado
+
+    def vigente(self, entrada, almacen):
+        if self.ttl is not None and time.monotonic() > entrada.vence:
+            return False
+        actual = entrada.almacen()
+        if actual is None or actual is not almacen:
+            return False
+        return self.umbral_deriva is None or almacen.deriva(entrada.marca) <= self.umbral_deriva
+
+    def guardar(self, clave, resultado, almacen, marca=None):
+        """Guarda `resultado` calculado con `almacen` en el estado `marca` (por defecto el actual)"""
+        vence = time.monotonic() + self.ttl if self.ttl is not None else None
+        entrada = Entrada(resultado, vence, weakref.ref(almacen), marca if marca is not None else almacen.marca())
+        with self.cerrojo:
+            self.valores[clave] = entrada
+            self.valores.move_to_end(clave)
+            if len(self.valores) > self.capacidad:
+                self.valores.popitem(last=False)  # El usado hace más tiempo
+
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def limpiar(self):
+        with self.cerrojo:
+            self.valores.clear()
+            self.aciertos = 0
+            self.fallos = 0
+            self.invalidadas = 0
+
+    def __len__(self):
+        return len(self.valores)
+
+    def __str__(self):
+        return f"Aciertos: {self.aciertos}, Fallos: {self.fallos}, Tasa: {self.tasa_aciertos():.1%}, " \
+               f"Invalidadas: {self.invalidadas}, Entradas: {len(self)}/{self.capacidad}"
@@ -0,0 +1,216 @@
+"""Catálogos de canciones en disco, con las características en memoria mapeada.
+
+`cargar_catalogo('canciones.csv')` lee el CSV una sola vez (columna `nombre`
+más una columna numérica por característica: rock, pop, jazz, energia,
+bailabilidad y las que se quieran agregar) y lo convierte en un almacén
+binario junto al CSV (`canciones.csv.catalogo/`):
+
+- `caracteristicas.npy`: matriz (n, m) de float64.
+- `nombres.npy` y `desplazamientos.npy`: los nombres en UTF-8 concatenados y
+  dónde empieza cada uno (tabla id -> nombre).
+
+Las siguientes ejecuciones solo abren esos archivos como memoria mapeada, así
+que el arranque no depende del tamaño del catálogo y varios procesos comparten
+las mismas páginas. Si el CSV cambia (tamaño o fecha), el almacén se regenera
+en un directorio temporal que después reemplaza al anterior (como los
+checkpoints); para decidirlo solo se lee `meta.json`, así que este proceso no
+tiene mapeado el almacén viejo mientras se reemplaza. Quien ya lo tuviera
+abierto sigue viendo los datos anteriores hasta que vuelva a cargarlo.
+Los nombres se decodifican a medida que se piden y el índice nombre -> id solo
+se construye si se usa la API por nombre.
+"""
+import csv
+import hashlib
+import os
+import sys
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from Comun.Checkpoint import guardar_arreglos, cargar_arreglos, leer_meta, comprobar_tipo, existe_checkpoint
+
+COLUMNA_NOMBRE = 'nombre'
+COLUMNA_PERFIL = 'perfil'
+FILAS_POR_BLOQUE = 100_000  # Filas del CSV convertidas a la vez
+
+
+def huella_catalogo(nombres, desplazamientos, caracteristicas):
+    """Resumen SHA-1 del contenido, para reconocer el catálogo en los checkpoints"""
+    resumen = hashlib.sha1()
+    for arreglo in (nombres, desplazamientos, caracteristicas):
+        resumen.update(np.ascontiguousarray(arreglo).data)
+    return resumen.hexdigest()
+
+
+def codificar_nombres(nombres):
+    """(bytes UTF-8 concatenados como uint8, desplazamientos int64 de n + 1 posiciones)"""
+    codificados = [nombre.encode('utf-8') for nombre in nombres]
+    desplazamientos = np.zeros(len(codificados) + 1, dtype=np.int64)
+    np.cumsum([len(c) for c in codificados], out=desplazamientos[1:])
+    return np.frombuffer(b''.join(codificados), dtype=np.uint8), desplazamientos
+
+
+class NombresCanciones(Sequence):
+    """Tabla id -> nombre sobre los bytes del almacén (decodifica solo lo que se lee)"""
+    __slots__ = ('datos', 'desplazamientos')
+
+    def __init__(self, datos, desplazamientos):
+        self.datos = datos
+        self.desplazamientos = desplazamientos
+
+    def __len__(self):
+        return len(self.desplazamientos) - 1
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        indice = int(indice)
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+        inicio, fin = self.desplazamientos[indice], self.desplazamientos[indice + 1]
+        return self.datos[inicio:fin].tobytes().decode('utf-8')
+
+
+class VistaCanciones(Mapping):
+    """El catálogo como `{nombre: {caracteristica: valor}}`, sin crear los diccionarios por adelantado"""
+    __slots__ = ('catalogo',)
+
+    def __init__(self, catalogo):
+        self.catalogo = catalogo
+
+    def __getitem__(self, nombre):
+        fila = self.catalogo.caracteristicas[self.catalogo.indice[nombre]]
+        return dict(zip(self.catalogo.nombres_caracteristicas, fila.tolist()))
+
+    def __iter__(self):
+        return iter(self.catalogo.nombres)
+
+    def __len__(self):
+        return len(self.catalogo.nombres)
+
+
+class Catalogo:
+    """Matriz (n, m) de características, nombres por id y, si viene de disco, el directorio del almacén"""
+    def __init__(self, caracteristicas, nombres, nombres_caracteristicas, huella, ruta=None):
+        self.caracteristicas = caracteristicas
+        self.nombres = nombres
+        self.nombres_caracteristicas = list(nombres_caracteristicas)
+        self.huella = huella
+        self.ruta = ruta
+        self.indice_nombres = None
+
+    @classmethod
+    def desde_dict(cls, canciones):
+        """Catálogo a partir del formato clásico `{nombre: {caracteristica: valor}}`"""
+        nombres = list(canciones)
+        nombres_caracteristicas = list(canciones[nombres[0]]) if nombres else []
+        caracteristicas = np.array([[valores[c] for c in nombres_caracteristicas] for valores in canciones.values()],
+                                   dtype=np.float64).reshape(len(nombres), len(nombres_caracteristicas))
+        datos, desplazamientos = codificar_nombres(nombres)
+        return cls(caracteristicas, nombres, nombres_caracteristicas,
+                   huella_catalogo(datos, desplazamientos, caracteristicas))
+
+    def __len__(self):
+        return len(self.nombres)
+
+    @property
+    def indice(self):
+        """nombre -> id (se construye la primera vez que se usa)"""
+        if self.indice_nombres is None:
+            self.indice_nombres = {nombre: i for i, nombre in enumerate(self.nombres)}
+        return self.indice_nombres
+
+    @property
+    def canciones(self):
+        return VistaCanciones(self)
+
+    def vecinos(self, k, calcular):
+        """(indices, distancias) de los k vecinos, guardados en el almacén para no recalcularlos
+
+        `calcular(caracteristicas, k)` se llama solo si todavía no están en disco.
+        """
+        if self.ruta is None:
+            return calcular(self.caracteristicas, k)
+        rutas = [os.path.join(self.ruta, f'vecinos_{k}_{nombre}.npy') for nombre in ('indices', 'distancias')]
+        if all(os.path.exists(ruta) for ruta in rutas):
+            return tuple(np.load(ruta, mmap_mode='r') for ruta in rutas)
+        resultado = calcular(self.caracteristicas, k)
+        for ruta, arreglo in zip(rutas, resultado):
+            temporal = ruta + '.tmp.npy'
+            np.save(temporal, arreglo)
+            os.replace(temporal, ruta)
+        return resultado
+
+
+def ruta_almacen(ruta_csv):
+    return ruta_csv + '.catalogo'
+
+
+def firma_archivo(ruta):
+    estado = os.stat(ruta)
+    return {'tamano': estado.st_size, 'modificado': estado.st_mtime_ns}
+
+
+def convertir_csv(ruta_csv, destino):
+    """Lee el CSV por bloques y escribe el almacén binario en `destino`"""
+    with open(ruta_csv, newline='', encoding='utf-8') as archivo:
+        lector = csv.reader(archivo)
+        encabezado = [columna.strip() for columna in next(lector)]
+        if COLUMNA_NOMBRE not in encabezado:
+            raise ValueError(f"{ruta_csv}: falta la columna '{COLUMNA_NOMBRE}'")
+        columna_nombre = encabezado.index(COLUMNA_NOMBRE)
+        columnas = [i for i in range(len(encabezado)) if i != columna_nombre]
+
+        bloques, nombres, filas = [], [], []
+        for numero, fila in enumerate(lector, start=2):
+            if not fila:
+                continue
+            try:
+                filas.append([float(fila[i]) for i in columnas])
+            except (ValueError, IndexError):
+                raise ValueError(f"{ruta_csv}, línea {numero}: se esperaban {len(columnas)} valores numéricos")
+            nombres.append(fila[columna_nombre])
+            if len(filas) == FILAS_POR_BLOQUE:
+                bloques.append(np.array(filas, dtype=np.float64))
+                filas = []
+        bloques.append(np.array(filas, dtype=np.float64).reshape(len(filas), len(columnas)))
+
+    caracteristicas = np.concatenate(bloques)
+    datos, desplazamientos = codificar_nombres(nombres)
+    guardar_arreglos(destino, {'caracteristicas': caracteristicas, 'nombres': datos,
+                               'desplazamientos': desplazamientos}, {
+        'tipo': 'Catalogo',
+        'origen': os.path.abspath(ruta_csv),
+        'firma_origen': firma_archivo(ruta_csv),
+        'caracteristicas': [encabezado[i] for i in columnas],
+        'huella': huella_catalogo(datos, desplazamientos, caracteristicas),
+    })
+
+
+def cargar_catalogo(ruta_csv, destino=None):
+    """Catálogo del CSV en memoria mapeada; convierte el CSV solo si el almacén falta o está desactualizado"""
+    destino = destino or ruta_almacen(ruta_csv)
+    vigente = False
+    if existe_checkpoint(destino):
+        meta = leer_meta(destino)
+        comprobar_tipo(meta, 'Catalogo')
+        vigente = meta['firma_origen'] == firma_archivo(ruta_csv)
+    if not vigente:
+        convertir_csv(ruta_csv, destino)  # Escribe en destino.tmp y lo cambia por el anterior
+    arreglos, meta = cargar_arreglos(destino, mmap=True)
+    return Catalogo(arreglos['caracteristicas'], NombresCanciones(arreglos['nombres'], arreglos['desplazamientos']),
+                    meta['caracteristicas'], meta['huella'], destino)
+
+
+def cargar_perfiles(ruta_csv):
+    """Tipos de usuario de un CSV con columna `perfil` y una columna por característica"""
+    with open(ruta_csv, newline='', encoding='utf-8') as archivo:
+        lector = csv.DictReader(archivo)
+        if lector.fieldnames is None or COLUMNA_PERFIL not in lector.fieldnames:
+            raise ValueError(f"{ruta_csv}: falta la columna '{COLUMNA_PERFIL}'")
+        return {fila[COLUMNA_PERFIL]: {columna.strip(): float(valor) for columna, valor in fila.items()
+                                       if columna != COLUMNA_PERFIL and valor not in (None, '')}
+                for fila in lector}
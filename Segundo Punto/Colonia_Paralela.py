@@ -0,0 +1,230 @@
+"""Colonia de playlists repartida entre varios procesos, sin copiar las matrices.
+
+Las matrices grandes (características, similitud o listas de vecinos, afinidad
+del perfil actual y feromonas) viven en bloques de
+`multiprocessing.shared_memory`: el coordinador los crea una vez al iniciar y
+cada trabajador los abre como arreglos NumPy sobre la misma memoria. En cada
+iteración solo viajan por la tubería la orden (hormigas y longitud) y, de
+vuelta, las playlists como int32 y sus calidades. El coordinador elige la mejor,
+evapora y deposita sobre la matriz compartida igual que
+SistemaRecomendacion.ejecutar_iteracion, mientras los trabajadores esperan la
+siguiente orden, así que nunca se escribe y se lee a la vez.
+
+    with ColoniaParalela(sistema, num_trabajadores=8, semilla=42) as colonia:
+        playlist, calidad = colonia.ejecutar_iteracion(preferencias, num_hormigas=500)
+
+Requiere feromonas densas. Mientras la colonia está abierta la matriz de
+feromonas del sistema es la compartida; al cerrarla vuelve a ser una copia
+propia. Con la misma semilla y el mismo número de trabajadores los resultados
+se repiten, pero no coinciden con los de SistemaRecomendacion.ejecutar_iteracion.
+"""
+import multiprocessing as mp
+import os
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from Comun.Perfilado import perfilador
+from Spotify import SistemaRecomendacion, NUM_HORMIGAS
+from Almacen_Feromonas import FeromonasDensas
+
+
+class MatricesCompartidas:
+    """Arreglos NumPy por nombre, cada uno en su bloque de memoria compartida"""
+    def __init__(self, bloques, arreglos):
+        self.bloques = bloques  # nombre -> SharedMemory
+        self.arreglos = arreglos  # nombre -> np.ndarray sobre el bloque
+
+    @classmethod
+    def crear(cls, arreglos):
+        """Copia cada arreglo a un bloque nuevo"""
+        bloques, vistas = {}, {}
+        for nombre, arreglo in arreglos.items():
+            arreglo = np.ascontiguousarray(arreglo)
+            bloques[nombre] = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+            vistas[nombre] = np.ndarray(arreglo.shape, arreglo.dtype, buffer=bloques[nombre].buf)
+            vistas[nombre][...] = arreglo
+        return cls(bloques, vistas)
+
+    @classmethod
+    def abrir(cls, descripcion):
+        """Abre los bloques descritos por `descripcion()` de otro proceso"""
+        bloques, vistas = {}, {}
+        for nombre, (bloque, forma, tipo) in descripcion.items():
+            bloques[nombre] = shared_memory.SharedMemory(name=bloque)
+            vistas[nombre] = np.ndarray(forma, np.dtype(tipo), buffer=bloques[nombre].buf)
+        return cls(bloques, vistas)
+
+    def descripcion(self):
+        """{nombre: (bloque, forma, dtype)}: lo único que hay que enviar a otro proceso"""
+        return {nombre: (self.bloques[nombre].name, arreglo.shape, arreglo.dtype.str)
+                for nombre, arreglo in self.arreglos.items()}
+
+    def cerrar(self, liberar=False):
+        """Suelta las vistas y cierra los bloques; `liberar` además los borra (solo el coordinador)"""
+        self.arreglos = {}
+        for bloque in self.bloques.values():
+            bloque.close()
+            if liberar:
+                bloque.unlink()
+        self.bloques = {}
+
+
+class SistemaTrabajador(SistemaRecomendacion):
+    """Sistema de solo construcción sobre las matrices compartidas
+
+    No llama a SistemaRecomendacion.__init__: no calcula nada ni conoce los
+    nombres de las canciones, solo lo que usan construir_playlists y
+    evaluar_playlists. La afinidad es la del perfil que dejó el coordinador.
+    """
+    def __init__(self, arreglos, semilla):
+        self.caracteristicas = arreglos['caracteristicas']
+        self.nombres = range(len(self.caracteristicas))
+        self.similitud = arreglos.get('similitud')
+        self.vecinos = arreglos.get('vecinos')
+        self.similitud_vecinos = arreglos.get('similitud_vecinos')
+        self.afinidad = arreglos['afinidad']
+        self.almacen = FeromonasDensas(0, 0.0)
+        self.almacen.restaurar({'feromonas': arreglos['feromonas']}, {})
+        self.rng = np.random.default_rng(semilla)
+
+    def afinidades(self, preferencias_usuario):
+        return self.afinidad
+
+    def construir_y_evaluar(self, num_hormigas, longitud_playlist):
+        playlists = self.construir_playlists(None, num_hormigas, longitud_playlist)
+        return playlists.astype(np.int32), self.evaluar_playlists(playlists, None)
+
+
+def _trabajador_colonia(conexion, descripcion, semilla):
+    """Bucle del proceso de un trabajador: atiende órdenes hasta recibir 'terminar'"""
+    matrices = MatricesCompartidas.abrir(descripcion)
+    sistema = SistemaTrabajador(matrices.arreglos, semilla)
+    while True:
+        orden, datos = conexion.recv()
+        if orden == 'construir':
+            conexion.send(sistema.construir_y_evaluar(*datos))
+        elif orden == 'terminar':
+            break
+    del sistema
+    matrices.cerrar()
+    conexion.close()
+
+
+class TrabajadorLocal:
+    """Trabajador en el mismo proceso (útil para depurar o con un solo núcleo)"""
+    def __init__(self, matrices, semilla):
+        self.sistema = SistemaTrabajador(matrices.arreglos, semilla)
+        self.resultado = None
+
+    def enviar_construir(self, num_hormigas, longitud_playlist):
+        self.resultado = self.sistema.construir_y_evaluar(num_hormigas, longitud_playlist)
+
+    def recibir(self):
+        return self.resultado
+
+    def cerrar(self):
+        self.sistema = None
+
+
+class TrabajadorProceso:
+    """Trabajador que vive en un proceso hijo y se comunica por una tubería"""
+    def __init__(self, matrices, semilla, contexto):
+        self.conexion, extremo_hijo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_trabajador_colonia,
+                                        args=(extremo_hijo, matrices.descripcion(), semilla), daemon=True)
+        self.proceso.start()
+        extremo_hijo.close()
+
+    def enviar_construir(self, num_hormigas, longitud_playlist):
+        self.conexion.send(('construir', (num_hormigas, longitud_playlist)))
+
+    def recibir(self):
+        return self.conexion.recv()
+
+    def cerrar(self):
+        if self.proceso.is_alive():
+            self.conexion.send(('terminar', None))
+            self.proceso.join()
+        self.conexion.close()
+
+
+class ColoniaParalela:
+    def __init__(self, sistema, num_trabajadores=None, semilla=None, procesos=True):
+        if sistema.feromonas_dispersas:
+            raise ValueError("La colonia paralela necesita feromonas densas (feromonas_dispersas=False)")
+        self.sistema = sistema
+        self.num_trabajadores = num_trabajadores or os.cpu_count() or 1
+        self.procesos = procesos
+        self.semillas = np.random.SeedSequence(semilla).spawn(self.num_trabajadores)
+        self.matrices = None
+        self.trabajadores = []
+        self.afinidad_actual = None
+
+    def iniciar(self):
+        sistema = self.sistema
+        arreglos = {'caracteristicas': sistema.caracteristicas, 'feromonas': sistema.almacen.densa(),
+                    'afinidad': np.zeros(len(sistema.nombres))}
+        if sistema.similitud is not None:
+            arreglos['similitud'] = sistema.similitud
+        else:
+            arreglos['vecinos'] = sistema.vecinos
+            arreglos['similitud_vecinos'] = sistema.similitud_vecinos
+        self.matrices = MatricesCompartidas.crear(arreglos)
+        self.afinidad_actual = None
+
+        # El coordinador evapora y deposita directamente sobre la matriz compartida
+        sistema.almacen.restaurar({'feromonas': self.matrices.arreglos['feromonas']}, {})
+
+        if self.procesos:
+            contexto = mp.get_context()
+            self.trabajadores = [TrabajadorProceso(self.matrices, s, contexto) for s in self.semillas]
+        else:
+            self.trabajadores = [TrabajadorLocal(self.matrices, s) for s in self.semillas]
+
+    def cerrar(self):
+        for trabajador in self.trabajadores:
+            trabajador.cerrar()
+        self.trabajadores = []
+        if self.matrices is not None:
+            self.sistema.almacen.restaurar({'feromonas': np.array(self.matrices.arreglos['feromonas'])}, {})
+            self.matrices.cerrar(liberar=True)
+            self.matrices = None
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def repartir(self, num_hormigas):
+        """Hormigas de cada trabajador (difieren a lo sumo en una)"""
+        cantidades = np.full(self.num_trabajadores, num_hormigas // self.num_trabajadores)
+        cantidades[:num_hormigas % self.num_trabajadores] += 1
+        return cantidades.tolist()
+
+    def ejecutar_iteracion(self, preferencias, num_hormigas=NUM_HORMIGAS, longitud_playlist=8):
+        """Ejecuta una iteración repartiendo las hormigas entre los trabajadores"""
+        with perfilador.fase('aco.construccion'):
+            # La afinidad del perfil se copia al bloque compartido solo cuando cambia
+            afinidad = self.sistema.afinidades(preferencias)
+            if afinidad is not self.afinidad_actual:
+                self.matrices.arreglos['afinidad'][:] = afinidad
+                self.afinidad_actual = afinidad
+
+            # Primero se reparten las órdenes para que los trabajadores construyan a la vez
+            activos = [(trabajador, cantidad) for trabajador, cantidad
+                       in zip(self.trabajadores, self.repartir(num_hormigas)) if cantidad > 0]
+            for trabajador, cantidad in activos:
+                trabajador.enviar_construir(cantidad, longitud_playlist)
+            resultados = [trabajador.recibir() for trabajador, _ in activos]
+
+        if resultados:
+            playlists = np.concatenate([r[0] for r in resultados])
+            calidades = np.concatenate([r[1] for r in resultados])
+        else:
+            playlists, calidades = np.empty((0, 0), dtype=np.int32), np.empty(0)
+        return self.sistema.registrar_iteracion(playlists, calidades)
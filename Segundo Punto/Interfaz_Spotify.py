@@ -0,0 +1,281 @@
+import os
+import tkinter as tk
+from tkinter import ttk
+
+from Spotify import SistemaRecomendacion
+from Memoria_Feromonas import MemoriaFeromonas
+from Comun.Perfilado import perfilar
+
+DIRECTORIO_MEMORIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feromonas_perfiles')
+CADA_SINCRONIZACION = 10  # Iteraciones entre guardados de las feromonas del perfil
+
+class VisualizadorSpotify:
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("Sistema de Recomendación Spotify - Algoritmo de Hormigas")
+        self.root.geometry("1200x800")
+        
+        self.sistema = SistemaRecomendacion()
+        self.iteracion_actual = 0
+        self.memoria = MemoriaFeromonas(DIRECTORIO_MEMORIA)
+        self.perfil_actual = None
+        self.iteraciones_sin_guardar = 0
+        
+        self.setup_ui()
+        self.cambiar_perfil(self.tipo_usuario_var.get())
+        self.actualizar_grafo()
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        
+    def setup_ui(self):
+        # matplotlib solo se carga al construir la interfaz
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        # Frame principal
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Configurar grid
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+        
+        # Panel de control
+        control_frame = ttk.LabelFrame(main_frame, text="Configuración", padding="5")
+        control_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        # Selección de tipo de usuario
+        ttk.Label(control_frame, text="Tipo de Usuario:").grid(row=0, column=0, padx=5)
+        self.tipo_usuario_var = tk.StringVar(value='Rockero')
+        tipo_combo = ttk.Combobox(control_frame, textvariable=self.tipo_usuario_var, 
+                                 values=list(self.sistema.tipos_usuario.keys()))
+        tipo_combo.grid(row=0, column=1, padx=5)
+        
+        ttk.Button(control_frame, text="Ejecutar 1 Iteración", 
+                  command=self.ejecutar_iteracion).grid(row=0, column=2, padx=5)
+        ttk.Button(control_frame, text="Ejecutar 10 Iteraciones", 
+                  command=self.ejecutar_10_iteraciones).grid(row=0, column=3, padx=5)
+        ttk.Button(control_frame, text="Reiniciar", 
+                  command=self.reiniciar).grid(row=0, column=4, padx=5)
+        
+        # Información de la iteración
+        info_frame = ttk.LabelFrame(main_frame, text="Información", padding="5")
+        info_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
+        
+        self.lbl_iteracion = ttk.Label(info_frame, text="Iteración: 0")
+        self.lbl_iteracion.grid(row=0, column=0, sticky=tk.W, pady=2)
+        
+        self.lbl_mejor_calidad = ttk.Label(info_frame, text="Mejor Calidad: 0.00")
+        self.lbl_mejor_calidad.grid(row=1, column=0, sticky=tk.W, pady=2)
+        
+        self.lbl_playlist_actual = ttk.Label(info_frame, text="Playlist Actual: -")
+        self.lbl_playlist_actual.grid(row=2, column=0, sticky=tk.W, pady=2)
+        
+        # Mejor playlist global
+        mejor_frame = ttk.LabelFrame(info_frame, text="Mejor Playlist Global", padding="5")
+        mejor_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.lbl_mejor_playlist = ttk.Label(mejor_frame, text="Playlist: -", wraplength=300, justify=tk.LEFT)
+        self.lbl_mejor_playlist.grid(row=0, column=0, sticky=tk.W, pady=2)
+        
+        # Lista de canciones disponibles
+        canciones_frame = ttk.LabelFrame(main_frame, text="Canciones Disponibles", padding="5")
+        canciones_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10), pady=(10, 0))
+        
+        # Treeview para canciones
+        columns = ('Canción', 'Rock', 'Pop', 'Jazz', 'Energía', 'Bailabilidad')
+        self.tree_canciones = ttk.Treeview(canciones_frame, columns=columns, show='headings', height=8)
+        
+        for col in columns:
+            self.tree_canciones.heading(col, text=col)
+            self.tree_canciones.column(col, width=80)
+        
+        self.tree_canciones.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Scrollbar
+        scrollbar = ttk.Scrollbar(canciones_frame, orient=tk.VERTICAL, command=self.tree_canciones.yview)
+        self.tree_canciones.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
+        # Gráfico de evolución
+        grafico_frame = ttk.LabelFrame(main_frame, text="Evolución de la Calidad", padding="5")
+        grafico_frame.grid(row=1, column=1, rowspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.fig, self.ax = plt.subplots(figsize=(8, 6))
+        self.canvas = FigureCanvasTkAgg(self.fig, master=grafico_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Grafo de recomendaciones
+        grafo_frame = ttk.LabelFrame(main_frame, text="Grafo de Recomendaciones", padding="5")
+        grafo_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
+        
+        self.fig_grafo, self.ax_grafo = plt.subplots(figsize=(10, 4))
+        self.canvas_grafo = FigureCanvasTkAgg(self.fig_grafo, master=grafo_frame)
+        self.canvas_grafo.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Configurar pesos de grid
+        main_frame.rowconfigure(1, weight=1)
+        main_frame.rowconfigure(2, weight=1)
+        main_frame.rowconfigure(3, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        canciones_frame.rowconfigure(0, weight=1)
+        canciones_frame.columnconfigure(0, weight=1)
+        
+        self.actualizar_ui_inicial()
+        
+    def actualizar_ui_inicial(self):
+        """Actualiza la UI con los datos iniciales"""
+        # Actualizar lista de canciones
+        for item in self.tree_canciones.get_children():
+            self.tree_canciones.delete(item)
+            
+        for cancion, caracteristicas in self.sistema.canciones.items():
+            self.tree_canciones.insert('', tk.END, values=(
+                cancion,
+                f"{caracteristicas['rock']:.2f}",
+                f"{caracteristicas['pop']:.2f}",
+                f"{caracteristicas['jazz']:.2f}",
+                f"{caracteristicas['energia']:.2f}",
+                f"{caracteristicas['bailabilidad']:.2f}"
+            ))
+        
+        self.actualizar_grafo()
+        
+    def cambiar_perfil(self, perfil):
+        """Guarda lo aprendido con el perfil anterior y arranca desde lo guardado del nuevo"""
+        if perfil == self.perfil_actual:
+            return
+        self.guardar_memoria()
+        preferencias = self.sistema.tipos_usuario[perfil]
+        if not self.memoria.calentar(self.sistema, preferencias):
+            self.sistema.almacen = self.sistema.inicializar_feromonas()
+        self.perfil_actual = perfil
+        
+    def guardar_memoria(self):
+        """Mezcla en disco las feromonas del perfil actual si hubo iteraciones desde el último guardado"""
+        if self.perfil_actual is None or not self.iteraciones_sin_guardar:
+            return
+        self.memoria.guardar_sistema(self.sistema, self.sistema.tipos_usuario[self.perfil_actual])
+        self.iteraciones_sin_guardar = 0
+        
+    def ejecutar_iteracion(self):
+        """Ejecuta una iteración del algoritmo de colonia de hormigas"""
+        self.cambiar_perfil(self.tipo_usuario_var.get())
+        preferencias = self.sistema.tipos_usuario[self.perfil_actual]
+        mejor_playlist, mejor_calidad = self.sistema.ejecutar_iteracion(preferencias)
+        
+        # Actualizar estadísticas globales
+        self.iteracion_actual += 1
+        self.iteraciones_sin_guardar += 1
+        if self.iteraciones_sin_guardar >= CADA_SINCRONIZACION:
+            self.guardar_memoria()
+        
+        self.actualizar_ui(mejor_playlist, mejor_calidad)
+        
+    def ejecutar_10_iteraciones(self):
+        """Ejecuta 10 iteraciones del algoritmo"""
+        for _ in range(10):
+            self.ejecutar_iteracion()
+            
+    def reiniciar(self):
+        """Reinicia la simulación (las feromonas arrancan desde lo guardado del perfil)"""
+        self.guardar_memoria()
+        self.sistema = SistemaRecomendacion()
+        self.iteracion_actual = 0
+        self.perfil_actual = None
+        self.cambiar_perfil(self.tipo_usuario_var.get())
+        self.actualizar_ui_inicial()
+        
+    def cerrar(self):
+        self.guardar_memoria()
+        self.root.destroy()
+        
+    @perfilar('ui.redibujado')
+    def actualizar_ui(self, playlist_actual, calidad_actual):
+        """Actualiza la interfaz de usuario"""
+        self.lbl_iteracion.config(text=f"Iteración: {self.iteracion_actual}")
+        self.lbl_mejor_calidad.config(text=f"Mejor Calidad: {self.sistema.mejor_calidad_global:.4f}")
+        
+        # Mostrar playlist actual
+        if playlist_actual:
+            playlist_str = " → ".join(playlist_actual)
+            self.lbl_playlist_actual.config(text=f"Playlist Actual: {playlist_str}")
+        
+        # Mostrar mejor playlist global
+        if self.sistema.mejor_playlist_global:
+            mejor_playlist_str = " → ".join(self.sistema.mejor_playlist_global)
+            self.lbl_mejor_playlist.config(text=f"Playlist: {mejor_playlist_str}\nCalidad: {self.sistema.mejor_calidad_global:.4f}")
+        
+        # Actualizar gráficos
+        self.actualizar_grafico_evolucion()
+        self.actualizar_grafo()
+        
+    def actualizar_grafico_evolucion(self):
+        """Actualiza el gráfico de evolución de la calidad"""
+        self.ax.clear()
+        
+        if self.sistema.historial_calidad:
+            iteraciones = list(range(1, len(self.sistema.historial_calidad) + 1))
+            self.ax.plot(iteraciones, self.sistema.historial_calidad, 'b-', linewidth=2)
+            self.ax.set_xlabel('Iteración')
+            self.ax.set_ylabel('Calidad de Playlist')
+            self.ax.set_title('Evolución de la Calidad de Recomendación')
+            self.ax.grid(True, linestyle='--', alpha=0.7)
+            
+        self.canvas.draw()
+        
+    def actualizar_grafo(self):
+        """Actualiza el grafo de recomendaciones"""
+        import networkx as nx
+        
+        self.ax_grafo.clear()
+        
+        # Crear grafo
+        G = nx.DiGraph()
+        
+        # Añadir nodos (canciones)
+        for cancion in self.sistema.canciones:
+            G.add_node(cancion)
+        
+        # Añadir aristas con pesos basados en feromonas
+        edge_weights = []
+        tau = self.sistema.tau
+        nombres = self.sistema.nombres
+        for i, j in zip(*(tau > 0.1).nonzero()):  # Solo mostrar conexiones significativas
+            G.add_edge(nombres[i], nombres[j], weight=float(tau[i, j]))
+            edge_weights.append(float(tau[i, j]))
+        
+        if G.number_of_edges() > 0:
+            # Dibujar grafo
+            pos = nx.spring_layout(G, k=1, iterations=50)
+            
+            # Normalizar pesos para el grosor de las aristas
+            if edge_weights:
+                max_weight = max(edge_weights)
+                edge_widths = [5 * (w / max_weight) for w in edge_weights]
+            else:
+                edge_widths = [1] * G.number_of_edges()
+            
+            nx.draw_networkx_nodes(G, pos, node_size=500, node_color='lightblue', 
+                                 alpha=0.7, ax=self.ax_grafo)
+            nx.draw_networkx_edges(G, pos, width=edge_widths, alpha=0.6, 
+                                 edge_color='gray', arrows=True, ax=self.ax_grafo)
+            nx.draw_networkx_labels(G, pos, font_size=8, ax=self.ax_grafo)
+            
+            # Dibujar etiquetas de pesos en las aristas
+            edge_labels = {(u, v): f"{d['weight']:.2f}" for u, v, d in G.edges(data=True)}
+            nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=6, ax=self.ax_grafo)
+        
+        self.ax_grafo.set_title("Grafo de Recomendaciones (Feromonas)")
+        self.ax_grafo.axis('off')
+        
+        self.canvas_grafo.draw()
+        
+    def run(self):
+        self.root.mainloop()
+
+# Ejecutar la aplicación
+if __name__ == "__main__":
+    app = VisualizadorSpotify()
+    app.run()
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""Feromonas aprendidas por perfil de usuario, guardadas en disco entre sesiones.
+
+Cada perfil (preferencias cuantizadas, ver Spotify.clave_perfil) tiene un
+directorio con sus feromonas en el formato de Comun.Checkpoint. Al cargarlo el
+almacén copia los arreglos en vez de quedarse con el mapa de los archivos:
+`sincronizar` reemplaza ese directorio, y un archivo mapeado no se puede
+reemplazar (en Windows el cambio de nombre falla). Una colonia nueva arranca
+desde ese estado en vez de la matriz uniforme de `inicializar_feromonas`, y
+cada tanto `sincronizar` mezcla lo aprendido con lo
+guardado, (1 - peso_mezcla) * guardado + peso_mezcla * actual, de modo que las
+sesiones del mismo perfil van sumando lo que aprende cada una. Si dos procesos
+sincronizan el mismo perfil a la vez, prevalece el último.
+
+Un estado guardado solo se usa con el mismo catálogo (huella) y el mismo tipo
+de almacén; si no coincide se ignora y la colonia arranca en frío.
+"""
+import hashlib
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from Comun.Checkpoint import guardar_arreglos, cargar_arreglos, existe_checkpoint
+from Spotify import cuantizar_preferencias, clave_perfil, FEROMONA_INICIAL
+from Almacen_Feromonas import FeromonasDensas, FeromonasDispersas
+
+PESO_MEZCLA = 0.5  # Peso de lo aprendido en la sesión al mezclarlo con lo guardado
+TIPO = 'FeromonasPerfil'
+
+
+class MemoriaFeromonas:
+    def __init__(self, directorio, peso_mezcla=PESO_MEZCLA):
+        self.directorio = directorio
+        self.peso_mezcla = peso_mezcla
+
+    def clave(self, preferencias):
+        return clave_perfil(cuantizar_preferencias(preferencias))
+
+    def ruta(self, clave):
+        resumen = hashlib.sha1(json.dumps(clave).encode('utf-8')).hexdigest()
+        return os.path.join(self.directorio, resumen[:16])
+
+    def cargar(self, clave, sistema):
+        """Almacén guardado del perfil `clave` para el catálogo y el tipo de almacén de `sistema`, o None"""
+        ruta = self.ruta(clave)
+        if not existe_checkpoint(ruta):
+            return None
+        arreglos, meta = cargar_arreglos(ruta, mmap=True)
+        if meta.get('tipo') != TIPO or meta['huella_catalogo'] != sistema.catalogo.huella \
+                or meta['feromonas_dispersas'] != sistema.feromonas_dispersas:
+            return None
+        if sistema.feromonas_dispersas:
+            almacen = FeromonasDispersas(len(sistema.nombres), FEROMONA_INICIAL, sistema.max_aristas)
+        else:
+            almacen = FeromonasDensas(0, 0.0)  # La matriz la pone restaurar
+        almacen.restaurar(arreglos, meta['almacen'])
+        return almacen
+
+    def sincronizar(self, clave, almacen, sistema):
+        """Mezcla `almacen` con lo guardado para el perfil (o lo guarda tal cual si no había nada)"""
+        guardado = self.cargar(clave, sistema)
+        mezcla = almacen if guardado is None else guardado.combinar(almacen, self.peso_mezcla)
+        arreglos, meta_almacen = mezcla.arreglos()
+        os.makedirs(self.directorio, exist_ok=True)
+        guardar_arreglos(self.ruta(clave), arreglos, {
+            'tipo': TIPO,
+            'clave': [list(par) for par in clave],
+            'huella_catalogo': sistema.catalogo.huella,
+            'feromonas_dispersas': sistema.feromonas_dispersas,
+            'almacen': meta_almacen,
+        })
+
+    def calentar(self, sistema, preferencias):
+        """Pone en `sistema` las feromonas guardadas del perfil; devuelve False si no había"""
+        almacen = self.cargar(self.clave(preferencias), sistema)
+        if almacen is None:
+            return False
+        sistema.almacen = almacen
+        return True
+
+    def guardar_sistema(self, sistema, preferencias):
+        """Sincroniza las feromonas actuales de `sistema` como las del perfil `preferencias`"""
+        self.sincronizar(self.clave(preferencias), sistema.almacen, sistema)
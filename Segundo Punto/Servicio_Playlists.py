@@ -0,0 +1,369 @@
+"""Servicio local de recomendación de playlists (asyncio, JSON por líneas sobre TCP).
+
+Cada pedido es una línea JSON y recibe otra con el mismo `id`:
+
+    {"id": 1, "perfil": "Rockero", "longitud": 8}
+    {"id": 2, "preferencias": {"rock": 0.3, "jazz": 0.9}, "longitud": 5, "inicio": "song3"}
+    -> {"id": 2, "playlist": ["song3", ...], "calidad": 0.41, "segundos": 0.0021}
+    {"orden": "metricas"}
+    -> {"pedidos": ..., "p50_ms": ..., "p99_ms": ..., "pedidos_por_segundo": ...}
+
+Los pedidos que llegan mientras se atiende un lote se acumulan (hasta
+`max_lote`, esperando como mucho `espera_maxima` segundos) y se resuelven
+juntos: los del mismo perfil y longitud comparten una sola construcción
+vectorizada de `hormigas_por_pedido` hormigas por pedido, y cada uno se queda
+con la mejor de las suyas. Las preferencias se cuantizan (`Spotify.PASO_CUANTIZACION`)
+y cada perfil cuantizado conserva sus propias feromonas entre pedidos, así que
+la colonia de un perfil frecuente ya está caliente. Con catálogos grandes
+conviene `feromonas_dispersas`: cada perfil caliente guarda solo sus aristas.
+
+Con `cache` (CachePlaylists) los pedidos repetidos (mismo perfil cuantizado,
+canción inicial y longitud) se responden sin pasar por la colonia mientras las
+feromonas del perfil no deriven más del umbral. Con `memoria`
+(MemoriaFeromonas) cada perfil arranca desde lo aprendido en sesiones
+anteriores, y lo aprendido se mezcla de vuelta en disco cada
+`segundos_sincronizacion`, al descartar un perfil caliente y al cerrar.
+
+    python "Segundo Punto/Servicio_Playlists.py" --puerto 8765 --vecinos 20 --feromonas-dispersas --cache 10000
+    python "Segundo Punto/Servicio_Playlists.py" --memoria feromonas_perfiles/
+    python Benchmarks/Carga_Servicio.py --puerto 8765 --clientes 64 --pedidos 100
+"""
+import argparse
+import asyncio
+import json
+import math
+import numbers
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from Spotify import SistemaRecomendacion, cuantizar_preferencias, clave_perfil
+from Cache_Playlists import CachePlaylists
+from Memoria_Feromonas import MemoriaFeromonas
+
+PUERTO = 8765
+HORMIGAS_POR_PEDIDO = 10
+MAX_LOTE = 256  # Pedidos por lote
+ESPERA_MAXIMA = 0.002  # Segundos que se espera a que se llene un lote
+MAX_PERFILES_CALIENTES = 32  # Perfiles con feromonas propias en memoria
+VENTANA_LATENCIAS = 10_000  # Latencias recientes usadas en p50/p99
+SEGUNDOS_SINCRONIZACION = 30.0  # Cada cuánto se mezclan en disco los perfiles que aprendieron algo
+
+Pedido = namedtuple('Pedido', ['clave', 'preferencias', 'longitud', 'inicio', 'futuro', 'llegada'])
+
+
+class ServicioPlaylists:
+    def __init__(self, sistema=None, hormigas_por_pedido=HORMIGAS_POR_PEDIDO, max_lote=MAX_LOTE,
+                 espera_maxima=ESPERA_MAXIMA, max_perfiles=MAX_PERFILES_CALIENTES, cache=None, memoria=None,
+                 segundos_sincronizacion=SEGUNDOS_SINCRONIZACION):
+        self.sistema = sistema if sistema is not None else SistemaRecomendacion()
+        self.hormigas_por_pedido = hormigas_por_pedido
+        self.max_lote = max_lote
+        self.espera_maxima = espera_maxima
+        self.max_perfiles = max_perfiles
+        self.cache = cache  # CachePlaylists o None
+        self.memoria = memoria  # MemoriaFeromonas o None
+        self.segundos_sincronizacion = segundos_sincronizacion
+        self.perfiles_modificados = set()  # Claves con feromonas sin sincronizar
+        self.proxima_sincronizacion = time.monotonic() + segundos_sincronizacion
+        self.feromonas_perfiles = OrderedDict()  # clave -> almacén de feromonas, del menos al más usado
+        # El sistema no es seguro entre hilos: todos los lotes corren en el mismo hilo
+        self.ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='colonia')
+        self.cola = None
+        self.tarea_lotes = None
+        self.reiniciar_metricas()
+
+    def reiniciar_metricas(self):
+        self.latencias = deque(maxlen=VENTANA_LATENCIAS)
+        self.atendidos = 0
+        self.errores = 0
+        self.lotes = 0
+        self.primer_pedido = None
+
+    # --- Colonia (hilo del ejecutor) ---
+
+    def feromonas_perfil(self, clave):
+        """Almacén de feromonas del perfil; crea uno nuevo y descarta el menos usado si no hay lugar"""
+        almacen = self.feromonas_perfiles.get(clave)
+        if almacen is None:
+            if self.memoria is not None:
+                almacen = self.memoria.cargar(clave, self.sistema)  # Lo aprendido en sesiones anteriores
+            if almacen is None:
+                almacen = self.sistema.inicializar_feromonas()
+            if len(self.feromonas_perfiles) >= self.max_perfiles:
+                self.sincronizar_perfil(*self.feromonas_perfiles.popitem(last=False))
+            self.feromonas_perfiles[clave] = almacen
+        else:
+            self.feromonas_perfiles.move_to_end(clave)
+        return almacen
+
+    def atender_grupo(self, pedidos):
+        """Una construcción vectorizada para pedidos del mismo perfil y longitud"""
+        sistema = self.sistema
+        preferencias = pedidos[0].preferencias
+        sistema.almacen = almacen = self.feromonas_perfil(pedidos[0].clave)
+        marca = almacen.marca()  # Estado con el que se construyen (antes de reforzar)
+
+        hormigas = self.hormigas_por_pedido
+        inicios = np.repeat([pedido.inicio for pedido in pedidos], hormigas)
+        playlists = sistema.construir_playlists(preferencias, len(inicios), pedidos[0].longitud, inicios)
+        calidades = sistema.evaluar_playlists(playlists, preferencias)
+
+        # Cada pedido se queda con la mejor de sus hormigas; la mejor del grupo refuerza el perfil
+        mejores = calidades.reshape(len(pedidos), hormigas).argmax(axis=1) + np.arange(len(pedidos)) * hormigas
+        mejor = int(np.argmax(calidades))
+        sistema.actualizar_feromonas(playlists[mejor] if calidades[mejor] > 0 else None, float(calidades[mejor]))
+        self.perfiles_modificados.add(pedidos[0].clave)
+        resultados = [{'playlist': [sistema.nombres[i] for i in playlists[fila]], 'calidad': float(calidades[fila])}
+                      for fila in mejores]
+        if self.cache is not None:
+            for pedido, resultado in zip(pedidos, resultados):
+                self.cache.guardar((pedido.clave, pedido.inicio, pedido.longitud), resultado, almacen, marca)
+        return resultados
+
+    def atender_lote(self, lote):
+        """Resultados (o excepciones) de cada pedido del lote, en el mismo orden"""
+        grupos = {}
+        for posicion, pedido in enumerate(lote):
+            grupos.setdefault((pedido.clave, pedido.longitud), []).append(posicion)
+
+        resultados = [None] * len(lote)
+        for posiciones in grupos.values():
+            try:
+                for posicion, resultado in zip(posiciones, self.atender_grupo([lote[p] for p in posiciones])):
+                    resultados[posicion] = resultado
+            except Exception as error:  # Un grupo que falla no debe tumbar al resto del lote
+                for posicion in posiciones:
+                    resultados[posicion] = error
+
+        if self.memoria is not None and time.monotonic() >= self.proxima_sincronizacion:
+            self.sincronizar_perfiles()
+        return resultados
+
+    def sincronizar_perfil(self, clave, almacen):
+        if self.memoria is not None and clave in self.perfiles_modificados:
+            self.memoria.sincronizar(clave, almacen, self.sistema)
+        self.perfiles_modificados.discard(clave)
+
+    def sincronizar_perfiles(self):
+        """Mezcla en disco las feromonas de los perfiles calientes que aprendieron algo"""
+        for clave in list(self.perfiles_modificados):
+            if clave in self.feromonas_perfiles:
+                self.sincronizar_perfil(clave, self.feromonas_perfiles[clave])
+        self.perfiles_modificados.clear()
+        self.proxima_sincronizacion = time.monotonic() + self.segundos_sincronizacion
+
+    # --- Bucle de eventos ---
+
+    async def iniciar(self):
+        self.cola = asyncio.Queue()
+        self.tarea_lotes = asyncio.create_task(self.procesar_lotes())
+
+    async def cerrar(self):
+        if self.tarea_lotes is not None:
+            self.tarea_lotes.cancel()
+            try:
+                await self.tarea_lotes
+            except asyncio.CancelledError:
+                pass
+            self.tarea_lotes = None
+        if self.memoria is not None:
+            await asyncio.get_running_loop().run_in_executor(self.ejecutor, self.sincronizar_perfiles)
+        self.ejecutor.shutdown(wait=True)
+
+    def validar_pedido(self, preferencias, longitud, inicio):
+        """Rechaza antes de encolar lo que haría fallar a la colonia (ValueError con un mensaje legible)"""
+        if not isinstance(preferencias, dict) or not preferencias:
+            raise ValueError("Las preferencias deben ser un objeto no vacío {característica: número}")
+        for caracteristica, valor in preferencias.items():
+            if not isinstance(caracteristica, str) or isinstance(valor, bool) \
+                    or not isinstance(valor, numbers.Real) or not math.isfinite(valor):
+                raise ValueError(f"Preferencia inválida: {caracteristica!r}: {valor!r}")
+        if isinstance(longitud, bool) or not isinstance(longitud, numbers.Integral) or longitud < 1:
+            raise ValueError(f"Longitud inválida: {longitud!r} (se espera un entero positivo)")
+        if inicio is not None and (not isinstance(inicio, str) or inicio not in self.sistema.indice):
+            raise ValueError(f"Canción inicial desconocida: {inicio!r}")
+
+    async def recomendar(self, preferencias, longitud=8, inicio=None):
+        """Playlist de `longitud` canciones para `preferencias`, opcionalmente empezando por la canción `inicio`"""
+        self.validar_pedido(preferencias, longitud, inicio)
+        indice_inicio = self.sistema.indice[inicio] if inicio is not None else -1
+        preferencias = cuantizar_preferencias(preferencias)
+
+        llegada = time.perf_counter()
+        if self.primer_pedido is None:
+            self.primer_pedido = llegada
+        clave = clave_perfil(preferencias)
+        if self.cache is not None:
+            resultado = self.cache.obtener((clave, indice_inicio, int(longitud)), self.feromonas_perfiles.get(clave))
+            if resultado is not None:
+                segundos = time.perf_counter() - llegada
+                self.atendidos += 1
+                self.latencias.append(segundos)
+                return dict(resultado, segundos=segundos, cache=True)
+
+        futuro = asyncio.get_running_loop().create_future()
+        await self.cola.put(Pedido(clave, preferencias, int(longitud), indice_inicio, futuro, llegada))
+        return dict(await futuro, segundos=time.perf_counter() - llegada)
+
+    async def procesar_lotes(self):
+        bucle = asyncio.get_running_loop()
+        while True:
+            lote = [await self.cola.get()]
+            limite = bucle.time() + self.espera_maxima
+            while len(lote) < self.max_lote:
+                if not self.cola.empty():
+                    lote.append(self.cola.get_nowait())
+                    continue
+                restante = limite - bucle.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self.cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                resultados = await bucle.run_in_executor(self.ejecutor, self.atender_lote, lote)
+            except Exception as error:  # Un lote que falla (p. ej. al escribir en disco) no debe parar el bucle
+                resultados = [error] * len(lote)
+            self.lotes += 1
+            ahora = time.perf_counter()
+            for pedido, resultado in zip(lote, resultados):
+                if pedido.futuro.done():  # El cliente se desconectó y se canceló la espera
+                    continue
+                if isinstance(resultado, Exception):
+                    self.errores += 1
+                    pedido.futuro.set_exception(resultado)
+                else:
+                    self.atendidos += 1
+                    self.latencias.append(ahora - pedido.llegada)
+                    pedido.futuro.set_result(resultado)
+
+    def metricas(self):
+        """Latencia p50/p99 (últimos VENTANA_LATENCIAS pedidos), pedidos por segundo y tamaño de lote"""
+        latencias = np.array(self.latencias) * 1e3
+        segundos = time.perf_counter() - self.primer_pedido if self.primer_pedido is not None else 0
+        return {
+            'pedidos': self.atendidos,
+            'errores': self.errores,
+            'lotes': self.lotes,
+            'pedidos_por_lote': self.atendidos / self.lotes if self.lotes else 0,
+            'p50_ms': float(np.percentile(latencias, 50)) if len(latencias) else None,
+            'p99_ms': float(np.percentile(latencias, 99)) if len(latencias) else None,
+            'pedidos_por_segundo': self.atendidos / segundos if segundos > 0 else 0,
+            'perfiles_calientes': len(self.feromonas_perfiles),
+            'cache': None if self.cache is None else {'aciertos': self.cache.aciertos, 'fallos': self.cache.fallos,
+                                                      'invalidadas': self.cache.invalidadas,
+                                                      'entradas': len(self.cache)},
+        }
+
+    # --- Protocolo ---
+
+    async def responder(self, pedido):
+        if not isinstance(pedido, dict):
+            raise ValueError("Se esperaba un objeto JSON")
+        orden = pedido.get('orden', 'recomendar')
+        if orden == 'metricas':
+            return self.metricas()
+        if orden == 'reiniciar_metricas':
+            self.reiniciar_metricas()
+            return {'ok': True}
+        if orden != 'recomendar':
+            raise ValueError(f"Orden desconocida: {orden!r}")
+
+        if 'perfil' in pedido:
+            if not isinstance(pedido['perfil'], str) or pedido['perfil'] not in self.sistema.tipos_usuario:
+                raise ValueError(f"Perfil desconocido: {pedido['perfil']} "
+                                 f"(opciones: {', '.join(self.sistema.tipos_usuario)})")
+            preferencias = self.sistema.tipos_usuario[pedido['perfil']]
+        else:
+            preferencias = pedido['preferencias']
+        return await self.recomendar(preferencias, pedido.get('longitud', 8), pedido.get('inicio'))
+
+    async def atender_linea(self, linea, escritor, cerrojo):
+        pedido = {}
+        try:
+            pedido = json.loads(linea)
+            respuesta = await self.responder(pedido)
+        except KeyError as error:
+            respuesta = {'error': f"Falta o no existe: {error.args[0]}"}
+        except (ValueError, TypeError) as error:
+            respuesta = {'error': str(error)}
+        except Exception as error:  # Toda línea recibe respuesta, aunque sea un fallo inesperado
+            respuesta = {'error': f"Error interno: {type(error).__name__}: {error}"}
+        if isinstance(pedido, dict) and 'id' in pedido:
+            respuesta['id'] = pedido['id']
+        async with cerrojo:
+            escritor.write((json.dumps(respuesta, ensure_ascii=False) + '\n').encode('utf-8'))
+            await escritor.drain()
+
+    async def atender_conexion(self, lector, escritor):
+        """Cada línea se atiende en su propia tarea: un cliente puede tener varios pedidos en vuelo"""
+        cerrojo = asyncio.Lock()
+        tareas = set()
+        try:
+            while linea := await lector.readline():
+                tarea = asyncio.create_task(self.atender_linea(linea, escritor, cerrojo))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host='127.0.0.1', puerto=PUERTO):
+        """Atiende conexiones hasta que se cancele la tarea"""
+        await self.iniciar()
+        servidor = await asyncio.start_server(self.atender_conexion, host, puerto, limit=1 << 20)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            await self.cerrar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio local de playlists (JSON por líneas sobre TCP)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=PUERTO)
+    parser.add_argument('--semilla', type=int, default=None)
+    parser.add_argument('--catalogo', default=None, help="CSV de canciones (ver Catalogo_Canciones)")
+    parser.add_argument('--perfiles', default=None, help="CSV de tipos de usuario")
+    parser.add_argument('--vecinos', type=int, default=None, help="listas de candidatos de k canciones")
+    parser.add_argument('--feromonas-dispersas', action='store_true')
+    parser.add_argument('--hormigas-por-pedido', type=int, default=HORMIGAS_POR_PEDIDO)
+    parser.add_argument('--max-lote', type=int, default=MAX_LOTE)
+    parser.add_argument('--espera-maxima', type=float, default=ESPERA_MAXIMA, help="segundos")
+    parser.add_argument('--cache', type=int, default=0, help="capacidad de la caché de playlists (0 la desactiva)")
+    parser.add_argument('--ttl', type=float, default=60.0, help="segundos de vigencia de cada playlist en caché")
+    parser.add_argument('--umbral-deriva', type=float, default=0.2,
+                        help="cambio de proporciones de feromona a partir del cual se recalcula una playlist en caché")
+    parser.add_argument('--memoria', default=None,
+                        help="directorio con las feromonas aprendidas por perfil (se cargan y se actualizan)")
+    parser.add_argument('--segundos-sincronizacion', type=float, default=SEGUNDOS_SINCRONIZACION)
+    args = parser.parse_args(argv)
+
+    canciones = perfiles = None
+    if args.catalogo or args.perfiles:
+        import Catalogo_Canciones
+        canciones = Catalogo_Canciones.cargar_catalogo(args.catalogo) if args.catalogo else None
+        perfiles = Catalogo_Canciones.cargar_perfiles(args.perfiles) if args.perfiles else None
+    sistema = SistemaRecomendacion(canciones, args.semilla, args.vecinos, perfiles, args.feromonas_dispersas)
+    cache = CachePlaylists(args.cache, args.ttl, args.umbral_deriva) if args.cache else None
+    memoria = MemoriaFeromonas(args.memoria) if args.memoria else None
+    servicio = ServicioPlaylists(sistema, args.hormigas_por_pedido, args.max_lote, args.espera_maxima, cache=cache,
+                                 memoria=memoria, segundos_sincronizacion=args.segundos_sincronizacion)
+    print(f"Sirviendo playlists en {args.host}:{args.puerto}")
+    try:
+        asyncio.run(servicio.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        print(json.dumps(servicio.metricas(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 import random
 import numpy as np
-import matplotlib.pyplot as plt
-import networkx as nx
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import tkinter as tk
-from tkinter import ttk
-import math
+from collections.abc import Mapping, MutableMapping
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from Comun.Checkpoint import (guardar_arreglos, cargar_arreglos, comprobar_tipo, estado_rng, restaurar_rng,
+                              estado_random, restaurar_random)
+from Comun.Perfilado import perfilador
+from Vecinos_Cercanos import vecinos_mas_cercanos
+from Catalogo_Canciones import Catalogo
+from Almacen_Feromonas import FeromonasDensas, FeromonasDispersas
 
 # Configuración del algoritmo
 NUM_HORMIGAS = 10
@@ -14,11 +19,53 @@ EVAPORACION = 0.3
 ALFA = 1.0  # Influencia de feromonas
 BETA = 2.0  # Influencia de heurística
 Q = 100  # Constante de deposición de feromonas
+FEROMONA_INICIAL = 0.1
+CARACTERISTICAS = ('rock', 'pop', 'jazz', 'energia', 'bailabilidad')
+MAX_PERFILES_CACHE = 64  # Vectores de afinidad guardados (uno por perfil de preferencias)
+PASO_CUANTIZACION = 0.05  # Preferencias a múltiplos de 0.05 en el servicio y la caché de playlists
+
+def matriz_similitud(caracteristicas, otras=None, bloque=4_000_000):
+    """Similitud 1 / (1 + distancia euclidiana) de cada fila de `caracteristicas` con cada fila de `otras`
+
+    Sin `otras`, entre todas las filas de `caracteristicas`. Se calcula por
+    bloques de filas para que el arreglo intermedio (filas, n, características)
+    no pase de `bloque` elementos.
+    """
+    otras = caracteristicas if otras is None else otras
+    n, m = otras.shape
+    similitud = np.empty((len(caracteristicas), n))
+    filas = max(1, bloque // max(n * m, 1))
+    for inicio in range(0, len(caracteristicas), filas):
+        diferencias = caracteristicas[inicio:inicio + filas, None, :] - otras[None, :, :]
+        np.sqrt(np.einsum('ijk,ijk->ij', diferencias, diferencias), out=similitud[inicio:inicio + filas])
+    similitud += 1
+    np.reciprocal(similitud, out=similitud)
+    return similitud
+
+def ruleta_por_filas(pesos, rng):
+    """Elige una columna de cada fila con probabilidad proporcional a su peso (-1 si la fila suma 0)"""
+    acumuladas = np.cumsum(pesos, axis=1)
+    totales = acumuladas[:, -1]
+    umbrales = rng.random(len(pesos)) * totales
+    elegidos = np.minimum((acumuladas <= umbrales[:, None]).sum(axis=1), pesos.shape[1] - 1)
+    elegidos[totales == 0] = -1
+    return elegidos
+
+def cuantizar_preferencias(preferencias, paso=PASO_CUANTIZACION):
+    """Preferencias redondeadas a múltiplos de `paso` (perfiles casi iguales comparten estado)"""
+    return {caracteristica: round(round(float(valor) / paso) * paso, 6)
+            for caracteristica, valor in preferencias.items()}
+
+def clave_perfil(preferencias):
+    """Clave hashable con el contenido de las preferencias"""
+    return tuple(sorted(preferencias.items()))
 
 class SistemaRecomendacion:
-    def __init__(self):
-        # Base de datos de canciones con características musicales
-        self.canciones = {
+    def __init__(self, canciones=None, semilla=None, vecinos=None, tipos_usuario=None, feromonas_dispersas=False,
+                 max_aristas=None):
+        # Base de datos de canciones con características musicales (la de ejemplo si no se pasa otra).
+        # También acepta un Catalogo cargado de disco (Catalogo_Canciones.cargar_catalogo)
+        self.canciones = canciones if canciones is not None else {
             'song1': {'rock': 0.8, 'pop': 0.2, 'jazz': 0.1, 'energia': 0.9, 'bailabilidad': 0.7},
             'song2': {'rock': 0.3, 'pop': 0.9, 'jazz': 0.4, 'energia': 0.6, 'bailabilidad': 0.9},
             'song3': {'rock': 0.1, 'pop': 0.4, 'jazz': 0.7, 'energia': 0.4, 'bailabilidad': 0.5},
@@ -31,11 +78,25 @@ class SistemaRecomendacion:
             'song10': {'rock': 0.8, 'pop': 0.4, 'jazz': 0.3, 'energia': 0.9, 'bailabilidad': 0.7}
         }
         
-        # Matriz de feromonas inicial
-        self.feromonas = self.inicializar_feromonas()
+        # Índice, matrices precalculadas y feromonas iniciales del catálogo.
+        # Con `vecinos` = k cada transición solo considera las k canciones más
+        # parecidas (listas de candidatos) y no se precalcula la similitud n x n.
+        # Con `feromonas_dispersas` solo se guardan las aristas reforzadas (ver Almacen_Feromonas).
+        # `feromonas` expone el almacén por nombre de canción sin copiarlo
+        self.num_vecinos = vecinos
+        self.feromonas_dispersas = feromonas_dispersas
+        self.max_aristas = max_aristas
+        self.actualizar_catalogo(self.canciones)
+        self.feromonas = VistaFeromonas(self)
+        self.rng = np.random.default_rng(semilla)  # Muestreo de las hormigas por lotes
+        
+        # Historial de la búsqueda
+        self.historial_calidad = []
+        self.mejor_playlist_global = None
+        self.mejor_calidad_global = 0
         
-        # Tipos de usuario predefinidos
-        self.tipos_usuario = {
+        # Tipos de usuario predefinidos (o los de Catalogo_Canciones.cargar_perfiles)
+        self.tipos_usuario = tipos_usuario if tipos_usuario is not None else {
             'Rockero': {'rock': 0.9, 'pop': 0.2, 'jazz': 0.1, 'energia': 0.8, 'bailabilidad': 0.4},
             'PopLover': {'rock': 0.2, 'pop': 0.9, 'jazz': 0.3, 'energia': 0.7, 'bailabilidad': 0.9},
             'JazzFan': {'rock': 0.1, 'pop': 0.3, 'jazz': 0.9, 'energia': 0.5, 'bailabilidad': 0.6},
@@ -43,61 +104,293 @@ class SistemaRecomendacion:
             'Bailarin': {'rock': 0.4, 'pop': 0.7, 'jazz': 0.5, 'energia': 0.6, 'bailabilidad': 0.9}
         }
         
+    def actualizar_catalogo(self, canciones):
+        """Cambia el catálogo (diccionario o Catalogo): reconstruye las matrices precalculadas y las feromonas"""
+        self.catalogo = canciones if isinstance(canciones, Catalogo) else Catalogo.desde_dict(canciones)
+        self.canciones = self.catalogo.canciones if isinstance(canciones, Catalogo) else canciones
+        
+        # Nombre de cada fila/columna de las matrices y matriz canción x característica
+        self.nombres = self.catalogo.nombres
+        self.nombres_caracteristicas = self.catalogo.nombres_caracteristicas
+        self.caracteristicas = self.catalogo.caracteristicas
+        
+        # Similitud entre todos los pares, o solo con los k vecinos más cercanos de cada canción
+        if self.num_vecinos is None:
+            self.similitud = matriz_similitud(self.caracteristicas)
+            self.vecinos = self.similitud_vecinos = None
+        else:
+            self.similitud = None
+            self.vecinos, distancias = self.catalogo.vecinos(self.num_vecinos, vecinos_mas_cercanos)
+            self.similitud_vecinos = 1 / (1 + distancias)
+        self.cache_afinidades = {}  # preferencias -> vector de afinidad de cada canción
+        
+        # Feromonas iniciales: la de la transición i -> j es almacen.valores(i, j)
+        self.almacen = self.inicializar_feromonas()
+    
+    @property
+    def indice(self):
+        """nombre de canción -> fila/columna en las matrices"""
+        return self.catalogo.indice
+    
+    @property
+    def tau(self):
+        """Feromonas como matriz (n, n): la viva con el almacén denso, una copia con el disperso"""
+        return self.almacen.densa()
+    
     def inicializar_feromonas(self):
-        """Inicializa la matriz de feromonas con valores pequeños"""
-        canciones_list = list(self.canciones.keys())
-        n = len(canciones_list)
-        feromonas = {}
-        
-        for i, cancion_i in enumerate(canciones_list):
-            feromonas[cancion_i] = {}
-            for j, cancion_j in enumerate(canciones_list):
-                if i != j:
-                    feromonas[cancion_i][cancion_j] = 0.1  # Valor inicial pequeño
-                else:
-                    feromonas[cancion_i][cancion_j] = 0  # No hay transición a sí misma
-                    
-        return feromonas
+        """Inicializa el almacén de feromonas con valores pequeños"""
+        if self.feromonas_dispersas:
+            return FeromonasDispersas(len(self.nombres), FEROMONA_INICIAL, self.max_aristas)
+        return FeromonasDensas(len(self.nombres), FEROMONA_INICIAL)
     
     def calcular_similitud(self, cancion1, cancion2):
-        """Calcula la similitud musical entre dos canciones"""
-        caracteristicas1 = self.canciones[cancion1]
-        caracteristicas2 = self.canciones[cancion2]
-        
-        # Calcular distancia euclidiana y convertir a similitud
-        distancia = 0
-        for caracteristica in caracteristicas1:
-            distancia += (caracteristicas1[caracteristica] - caracteristicas2[caracteristica]) ** 2
-        
-        similitud = 1 / (1 + math.sqrt(distancia))
-        return similitud
+        """Calcula la similitud musical entre dos canciones (1 / (1 + distancia euclidiana))"""
+        return float(self.similitud_pares(self.indice[cancion1], self.indice[cancion2]))
+    
+    def similitud_pares(self, origenes, destinos):
+        """Similitud de cada par (origen, destino) de índices; se calcula al vuelo sin matriz precalculada"""
+        if self.similitud is not None:
+            return self.similitud[origenes, destinos]
+        diferencias = self.caracteristicas[origenes] - self.caracteristicas[destinos]
+        return 1 / (1 + np.sqrt(np.einsum('...k,...k->...', diferencias, diferencias)))
+    
+    def similitud_filas(self, origenes):
+        """Filas (len(origenes), n) de similitud con todo el catálogo"""
+        if self.similitud is not None:
+            return self.similitud[origenes]
+        return matriz_similitud(self.caracteristicas[origenes], self.caracteristicas)
+    
+    def afinidades(self, preferencias_usuario):
+        """Afinidad de cada canción del catálogo con las preferencias (vector en caché por perfil)
+
+        La clave es el contenido de las preferencias, así que modificar un perfil
+        produce un vector nuevo; cambiar el catálogo con actualizar_catalogo vacía la caché.
+        """
+        clave = clave_perfil(preferencias_usuario)
+        afinidad = self.cache_afinidades.get(clave)
+        if afinidad is None:
+            pesos = np.array([preferencias_usuario.get(c, 0.0) for c in self.nombres_caracteristicas])
+            afinidad = self.caracteristicas @ pesos / len(preferencias_usuario)  # Normalizar
+            if len(self.cache_afinidades) >= MAX_PERFILES_CACHE:
+                del self.cache_afinidades[next(iter(self.cache_afinidades))]  # El más antiguo
+            self.cache_afinidades[clave] = afinidad
+        return afinidad
     
     def calcular_afinidad(self, cancion, preferencias_usuario):
         """Calcula qué tan bien se adapta una canción a las preferencias del usuario"""
-        afinidad = 0
-        caracteristicas_cancion = self.canciones[cancion]
-        
-        for caracteristica, valor_pref in preferencias_usuario.items():
-            if caracteristica in caracteristicas_cancion:
-                valor_cancion = caracteristicas_cancion[caracteristica]
-                afinidad += valor_pref * valor_cancion
-        
-        return afinidad / len(preferencias_usuario)  # Normalizar
+        return float(self.afinidades(preferencias_usuario)[self.indice[cancion]])
+    
+    def puntuar_transiciones(self, actual, candidatos, afinidad):
+        """tau^alfa * heurística^beta de la canción `actual` a cada una de `candidatos` (índices)
+
+        La heurística es similitud * afinidad de la siguiente canción, y se
+        evalúa sobre toda la fila de candidatos a la vez.
+        """
+        heuristica = self.similitud_pares(actual, candidatos) * afinidad[candidatos]
+        return self.almacen.valores(actual, candidatos) ** ALFA * heuristica ** BETA
     
     def evaluar_transicion(self, cancion_actual, siguiente_cancion, preferencias_usuario):
         """Evalúa la probabilidad de transición entre dos canciones"""
         if cancion_actual == siguiente_cancion:
             return 0
         
-        similitud = self.calcular_similitud(cancion_actual, siguiente_cancion)
-        afinidad_usuario = self.calcular_afinidad(siguiente_cancion, preferencias_usuario)
-        feromona = self.feromonas[cancion_actual][siguiente_cancion]
+        siguiente = self.indice[siguiente_cancion]
+        probabilidad = self.puntuar_transiciones(self.indice[cancion_actual], [siguiente],
+                                                 self.afinidades(preferencias_usuario))
+        return float(probabilidad[0])
+    
+    def construir_playlists(self, preferencias, num_hormigas=NUM_HORMIGAS, longitud_playlist=8, inicios=None):
+        """Construye las playlists de todas las hormigas a la vez
+
+        Devuelve una matriz (num_hormigas, longitud) de índices de canción. Cada
+        paso puntúa una fila de probabilidades por hormiga, anula las canciones ya
+        visitadas y elige con una ruleta vectorizada (suma acumulada por fila
+        comparada con un número aleatorio por hormiga). Con listas de candidatos
+        cada fila tiene k columnas en vez de n. `inicios` fija la canción inicial
+        de cada hormiga (índices; -1 la deja al azar).
+        """
+        n = len(self.nombres)
+        longitud = min(longitud_playlist, n)
+        playlists = np.empty((num_hormigas, longitud), dtype=np.intp)
+        afinidad = self.afinidades(preferencias)
+        
+        # Canción inicial aleatoria
+        playlists[:, 0] = self.rng.integers(n, size=num_hormigas)
+        if inicios is not None:
+            inicios = np.asarray(inicios)
+            fijos = inicios >= 0
+            playlists[fijos, 0] = inicios[fijos]
+        for paso in range(1, longitud):
+            if self.vecinos is None:
+                playlists[:, paso] = self.elegir_en_catalogo(playlists[:, :paso], afinidad)
+            else:
+                playlists[:, paso] = self.elegir_entre_vecinos(playlists[:, :paso], afinidad)
+        return playlists
+    
+    def elegir_en_catalogo(self, anteriores, afinidad):
+        """Siguiente canción de cada hormiga entre todo el catálogo, sin repetir las de `anteriores`"""
+        actuales = anteriores[:, -1]
+        visitadas = np.zeros((len(anteriores), len(self.nombres)), dtype=bool)
+        visitadas[np.arange(len(anteriores))[:, None], anteriores] = True
+        
+        probabilidades = self.almacen.filas(actuales) ** ALFA * (self.similitud_filas(actuales) * afinidad) ** BETA
+        probabilidades[visitadas] = 0
+        elegidos = ruleta_por_filas(probabilidades, self.rng)
+        
+        # Si todas las probabilidades de una hormiga son 0, elegir al azar entre las no visitadas
+        sin_opciones = elegidos < 0
+        if sin_opciones.any():
+            elegidos[sin_opciones] = ruleta_por_filas(~visitadas[sin_opciones], self.rng)
+        return elegidos
+    
+    def elegir_entre_vecinos(self, anteriores, afinidad):
+        """Siguiente canción de cada hormiga entre los k vecinos de la actual (costo O(k) por hormiga)
+
+        Las hormigas que ya visitaron todos sus vecinos (o cuyos vecinos tienen
+        probabilidad 0) eligen entre todo el catálogo.
+        """
+        actuales = anteriores[:, -1]
+        candidatos = self.vecinos[actuales]
+        heuristica = self.similitud_vecinos[actuales] * afinidad[candidatos]
+        probabilidades = self.almacen.valores(actuales[:, None], candidatos) ** ALFA * heuristica ** BETA
+        probabilidades[(candidatos[:, :, None] == anteriores[:, None, :]).any(axis=2)] = 0
+        
+        elegidos = ruleta_por_filas(probabilidades, self.rng)
+        agotadas = elegidos < 0
+        siguientes = np.take_along_axis(candidatos, np.maximum(elegidos, 0)[:, None], axis=1)[:, 0].astype(np.intp)
+        if agotadas.any():
+            siguientes[agotadas] = self.elegir_en_catalogo(anteriores[agotadas], afinidad)
+        return siguientes
+    
+    def evaluar_playlists(self, playlists, preferencias):
+        """Calidad de cada fila de índices: similitud * afinidad media de sus transiciones"""
+        if playlists.shape[1] < 2:
+            return np.zeros(len(playlists))
+        siguientes = playlists[:, 1:]
+        calidades = self.similitud_pares(playlists[:, :-1], siguientes) * self.afinidades(preferencias)[siguientes]
+        return calidades.mean(axis=1)
+    
+    def ejecutar_iteracion(self, preferencias, num_hormigas=NUM_HORMIGAS, longitud_playlist=8):
+        """Ejecuta una iteración de la colonia y devuelve la mejor playlist y su calidad"""
+        # Construir todas las playlists por lotes
+        with perfilador.fase('aco.construccion'):
+            playlists = self.construir_playlists(preferencias, num_hormigas, longitud_playlist)
+        
+        # Evaluar playlists; la mejor se elige en registrar_iteracion
+        with perfilador.fase('aco.evaluacion'):
+            calidades = self.evaluar_playlists(playlists, preferencias)
+        return self.registrar_iteracion(playlists, calidades)
+    
+    def registrar_iteracion(self, playlists, calidades):
+        """Elige la mejor de las playlists evaluadas, actualiza las feromonas y el historial
+
+        Es la segunda mitad de ejecutar_iteracion, separada para quien construye
+        las playlists por su cuenta (por ejemplo Colonia_Paralela).
+        """
+        # Encontrar la mejor playlist
+        mejor = int(np.argmax(calidades)) if len(calidades) else 0
+        mejor_calidad = float(calidades[mejor]) if len(calidades) else 0
+        mejor_playlist = [self.nombres[i] for i in playlists[mejor]] if mejor_calidad > 0 else None
+        
+        self.actualizar_feromonas(playlists[mejor] if mejor_playlist else None, mejor_calidad)
         
-        # Fórmula de probabilidad: (feromona^alfa) * (heurística^beta)
-        heuristica = similitud * afinidad_usuario
-        probabilidad = (feromona ** ALFA) * (heuristica ** BETA)
+        self.historial_calidad.append(mejor_calidad)
+        if mejor_calidad > self.mejor_calidad_global:
+            self.mejor_calidad_global = mejor_calidad
+            self.mejor_playlist_global = list(mejor_playlist)
         
-        return probabilidad
+        return mejor_playlist, mejor_calidad
+    
+    def actualizar_feromonas(self, indices, calidad):
+        """Evapora y deposita Q * calidad en las transiciones consecutivas de `indices` (o solo evapora si es None)"""
+        with perfilador.fase('aco.feromonas'):
+            # Evaporación: toda la matriz a la vez, o O(1) con el almacén disperso
+            self.almacen.evaporar(1 - EVAPORACION)
+            
+            # Depositar feromonas de la mejor hormiga en sus transiciones consecutivas
+            if indices is not None:
+                self.almacen.depositar(indices[:-1], indices[1:], Q * calidad)
+    
+    def matriz_feromonas(self):
+        """Feromonas como matriz (n, n) en el orden de self.canciones"""
+        return self.tau
+    
+    def entropia_feromonas(self):
+        """Entropía normalizada de las feromonas: cerca de 0 cuando la colonia ya eligió camino"""
+        return self.almacen.entropia()
+    
+    def guardar_checkpoint(self, ruta):
+        """Guarda feromonas (matriz o aristas), historial y estado aleatorio en el directorio `ruta`"""
+        arreglos, meta_almacen = self.almacen.arreglos()
+        guardar_arreglos(ruta, {**arreglos,
+                                'historial_calidad': np.array(self.historial_calidad, dtype=np.float64)}, {
+            'tipo': type(self).__name__,
+            'huella_catalogo': self.catalogo.huella,
+            'feromonas_dispersas': self.feromonas_dispersas,
+            'almacen': meta_almacen,
+            'mejor_playlist_global': self.mejor_playlist_global,
+            'mejor_calidad_global': self.mejor_calidad_global,
+            'rng': estado_rng(self.rng),
+            'random': estado_random(),
+        })
+    
+    def cargar_checkpoint(self, ruta, mmap=True):
+        """Reanuda desde un checkpoint guardado con guardar_checkpoint"""
+        arreglos, meta = cargar_arreglos(ruta, mmap)
+        comprobar_tipo(meta, type(self).__name__)
+        if meta['huella_catalogo'] != self.catalogo.huella:
+            raise ValueError("El checkpoint se guardó con otro catálogo de canciones")
+        self.feromonas_dispersas = meta['feromonas_dispersas']
+        self.almacen = self.inicializar_feromonas()
+        self.almacen.restaurar(arreglos, meta['almacen'])  # Copia los arreglos: no quedan mapeados
+        self.historial_calidad = arreglos['historial_calidad'].tolist()
+        self.mejor_playlist_global = meta['mejor_playlist_global']
+        self.mejor_calidad_global = meta['mejor_calidad_global']
+        restaurar_rng(self.rng, meta['rng'])
+        restaurar_random(meta['random'])
+
+class FilaFeromonas(MutableMapping):
+    """Fila de la matriz de feromonas indexada por nombre de canción (lee y escribe en la matriz)"""
+    __slots__ = ('sistema', 'fila')
+
+    def __init__(self, sistema, fila):
+        self.sistema = sistema
+        self.fila = fila
+
+    def __getitem__(self, cancion):
+        return float(self.sistema.almacen.valores(self.fila, self.sistema.indice[cancion]))
+
+    def __setitem__(self, cancion, valor):
+        self.sistema.almacen.asignar(self.fila, self.sistema.indice[cancion], valor)
+
+    def __delitem__(self, cancion):
+        raise TypeError("La matriz de feromonas tiene una columna fija por canción")
+
+    def __iter__(self):
+        return iter(self.sistema.nombres)
+
+    def __len__(self):
+        return len(self.sistema.nombres)
+
+class VistaFeromonas(Mapping):
+    """Feromonas como `feromonas[cancion_i][cancion_j]`, igual que el antiguo diccionario de diccionarios
+
+    Es una vista sobre `sistema.almacen`: no copia las feromonas y sigue al
+    sistema aunque el almacén se reemplace (por ejemplo al cargar un checkpoint).
+    """
+    __slots__ = ('sistema',)
+
+    def __init__(self, sistema):
+        self.sistema = sistema
+
+    def __getitem__(self, cancion):
+        return FilaFeromonas(self.sistema, self.sistema.indice[cancion])
+
+    def __iter__(self):
+        return iter(self.sistema.nombres)
+
+    def __len__(self):
+        return len(self.sistema.nombres)
 
 class UsuarioHormiga:
     def __init__(self, id_hormiga, preferencias):
@@ -105,17 +398,17 @@ class UsuarioHormiga:
         self.playlist = []
         self.preferencias = preferencias
         self.canciones_visitadas = set()
+        self.visitadas = None  # Máscara booleana por índice de canción
         
     def construir_playlist(self, sistema, longitud_playlist=8):
         """Construye una playlist para la hormiga"""
         self.playlist = []
         self.canciones_visitadas = set()
+        self.visitadas = np.zeros(len(sistema.nombres), dtype=bool)
         
         # Elegir canción inicial aleatoria
-        canciones_disponibles = list(sistema.canciones.keys())
-        cancion_actual = random.choice(canciones_disponibles)
-        self.playlist.append(cancion_actual)
-        self.canciones_visitadas.add(cancion_actual)
+        cancion_actual = random.choice(sistema.nombres)
+        self.visitar(sistema, cancion_actual)
         
         # Construir el resto de la playlist
         while len(self.playlist) < longitud_playlist:
@@ -123,324 +416,56 @@ class UsuarioHormiga:
             if siguiente_cancion is None:
                 break
                 
-            self.playlist.append(siguiente_cancion)
-            self.canciones_visitadas.add(siguiente_cancion)
+            self.visitar(sistema, siguiente_cancion)
             cancion_actual = siguiente_cancion
             
         return self.playlist
     
+    def visitar(self, sistema, cancion):
+        self.playlist.append(cancion)
+        self.canciones_visitadas.add(cancion)
+        self.visitadas[sistema.indice[cancion]] = True
+    
     def elegir_siguiente_cancion(self, sistema, cancion_actual):
         """Elige la siguiente canción basándose en probabilidades"""
-        canciones_disponibles = [c for c in sistema.canciones.keys() 
-                               if c not in self.canciones_visitadas]
-        
-        if not canciones_disponibles:
+        actual = sistema.indice[cancion_actual]
+        candidatos = None
+        if sistema.vecinos is not None:
+            # Solo los vecinos no visitados; si se agotan, todo el catálogo
+            candidatos = sistema.vecinos[actual]
+            candidatos = candidatos[~self.visitadas[candidatos]]
+        if candidatos is None or len(candidatos) == 0:
+            candidatos = np.flatnonzero(~self.visitadas)
+        
+        if len(candidatos) == 0:
             return None
             
-        # Calcular probabilidades para cada canción disponible
-        probabilidades = []
-        for cancion in canciones_disponibles:
-            prob = sistema.evaluar_transicion(cancion_actual, cancion, self.preferencias)
-            probabilidades.append(prob)
-        
-        # Normalizar probabilidades
-        total = sum(probabilidades)
+        # Probabilidades de toda la fila de candidatos a la vez
+        probabilidades = sistema.puntuar_transiciones(actual, candidatos,
+                                                      sistema.afinidades(self.preferencias))
+        acumuladas = np.cumsum(probabilidades)
+        total = acumuladas[-1]
         if total == 0:
             # Si todas las probabilidades son 0, elegir aleatoriamente
-            return random.choice(canciones_disponibles)
+            return sistema.nombres[random.choice(candidatos)]
             
-        probabilidades = [p / total for p in probabilidades]
-        
-        # Elegir basándose en las probabilidades
-        return random.choices(canciones_disponibles, weights=probabilidades)[0]
+        # Elegir basándose en las probabilidades (ruleta sobre la suma acumulada)
+        elegido = min(np.searchsorted(acumuladas, random.random() * total, side='right'), len(candidatos) - 1)
+        return sistema.nombres[candidatos[elegido]]
     
     def evaluar_playlist(self, sistema):
         """Evalúa la calidad de la playlist construida"""
         if len(self.playlist) < 2:
             return 0
             
-        calidad_total = 0
-        pares_evaluados = 0
-        
-        # Evaluar transiciones entre canciones consecutivas
-        for i in range(len(self.playlist) - 1):
-            cancion_actual = self.playlist[i]
-            siguiente_cancion = self.playlist[i + 1]
-            
-            similitud = sistema.calcular_similitud(cancion_actual, siguiente_cancion)
-            afinidad = sistema.calcular_afinidad(siguiente_cancion, self.preferencias)
-            
-            calidad_total += similitud * afinidad
-            pares_evaluados += 1
-        
-        return calidad_total / pares_evaluados if pares_evaluados > 0 else 0
-
-class VisualizadorSpotify:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Sistema de Recomendación Spotify - Algoritmo de Hormigas")
-        self.root.geometry("1200x800")
-        
-        self.sistema = SistemaRecomendacion()
-        self.iteracion_actual = 0
-        self.mejor_playlist_global = None
-        self.mejor_calidad_global = 0
-        self.historial_calidad = []
-        
-        self.setup_ui()
-        
-    def setup_ui(self):
-        # Frame principal
-        main_frame = ttk.Frame(self.root, padding="10")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Configurar grid
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(1, weight=1)
-        
-        # Panel de control
-        control_frame = ttk.LabelFrame(main_frame, text="Configuración", padding="5")
-        control_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
-        
-        # Selección de tipo de usuario
-        ttk.Label(control_frame, text="Tipo de Usuario:").grid(row=0, column=0, padx=5)
-        self.tipo_usuario_var = tk.StringVar(value='Rockero')
-        tipo_combo = ttk.Combobox(control_frame, textvariable=self.tipo_usuario_var, 
-                                 values=list(self.sistema.tipos_usuario.keys()))
-        tipo_combo.grid(row=0, column=1, padx=5)
-        
-        ttk.Button(control_frame, text="Ejecutar 1 Iteración", 
-                  command=self.ejecutar_iteracion).grid(row=0, column=2, padx=5)
-        ttk.Button(control_frame, text="Ejecutar 10 Iteraciones", 
-                  command=self.ejecutar_10_iteraciones).grid(row=0, column=3, padx=5)
-        ttk.Button(control_frame, text="Reiniciar", 
-                  command=self.reiniciar).grid(row=0, column=4, padx=5)
-        
-        # Información de la iteración
-        info_frame = ttk.LabelFrame(main_frame, text="Información", padding="5")
-        info_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
-        
-        self.lbl_iteracion = ttk.Label(info_frame, text="Iteración: 0")
-        self.lbl_iteracion.grid(row=0, column=0, sticky=tk.W, pady=2)
-        
-        self.lbl_mejor_calidad = ttk.Label(info_frame, text="Mejor Calidad: 0.00")
-        self.lbl_mejor_calidad.grid(row=1, column=0, sticky=tk.W, pady=2)
-        
-        self.lbl_playlist_actual = ttk.Label(info_frame, text="Playlist Actual: -")
-        self.lbl_playlist_actual.grid(row=2, column=0, sticky=tk.W, pady=2)
-        
-        # Mejor playlist global
-        mejor_frame = ttk.LabelFrame(info_frame, text="Mejor Playlist Global", padding="5")
-        mejor_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
-        
-        self.lbl_mejor_playlist = ttk.Label(mejor_frame, text="Playlist: -", wraplength=300, justify=tk.LEFT)
-        self.lbl_mejor_playlist.grid(row=0, column=0, sticky=tk.W, pady=2)
-        
-        # Lista de canciones disponibles
-        canciones_frame = ttk.LabelFrame(main_frame, text="Canciones Disponibles", padding="5")
-        canciones_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10), pady=(10, 0))
-        
-        # Treeview para canciones
-        columns = ('Canción', 'Rock', 'Pop', 'Jazz', 'Energía', 'Bailabilidad')
-        self.tree_canciones = ttk.Treeview(canciones_frame, columns=columns, show='headings', height=8)
-        
-        for col in columns:
-            self.tree_canciones.heading(col, text=col)
-            self.tree_canciones.column(col, width=80)
-        
-        self.tree_canciones.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(canciones_frame, orient=tk.VERTICAL, command=self.tree_canciones.yview)
-        self.tree_canciones.configure(yscrollcommand=scrollbar.set)
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        
-        # Gráfico de evolución
-        grafico_frame = ttk.LabelFrame(main_frame, text="Evolución de la Calidad", padding="5")
-        grafico_frame.grid(row=1, column=1, rowspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        self.fig, self.ax = plt.subplots(figsize=(8, 6))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=grafico_frame)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Grafo de recomendaciones
-        grafo_frame = ttk.LabelFrame(main_frame, text="Grafo de Recomendaciones", padding="5")
-        grafo_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
-        
-        self.fig_grafo, self.ax_grafo = plt.subplots(figsize=(10, 4))
-        self.canvas_grafo = FigureCanvasTkAgg(self.fig_grafo, master=grafo_frame)
-        self.canvas_grafo.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Configurar pesos de grid
-        main_frame.rowconfigure(1, weight=1)
-        main_frame.rowconfigure(2, weight=1)
-        main_frame.rowconfigure(3, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        canciones_frame.rowconfigure(0, weight=1)
-        canciones_frame.columnconfigure(0, weight=1)
-        
-        self.actualizar_ui_inicial()
-        
-    def actualizar_ui_inicial(self):
-        """Actualiza la UI con los datos iniciales"""
-        # Actualizar lista de canciones
-        for item in self.tree_canciones.get_children():
-            self.tree_canciones.delete(item)
-            
-        for cancion, caracteristicas in self.sistema.canciones.items():
-            self.tree_canciones.insert('', tk.END, values=(
-                cancion,
-                f"{caracteristicas['rock']:.2f}",
-                f"{caracteristicas['pop']:.2f}",
-                f"{caracteristicas['jazz']:.2f}",
-                f"{caracteristicas['energia']:.2f}",
-                f"{caracteristicas['bailabilidad']:.2f}"
-            ))
-        
-        self.actualizar_grafo()
-        
-    def ejecutar_iteracion(self):
-        """Ejecuta una iteración del algoritmo de colonia de hormigas"""
-        preferencias = self.sistema.tipos_usuario[self.tipo_usuario_var.get()]
-        hormigas = [UsuarioHormiga(i, preferencias) for i in range(NUM_HORMIGAS)]
-        
-        # Construir playlists
-        for hormiga in hormigas:
-            hormiga.construir_playlist(self.sistema)
-        
-        # Evaluar playlists y encontrar la mejor
-        mejor_calidad = 0
-        mejor_playlist = None
-        mejor_hormiga = None
-        
-        for hormiga in hormigas:
-            calidad = hormiga.evaluar_playlist(self.sistema)
-            if calidad > mejor_calidad:
-                mejor_calidad = calidad
-                mejor_playlist = hormiga.playlist
-                mejor_hormiga = hormiga
-        
-        # Actualizar feromonas (evaporación)
-        for cancion_i in self.sistema.feromonas:
-            for cancion_j in self.sistema.feromonas[cancion_i]:
-                self.sistema.feromonas[cancion_i][cancion_j] *= (1 - EVAPORACION)
-        
-        # Depositar feromonas de la mejor hormiga
-        if mejor_hormiga:
-            delta_feromona = Q * mejor_calidad
-            for i in range(len(mejor_playlist) - 1):
-                cancion_actual = mejor_playlist[i]
-                siguiente_cancion = mejor_playlist[i + 1]
-                self.sistema.feromonas[cancion_actual][siguiente_cancion] += delta_feromona
-        
-        # Actualizar estadísticas globales
-        self.iteracion_actual += 1
-        self.historial_calidad.append(mejor_calidad)
-        
-        if mejor_calidad > self.mejor_calidad_global:
-            self.mejor_calidad_global = mejor_calidad
-            self.mejor_playlist_global = mejor_playlist.copy()
-        
-        self.actualizar_ui(mejor_playlist, mejor_calidad)
-        
-    def ejecutar_10_iteraciones(self):
-        """Ejecuta 10 iteraciones del algoritmo"""
-        for _ in range(10):
-            self.ejecutar_iteracion()
-            
-    def reiniciar(self):
-        """Reinicia la simulación"""
-        self.sistema = SistemaRecomendacion()
-        self.iteracion_actual = 0
-        self.mejor_playlist_global = None
-        self.mejor_calidad_global = 0
-        self.historial_calidad = []
-        self.actualizar_ui_inicial()
-        
-    def actualizar_ui(self, playlist_actual, calidad_actual):
-        """Actualiza la interfaz de usuario"""
-        self.lbl_iteracion.config(text=f"Iteración: {self.iteracion_actual}")
-        self.lbl_mejor_calidad.config(text=f"Mejor Calidad: {self.mejor_calidad_global:.4f}")
-        
-        # Mostrar playlist actual
-        if playlist_actual:
-            playlist_str = " → ".join(playlist_actual)
-            self.lbl_playlist_actual.config(text=f"Playlist Actual: {playlist_str}")
-        
-        # Mostrar mejor playlist global
-        if self.mejor_playlist_global:
-            mejor_playlist_str = " → ".join(self.mejor_playlist_global)
-            self.lbl_mejor_playlist.config(text=f"Playlist: {mejor_playlist_str}\nCalidad: {self.mejor_calidad_global:.4f}")
-        
-        # Actualizar gráficos
-        self.actualizar_grafico_evolucion()
-        self.actualizar_grafo()
-        
-    def actualizar_grafico_evolucion(self):
-        """Actualiza el gráfico de evolución de la calidad"""
-        self.ax.clear()
-        
-        if self.historial_calidad:
-            iteraciones = list(range(1, len(self.historial_calidad) + 1))
-            self.ax.plot(iteraciones, self.historial_calidad, 'b-', linewidth=2)
-            self.ax.set_xlabel('Iteración')
-            self.ax.set_ylabel('Calidad de Playlist')
-            self.ax.set_title('Evolución de la Calidad de Recomendación')
-            self.ax.grid(True, linestyle='--', alpha=0.7)
-            
-        self.canvas.draw()
-        
-    def actualizar_grafo(self):
-        """Actualiza el grafo de recomendaciones"""
-        self.ax_grafo.clear()
-        
-        # Crear grafo
-        G = nx.DiGraph()
-        
-        # Añadir nodos (canciones)
-        for cancion in self.sistema.canciones:
-            G.add_node(cancion)
-        
-        # Añadir aristas con pesos basados en feromonas
-        edge_weights = []
-        for cancion_i in self.sistema.feromonas:
-            for cancion_j in self.sistema.feromonas[cancion_i]:
-                if self.sistema.feromonas[cancion_i][cancion_j] > 0.1:  # Solo mostrar conexiones significativas
-                    G.add_edge(cancion_i, cancion_j, weight=self.sistema.feromonas[cancion_i][cancion_j])
-                    edge_weights.append(self.sistema.feromonas[cancion_i][cancion_j])
-        
-        if G.number_of_edges() > 0:
-            # Dibujar grafo
-            pos = nx.spring_layout(G, k=1, iterations=50)
-            
-            # Normalizar pesos para el grosor de las aristas
-            if edge_weights:
-                max_weight = max(edge_weights)
-                edge_widths = [5 * (w / max_weight) for w in edge_weights]
-            else:
-                edge_widths = [1] * G.number_of_edges()
-            
-            nx.draw_networkx_nodes(G, pos, node_size=500, node_color='lightblue', 
-                                 alpha=0.7, ax=self.ax_grafo)
-            nx.draw_networkx_edges(G, pos, width=edge_widths, alpha=0.6, 
-                                 edge_color='gray', arrows=True, ax=self.ax_grafo)
-            nx.draw_networkx_labels(G, pos, font_size=8, ax=self.ax_grafo)
-            
-            # Dibujar etiquetas de pesos en las aristas
-            edge_labels = {(u, v): f"{d['weight']:.2f}" for u, v, d in G.edges(data=True)}
-            nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=6, ax=self.ax_grafo)
-        
-        self.ax_grafo.set_title("Grafo de Recomendaciones (Feromonas)")
-        self.ax_grafo.axis('off')
-        
-        self.canvas_grafo.draw()
-        
-    def run(self):
-        self.root.mainloop()
+        # Evaluar transiciones entre canciones consecutivas (similitud * afinidad)
+        indices = [sistema.indice[cancion] for cancion in self.playlist]
+        actuales, siguientes = indices[:-1], indices[1:]
+        calidades = sistema.similitud_pares(actuales, siguientes) * sistema.afinidades(self.preferencias)[siguientes]
+        return float(calidades.mean())
 
-# Ejecutar la aplicación
+# Ejecutar la aplicación (la interfaz vive en Interfaz_Spotify.py)
 if __name__ == "__main__":
+    from Interfaz_Spotify import VisualizadorSpotify
     app = VisualizadorSpotify()
-    app.run()
\ No newline at end of file
+    app.run()
@@ -0,0 +1,167 @@
+"""Vecinos más cercanos de cada canción, para las listas de candidatos de la colonia.
+
+Con SciPy instalado se usa un KD-tree (`scipy.spatial.cKDTree`), que con pocas
+características por canción encuentra los k vecinos de todo el catálogo en
+O(n log n). Sin SciPy, los catálogos grandes se reparten en una rejilla
+(con bordes en los cuantiles) sobre las características de mayor rango y cada canción solo se
+compara con las de las celdas vecinas (ver `vecinos_rejilla`); el resultado
+es exacto, igual que con el KD-tree. Los catálogos chicos, o aquellos en que la
+rejilla no descarta nada, van por fuerza bruta por bloques de filas: es O(n^2),
+con la memoria intermedia acotada por `bloque`, y avisa si el catálogo es grande.
+"""
+import warnings
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # SciPy es opcional
+    cKDTree = None
+
+PUNTOS_POR_CELDA = 32  # Canciones por celda de la rejilla, en promedio
+MAX_DIMENSIONES_REJILLA = 6  # Características que se usan para repartir la rejilla
+AVISO_FUERZA_BRUTA = 50_000  # Catálogos a partir de los cuales la fuerza bruta avisa que es O(n^2)
+
+
+def vecinos_mas_cercanos(caracteristicas, k, bloque=4_000_000):
+    """Devuelve (indices, distancias), ambos (n, k), de los k vecinos de cada fila
+
+    Los vecinos están ordenados del más cercano al más lejano y nunca incluyen
+    a la propia fila. `k` se recorta a n - 1.
+    """
+    caracteristicas = np.asarray(caracteristicas, dtype=np.float64)
+    n = len(caracteristicas)
+    k = max(0, min(k, n - 1))
+    if k == 0:
+        return np.empty((n, 0), dtype=np.int32), np.empty((n, 0))
+    if cKDTree is not None:
+        return vecinos_kdtree(caracteristicas, k)
+    resultado = vecinos_rejilla(caracteristicas, k, bloque=bloque)
+    if resultado is not None:
+        return resultado
+    if n >= AVISO_FUERZA_BRUTA:
+        warnings.warn(f"Vecinos de {n} canciones por fuerza bruta, O(n^2): instalar SciPy para usar un KD-tree",
+                      RuntimeWarning, stacklevel=2)
+    return vecinos_fuerza_bruta(caracteristicas, k, bloque)
+
+
+def vecinos_kdtree(caracteristicas, k):
+    n = len(caracteristicas)
+    distancias, indices = cKDTree(caracteristicas).query(caracteristicas, k=k + 1, workers=-1)
+
+    # Cada fila trae k + 1 resultados; se quita la propia canción (o, si hay
+    # duplicados exactos y no apareció, el vecino más lejano)
+    propia = indices == np.arange(n)[:, None]
+    propia[~propia.any(axis=1), -1] = True
+    quedan = ~propia
+    return indices[quedan].reshape(n, k).astype(np.int32), distancias[quedan].reshape(n, k)
+
+
+def vecinos_rejilla(caracteristicas, k, puntos_por_celda=PUNTOS_POR_CELDA, bloque=4_000_000):
+    """k vecinos exactos con una rejilla, o None si la rejilla no ayudaría
+
+    La rejilla usa las (hasta MAX_DIMENSIONES_REJILLA) características de mayor
+    rango, con g celdas por eje elegidas para que cada celda tenga unas
+    `puntos_por_celda` canciones; los bordes de cada eje son sus cuantiles, así
+    que los catálogos desparejos no amontonan todo en pocas celdas.
+
+    Las canciones de cada celda se comparan con las de las celdas a distancia
+    `radio` (al principio 1). Cualquier canción fuera de esa vecindad está más
+    lejos que su borde (la distancia proyectada acota la completa), así que si
+    el k-ésimo vecino encontrado está más cerca que el borde el resultado es
+    exacto; si no, esa canción se repite con el radio siguiente. Las distancias
+    se calculan por tandas de a lo sumo `bloque` pares.
+    """
+    n, d = caracteristicas.shape
+    rangos = np.ptp(caracteristicas, axis=0) if n else np.zeros(d)
+    dimensiones = np.argsort(-rangos)[:MAX_DIMENSIONES_REJILLA]
+    dimensiones = dimensiones[rangos[dimensiones] > 0]
+    m = len(dimensiones)
+    if m == 0:
+        return None
+    g = int((n / max(puntos_por_celda, k + 1)) ** (1 / m))
+    if g < 3:
+        return None  # La primera vecindad ya sería todo el catálogo
+
+    proyectadas = caracteristicas[:, dimensiones]
+    bordes = np.quantile(proyectadas, np.linspace(0, 1, g + 1), axis=0).T  # (m, g + 1)
+    forma = (g,) * m
+    coordenadas = np.stack([np.searchsorted(bordes[j, 1:-1], proyectadas[:, j], side='right')
+                            for j in range(m)], axis=1)
+    ejes = np.arange(m)
+    celdas = np.ravel_multi_index(coordenadas.T, forma)
+    orden = np.argsort(celdas, kind='stable').astype(np.int64)
+    celdas_ordenadas = celdas[orden]
+    todas = np.arange(g ** m)
+    inicios = np.searchsorted(celdas_ordenadas, todas)
+    largos = np.searchsorted(celdas_ordenadas, todas, side='right') - inicios
+    normas = np.einsum('ij,ij->i', caracteristicas, caracteristicas)
+
+    indices = np.empty((n, k), dtype=np.int32)
+    distancias = np.empty((n, k))
+    for celda in np.unique(celdas_ordenadas):
+        centro = np.array(np.unravel_index(celda, forma))
+        pendientes = orden[inicios[celda]:inicios[celda] + largos[celda]]
+        radio = 1
+        while len(pendientes):
+            bajo = np.maximum(centro - radio, 0)
+            alto = np.minimum(centro + radio, g - 1)
+            vecindad = np.ravel_multi_index(np.meshgrid(*(np.arange(b, a + 1) for b, a in zip(bajo, alto)),
+                                                      indexing='ij'), forma).ravel()
+            cuantos = largos[vecindad]
+            posiciones = np.repeat(inicios[vecindad] - np.cumsum(cuantos) + cuantos, cuantos) \
+                + np.arange(cuantos.sum())
+            candidatos = orden[posiciones]
+            completo = (bajo == 0).all() and (alto == g - 1).all()
+            if len(candidatos) <= k and not completo:
+                radio += 1
+                continue
+
+            # Distancia de cada canción al borde de la vecindad (infinita en los ejes donde llega al final)
+            puntos = proyectadas[pendientes]
+            hasta_bajo = np.where(bajo > 0, puntos - bordes[ejes, bajo], np.inf)
+            hasta_alto = np.where(alto < g - 1, bordes[ejes, alto + 1] - puntos, np.inf)
+            margenes = np.minimum(hasta_bajo, hasta_alto).min(axis=1)
+
+            resueltas = np.zeros(len(pendientes), dtype=bool)
+            tanda = max(1, bloque // len(candidatos))
+            for inicio in range(0, len(pendientes), tanda):
+                filas = pendientes[inicio:inicio + tanda]
+                cuadrados = normas[filas, None] + normas[None, candidatos] \
+                    - 2 * (caracteristicas[filas] @ caracteristicas[candidatos].T)
+                cuadrados[filas[:, None] == candidatos[None, :]] = np.inf
+                cercanos = np.argpartition(cuadrados, k - 1, axis=1)[:, :k]
+                orden_k = np.argsort(np.take_along_axis(cuadrados, cercanos, axis=1), axis=1)
+                cercanos = candidatos[np.take_along_axis(cercanos, orden_k, axis=1)]
+                diferencias = caracteristicas[filas, None, :] - caracteristicas[cercanos]
+                exactas = np.sqrt(np.einsum('ijk,ijk->ij', diferencias, diferencias))
+
+                listas = completo | (exactas[:, -1] <= margenes[inicio:inicio + tanda])
+                indices[filas[listas]] = cercanos[listas]
+                distancias[filas[listas]] = exactas[listas]
+                resueltas[inicio:inicio + tanda] = listas
+            pendientes = pendientes[~resueltas]
+            radio += 1
+    return indices, distancias
+
+
+def vecinos_fuerza_bruta(caracteristicas, k, bloque):
+    n = len(caracteristicas)
+    indices = np.empty((n, k), dtype=np.int32)
+    distancias = np.empty((n, k))
+    normas = np.einsum('ij,ij->i', caracteristicas, caracteristicas)
+    filas = max(1, bloque // n)
+    for inicio in range(0, n, filas):
+        fin = min(inicio + filas, n)
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, una matriz (filas, n) por bloque
+        cuadrados = normas[inicio:fin, None] + normas[None, :] - 2 * (caracteristicas[inicio:fin] @ caracteristicas.T)
+        cuadrados[np.arange(fin - inicio), np.arange(inicio, fin)] = np.inf
+        cercanos = np.argpartition(cuadrados, k - 1, axis=1)[:, :k]
+        orden = np.argsort(np.take_along_axis(cuadrados, cercanos, axis=1), axis=1)
+        cercanos = np.take_along_axis(cercanos, orden, axis=1)
+        indices[inicio:fin] = cercanos
+
+        # Distancias exactas (la fórmula de las normas pierde precisión con vecinos muy cercanos)
+        diferencias = caracteristicas[inicio:fin, None, :] - caracteristicas[cercanos]
+        distancias[inicio:fin] = np.sqrt(np.einsum('ijk,ijk->ij', diferencias, diferencias))
+    return indices, distancias
@@ -0,0 +1,220 @@
+import tkinter as tk
+from tkinter import ttk
+
+from Pista_Carreras import SistemaCarreras
+from Comun.Perfilado import perfilar
+
+class VisualizadorCarreras:
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("Sistema de Control para Robot de Carreras - Algoritmos Híbridos")
+        self.root.geometry("1400x900")
+        
+        self.sistema = SistemaCarreras()
+        self.sistema.inicializar_poblacion_genetica()
+        
+        self.generacion_actual = 0
+        self.iteracion_hormigas = 0
+        
+        self.setup_ui()
+        self.actualizar_ui()
+        
+    def setup_ui(self):
+        # matplotlib solo se carga al construir la interfaz
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        # Frame principal
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Configurar grid
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+        
+        # Panel de control
+        control_frame = ttk.LabelFrame(main_frame, text="Control de Simulación", padding="5")
+        control_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Button(control_frame, text="Ejecutar Gen. Genética", 
+                  command=self.ejecutar_generacion_genetica).grid(row=0, column=0, padx=5)
+        ttk.Button(control_frame, text="Ejecutar Hormigas", 
+                  command=self.ejecutar_hormigas).grid(row=0, column=1, padx=5)
+        ttk.Button(control_frame, text="Ejecutar PSO", 
+                  command=self.ejecutar_pso).grid(row=0, column=2, padx=5)
+        ttk.Button(control_frame, text="Ejecutar Todo 10 Iter", 
+                  command=self.ejecutar_todo).grid(row=0, column=3, padx=5)
+        ttk.Button(control_frame, text="Reiniciar", 
+                  command=self.reiniciar).grid(row=0, column=4, padx=5)
+        
+        # Información del sistema
+        info_frame = ttk.LabelFrame(main_frame, text="Estado del Sistema", padding="5")
+        info_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
+        
+        self.lbl_generacion = ttk.Label(info_frame, text="Generación Genética: 0")
+        self.lbl_generacion.grid(row=0, column=0, sticky=tk.W, pady=2)
+        
+        self.lbl_iteracion_hormigas = ttk.Label(info_frame, text="Iteración Hormigas: 0")
+        self.lbl_iteracion_hormigas.grid(row=1, column=0, sticky=tk.W, pady=2)
+        
+        self.lbl_mejor_fitness = ttk.Label(info_frame, text="Mejor Fitness: 0.00")
+        self.lbl_mejor_fitness.grid(row=2, column=0, sticky=tk.W, pady=2)
+        
+        self.lbl_mejor_tiempo = ttk.Label(info_frame, text="Mejor Tiempo: ∞")
+        self.lbl_mejor_tiempo.grid(row=3, column=0, sticky=tk.W, pady=2)
+        
+        # Mejor controlador genético
+        controlador_frame = ttk.LabelFrame(info_frame, text="Mejor Controlador Genético", padding="5")
+        controlador_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.lbl_mejor_controlador = ttk.Label(controlador_frame, text="Agresividad: -, Conservador: -, Adelantamiento: -")
+        self.lbl_mejor_controlador.grid(row=0, column=0, sticky=tk.W, pady=2)
+        
+        # Mejor trayectoria
+        trayectoria_frame = ttk.LabelFrame(info_frame, text="Mejor Trayectoria", padding="5")
+        trayectoria_frame.grid(row=5, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.lbl_mejor_trayectoria = ttk.Label(trayectoria_frame, text="Trayectoria: -", wraplength=300)
+        self.lbl_mejor_trayectoria.grid(row=0, column=0, sticky=tk.W, pady=2)
+        
+        # Pista y feromonas
+        pista_frame = ttk.LabelFrame(main_frame, text="Pista y Feromonas", padding="5")
+        pista_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10), pady=(10, 0))
+        
+        self.fig_pista, (self.ax_pista, self.ax_feromonas) = plt.subplots(2, 1, figsize=(8, 6))
+        self.canvas_pista = FigureCanvasTkAgg(self.fig_pista, master=pista_frame)
+        self.canvas_pista.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Gráficos de evolución
+        graficos_frame = ttk.LabelFrame(main_frame, text="Evolución de Algoritmos", padding="5")
+        graficos_frame.grid(row=1, column=1, rowspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.fig_evolucion, (self.ax_genetico, self.ax_hormigas) = plt.subplots(2, 1, figsize=(8, 6))
+        self.canvas_evolucion = FigureCanvasTkAgg(self.fig_evolucion, master=graficos_frame)
+        self.canvas_evolucion.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Configurar pesos de grid
+        main_frame.rowconfigure(1, weight=1)
+        main_frame.rowconfigure(2, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        
+    def ejecutar_generacion_genetica(self):
+        """Ejecuta una generación del algoritmo genético"""
+        fitness = self.sistema.ejecutar_generacion_genetica()
+        self.generacion_actual += 1
+        self.actualizar_ui()
+        
+    def ejecutar_hormigas(self):
+        """Ejecuta una iteración del algoritmo de hormigas"""
+        tiempo, trayectoria = self.sistema.ejecutar_hormigas()
+        self.iteracion_hormigas += 1
+        self.actualizar_ui()
+        
+    def ejecutar_pso(self):
+        """Ejecuta una iteración de PSO"""
+        decision = self.sistema.ejecutar_pso()
+        self.actualizar_ui()
+        
+    def ejecutar_todo(self):
+        """Ejecuta 10 iteraciones de cada algoritmo"""
+        for _ in range(10):
+            self.ejecutar_generacion_genetica()
+            self.ejecutar_hormigas()
+            self.ejecutar_pso()
+            self.root.update()
+            
+    def reiniciar(self):
+        """Reinicia la simulación"""
+        self.sistema = SistemaCarreras()
+        self.sistema.inicializar_poblacion_genetica()
+        self.generacion_actual = 0
+        self.iteracion_hormigas = 0
+        self.actualizar_ui()
+        
+    @perfilar('ui.redibujado')
+    def actualizar_ui(self):
+        """Actualiza toda la interfaz de usuario"""
+        # Actualizar labels
+        self.lbl_generacion.config(text=f"Generación Genética: {self.generacion_actual}")
+        self.lbl_iteracion_hormigas.config(text=f"Iteración Hormigas: {self.iteracion_hormigas}")
+        
+        if self.sistema.mejor_controlador:
+            self.lbl_mejor_fitness.config(text=f"Mejor Fitness: {self.sistema.mejor_controlador.fitness:.4f}")
+            self.lbl_mejor_controlador.config(
+                text=f"Agresividad: {self.sistema.mejor_controlador.agresividad:.2f}, "
+                     f"Conservador: {self.sistema.mejor_controlador.conservador:.2f}, "
+                     f"Adelantamiento: {self.sistema.mejor_controlador.adelantamiento:.2f}"
+            )
+            
+        if self.sistema.mejor_trayectoria:
+            self.lbl_mejor_tiempo.config(text=f"Mejor Tiempo: {self.sistema.mejor_tiempo:.2f}")
+            trayectoria_str = " → ".join(map(str, self.sistema.mejor_trayectoria[:10]))
+            if len(self.sistema.mejor_trayectoria) > 10:
+                trayectoria_str += " ..."
+            self.lbl_mejor_trayectoria.config(text=f"Trayectoria: {trayectoria_str}")
+        
+        # Actualizar gráficos
+        self.actualizar_grafico_pista()
+        self.actualizar_grafico_evolucion()
+        
+    def actualizar_grafico_pista(self):
+        """Actualiza el gráfico de la pista y feromonas"""
+        self.ax_pista.clear()
+        self.ax_feromonas.clear()
+        
+        # Gráfico de la pista
+        tramos = range(len(self.sistema.pista))
+        dificultades = [tramo['dificultad'] for tramo in self.sistema.pista]
+        
+        self.ax_pista.plot(tramos, dificultades, 'b-', linewidth=2, label='Dificultad')
+        self.ax_pista.fill_between(tramos, 0, dificultades, alpha=0.3)
+        self.ax_pista.set_ylabel('Dificultad')
+        self.ax_pista.set_title('Pista de Carrera')
+        self.ax_pista.legend()
+        self.ax_pista.grid(True, linestyle='--', alpha=0.7)
+        
+        # Gráfico de feromonas
+        self.ax_feromonas.bar(tramos, self.sistema.feromonas, alpha=0.7, color='orange')
+        self.ax_feromonas.set_xlabel('Tramo de Pista')
+        self.ax_feromonas.set_ylabel('Feromonas')
+        self.ax_feromonas.set_title('Feromonas en la Pista')
+        self.ax_feromonas.grid(True, linestyle='--', alpha=0.7)
+        
+        self.fig_pista.tight_layout()
+        self.canvas_pista.draw()
+        
+    def actualizar_grafico_evolucion(self):
+        """Actualiza los gráficos de evolución"""
+        self.ax_genetico.clear()
+        self.ax_hormigas.clear()
+        
+        # Gráfico de evolución genética
+        if self.sistema.historial_fitness:
+            generaciones = range(1, len(self.sistema.historial_fitness) + 1)
+            self.ax_genetico.plot(generaciones, self.sistema.historial_fitness, 'g-', linewidth=2)
+            self.ax_genetico.set_ylabel('Fitness')
+            self.ax_genetico.set_title('Evolución del Algoritmo Genético')
+            self.ax_genetico.grid(True, linestyle='--', alpha=0.7)
+            
+        # Gráfico de PSO (simulado)
+        if self.sistema.controlador_pso.mejor_global_fitness > float('-inf'):
+            self.ax_hormigas.scatter([0.5], [0.5], c='red', s=100, alpha=0.7)
+            self.ax_hormigas.set_xlim(0, 1)
+            self.ax_hormigas.set_ylim(0, 1)
+            self.ax_hormigas.set_xlabel('Aceleración')
+            self.ax_hormigas.set_ylabel('Dirección')
+            self.ax_hormigas.set_title('Espacio de Búsqueda PSO')
+            self.ax_hormigas.grid(True, linestyle='--', alpha=0.7)
+            
+        self.fig_evolucion.tight_layout()
+        self.canvas_evolucion.draw()
+        
+    def run(self):
+        self.root.mainloop()
+
+# Ejecutar la aplicación
+if __name__ == "__main__":
+    app = VisualizadorCarreras()
+    app.run()
\ No newline at end of file
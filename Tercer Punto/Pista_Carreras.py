@@ -1,11 +1,17 @@
 import random
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import tkinter as tk
-from tkinter import ttk
 import math
 from enum import Enum
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from Comun.Seleccion import crear_selector
+from Comun.Estadisticas import mejores_y_resumen
+from Comun.Checkpoint import (guardar_arreglos, cargar_arreglos, comprobar_tipo, estado_rng, restaurar_rng,
+                              estado_random, restaurar_random)
+from Comun.Convergencia import diversidad_genes, entropia_feromonas
+from Comun.Perfilado import perfilador
 
 # Configuración de algoritmos
 POBLACION_SIZE = 15
@@ -14,6 +20,7 @@ MUTACION_PROB = 0.1
 NUM_PARTICULAS = 20
 NUM_HORMIGAS = 10
 EVAPORACION = 0.1
+MODO_SELECCION = 'ruleta'
 
 class EstadoCarrera(Enum):
     NORMAL = "Normal"
@@ -22,6 +29,8 @@ class EstadoCarrera(Enum):
     CURVA = "Curva"
 
 class ControladorGenetico:
+    __slots__ = ('agresividad', 'conservador', 'adelantamiento', 'fitness')
+
     def __init__(self, agresividad=None, conservador=None, adelantamiento=None):
         self.agresividad = agresividad if agresividad is not None else random.random()
         self.conservador = conservador if conservador is not None else random.random()
@@ -49,60 +58,121 @@ class ControladorGenetico:
         return f"Agresividad: {self.agresividad:.2f}, Conservador: {self.conservador:.2f}, Adelantamiento: {self.adelantamiento:.2f}"
 
 class Particula:
-    def __init__(self, id_particula):
+    """Proxy de una fila del enjambre de ControladorPSO (estructura de arreglos)
+
+    Posición, velocidad y mejor posición son vistas de las matrices del enjambre,
+    así que una partícula no reserva arreglos propios.
+    """
+    __slots__ = ('enjambre', 'id')
+
+    def __init__(self, enjambre, id_particula):
+        self.enjambre = enjambre
         self.id = id_particula
-        self.posicion = np.array([random.uniform(0, 1), random.uniform(0, 1)])  # [aceleracion, direccion]
-        self.velocidad = np.array([random.uniform(-0.1, 0.1), random.uniform(-0.1, 0.1)])
-        self.mejor_posicion = self.posicion.copy()
-        self.mejor_fitness = float('-inf')
+
+    @property
+    def posicion(self):  # [aceleracion, direccion]
+        return self.enjambre.posiciones[self.id]
+
+    @posicion.setter
+    def posicion(self, valor):
+        self.enjambre.posiciones[self.id] = valor
+
+    @property
+    def velocidad(self):
+        return self.enjambre.velocidades[self.id]
+
+    @velocidad.setter
+    def velocidad(self, valor):
+        self.enjambre.velocidades[self.id] = valor
+
+    @property
+    def mejor_posicion(self):
+        return self.enjambre.mejores_posiciones[self.id]
+
+    @mejor_posicion.setter
+    def mejor_posicion(self, valor):
+        self.enjambre.mejores_posiciones[self.id] = valor
+
+    @property
+    def mejor_fitness(self):
+        return float(self.enjambre.mejores_fitness[self.id])
+
+    @mejor_fitness.setter
+    def mejor_fitness(self, valor):
+        self.enjambre.mejores_fitness[self.id] = valor
         
     def actualizar_velocidad(self, mejor_global, w=0.7, c1=1.4, c2=1.4):
         """Actualiza la velocidad según PSO"""
-        r1, r2 = random.random(), random.random()
+        r1, r2 = self.enjambre.rng.random(2)
         
         inercia = w * self.velocidad
         cognitivo = c1 * r1 * (self.mejor_posicion - self.posicion)
         social = c2 * r2 * (mejor_global - self.posicion)
         
-        self.velocidad = inercia + cognitivo + social
         # Limitar velocidad
-        self.velocidad = np.clip(self.velocidad, -0.2, 0.2)
+        self.velocidad = np.clip(inercia + cognitivo + social, -0.2, 0.2)
         
     def actualizar_posicion(self):
         """Actualiza la posición de la partícula"""
-        self.posicion += self.velocidad
-        self.posicion = np.clip(self.posicion, 0, 1)
+        self.posicion = np.clip(self.posicion + self.velocidad, 0, 1)
 
 class ControladorPSO:
-    def __init__(self):
-        self.particulas = [Particula(i) for i in range(NUM_PARTICULAS)]
+    """Enjambre guardado como estructura de arreglos: una matriz (N, 2) por magnitud"""
+    def __init__(self, num_particulas=NUM_PARTICULAS, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.posiciones = self.rng.uniform(0, 1, (num_particulas, 2))
+        self.velocidades = self.rng.uniform(-0.1, 0.1, (num_particulas, 2))
+        self.mejores_posiciones = self.posiciones.copy()
+        self.mejores_fitness = np.full(num_particulas, float('-inf'))
         self.mejor_global = np.array([0.5, 0.5])
         self.mejor_global_fitness = float('-inf')
+
+    @property
+    def particulas(self):
+        return [Particula(self, i) for i in range(len(self.posiciones))]
         
     def decidir_adelantamiento(self, oponentes, pista, controlador_genetico):
         """Decide el mejor momento para adelantar usando PSO"""
-        # Evaluar todas las partículas
-        for particula in self.particulas:
-            fitness = self.evaluar_adelantamiento(particula.posicion, oponentes, pista, controlador_genetico)
-            
-            if fitness > particula.mejor_fitness:
-                particula.mejor_fitness = fitness
-                particula.mejor_posicion = particula.posicion.copy()
-                
-            if fitness > self.mejor_global_fitness:
-                self.mejor_global_fitness = fitness
-                self.mejor_global = particula.posicion.copy()
+        # Evaluar todas las partículas a la vez
+        with perfilador.fase('pso.evaluacion'):
+            fitness = self.evaluar_adelantamientos(self.posiciones, oponentes, pista, controlador_genetico)
+        
+        mejoran = fitness > self.mejores_fitness
+        self.mejores_fitness[mejoran] = fitness[mejoran]
+        self.mejores_posiciones[mejoran] = self.posiciones[mejoran]
+        
+        mejor = int(np.argmax(fitness))
+        if fitness[mejor] > self.mejor_global_fitness:
+            self.mejor_global_fitness = float(fitness[mejor])
+            self.mejor_global = self.posiciones[mejor].copy()
         
         # Actualizar partículas
-        for particula in self.particulas:
-            particula.actualizar_velocidad(self.mejor_global)
-            particula.actualizar_posicion()
+        with perfilador.fase('pso.actualizacion'):
+            self.actualizar_enjambre(self.mejor_global)
             
         return self.mejor_global
+
+    def actualizar_enjambre(self, mejor_global, w=0.7, c1=1.4, c2=1.4):
+        """Velocidad y posición de todas las partículas, en el sitio"""
+        r1 = self.rng.random((len(self.posiciones), 1))
+        r2 = self.rng.random((len(self.posiciones), 1))
+        
+        self.velocidades *= w
+        self.velocidades += c1 * r1 * (self.mejores_posiciones - self.posiciones)
+        self.velocidades += c2 * r2 * (mejor_global - self.posiciones)
+        np.clip(self.velocidades, -0.2, 0.2, out=self.velocidades)
+        
+        self.posiciones += self.velocidades
+        np.clip(self.posiciones, 0, 1, out=self.posiciones)
     
     def evaluar_adelantamiento(self, decision, oponentes, pista, controlador_genetico):
         """Evalúa la calidad de una decisión de adelantamiento"""
-        aceleracion, direccion = decision
+        decisiones = np.asarray(decision, dtype=np.float64).reshape(1, 2)
+        return float(self.evaluar_adelantamientos(decisiones, oponentes, pista, controlador_genetico)[0])
+
+    def evaluar_adelantamientos(self, decisiones, oponentes, pista, controlador_genetico):
+        """Evalúa un arreglo (N, 2) de decisiones [aceleracion, direccion]"""
+        aceleracion = decisiones[:, 0]
         
         # Factores de evaluación
         distancia_segura = min(oponentes) if oponentes else 10
@@ -122,6 +192,8 @@ class ControladorPSO:
         return fitness
 
 class HormigaRacing:
+    __slots__ = ('id', 'trayectoria', 'tiempo_total')
+
     def __init__(self, id_hormiga):
         self.id = id_hormiga
         self.trayectoria = []
@@ -175,7 +247,7 @@ class HormigaRacing:
         return random.choices(tramos_posibles, weights=probabilidades)[0]
 
 class SistemaCarreras:
-    def __init__(self):
+    def __init__(self, poblacion_size=POBLACION_SIZE, semilla=None):
         # Pista con tramos de diferente dificultad
         self.pista = self.crear_pista()
         self.feromonas = [1.0] * len(self.pista)  # Feromonas iniciales
@@ -183,7 +255,12 @@ class SistemaCarreras:
         # Algoritmos
         self.controladores_geneticos = []
         self.mejor_controlador = None
-        self.controlador_pso = ControladorPSO()
+        self.poblacion_size = poblacion_size
+        self.modo_seleccion = MODO_SELECCION
+        self.rng = np.random.default_rng(semilla)
+        self.selector = None
+        self.estadisticas = None  # (mejor, promedio, peor) de la última generación evaluada
+        self.controlador_pso = ControladorPSO(rng=self.rng)
         self.hormigas = [HormigaRacing(i) for i in range(NUM_HORMIGAS)]
         
         # Historial
@@ -212,7 +289,7 @@ class SistemaCarreras:
     
     def inicializar_poblacion_genetica(self):
         """Inicializa la población de controladores genéticos"""
-        self.controladores_geneticos = [ControladorGenetico() for _ in range(POBLACION_SIZE)]
+        self.controladores_geneticos = [ControladorGenetico() for _ in range(self.poblacion_size)]
         
     def evaluar_controlador(self, controlador):
         """Evalúa un controlador en una simulación de carrera"""
@@ -247,30 +324,41 @@ class SistemaCarreras:
     def ejecutar_generacion_genetica(self):
         """Ejecuta una generación del algoritmo genético"""
         # Evaluar población
-        for controlador in self.controladores_geneticos:
-            self.evaluar_controlador(controlador)
+        with perfilador.fase('ag.evaluacion'):
+            for controlador in self.controladores_geneticos:
+                self.evaluar_controlador(controlador)
             
-        # Ordenar por fitness
-        self.controladores_geneticos.sort(key=lambda x: x.fitness, reverse=True)
+        # Élites y estadísticas en una sola pasada (sin ordenar toda la población)
+        with perfilador.fase('ag.elites'):
+            elites, self.estadisticas = mejores_y_resumen(self.controladores_geneticos, 2)
         
         # Guardar mejor controlador
-        if self.mejor_controlador is None or self.controladores_geneticos[0].fitness > self.mejor_controlador.fitness:
+        if self.mejor_controlador is None or elites[0].fitness > self.mejor_controlador.fitness:
             self.mejor_controlador = ControladorGenetico(
-                self.controladores_geneticos[0].agresividad,
-                self.controladores_geneticos[0].conservador,
-                self.controladores_geneticos[0].adelantamiento
+                elites[0].agresividad,
+                elites[0].conservador,
+                elites[0].adelantamiento
             )
-            self.mejor_controlador.fitness = self.controladores_geneticos[0].fitness
+            self.mejor_controlador.fitness = elites[0].fitness
+            
+        # Tabla de selección de esta generación (se construye una sola vez)
+        num_hijos = max(self.poblacion_size - 2, 0)
+        with perfilador.fase('ag.seleccion'):
+            fitness = np.array([c.fitness for c in self.controladores_geneticos])
+            self.selector = crear_selector(self.modo_seleccion, fitness, self.rng)
+            padres = self.selector.muestrear(2 * num_hijos)
             
         # Crear nueva población (elitismo + cruce + mutación)
-        nueva_poblacion = self.controladores_geneticos[:2]  # Elitismo
-        
-        while len(nueva_poblacion) < POBLACION_SIZE:
-            padre1 = self.seleccion_ruleta()
-            padre2 = self.seleccion_ruleta()
-            hijo = self.cruce(padre1, padre2)
-            self.mutacion(hijo)
-            nueva_poblacion.append(hijo)
+        nueva_poblacion = elites[:2]  # Elitismo
+        
+        with perfilador.fase('ag.cruce'):
+            hijos = [self.cruce(self.controladores_geneticos[padres[i]],
+                                self.controladores_geneticos[padres[num_hijos + i]])
+                     for i in range(num_hijos)]
+        with perfilador.fase('ag.mutacion'):
+            for hijo in hijos:
+                self.mutacion(hijo)
+        nueva_poblacion.extend(hijos)
             
         self.controladores_geneticos = nueva_poblacion
         self.historial_fitness.append(self.controladores_geneticos[0].fitness)
@@ -278,18 +366,8 @@ class SistemaCarreras:
         return self.controladores_geneticos[0].fitness
     
     def seleccion_ruleta(self):
-        """Selección por método de ruleta"""
-        total_fitness = sum(c.fitness for c in self.controladores_geneticos)
-        if total_fitness == 0:
-            return random.choice(self.controladores_geneticos)
-            
-        r = random.uniform(0, total_fitness)
-        acumulado = 0
-        for controlador in self.controladores_geneticos:
-            acumulado += controlador.fitness
-            if acumulado >= r:
-                return controlador
-        return self.controladores_geneticos[-1]
+        """Selección de un padre con la tabla de la generación actual"""
+        return self.controladores_geneticos[self.selector.muestrear(1)[0]]
     
     def cruce(self, padre1, padre2):
         """Cruce de dos controladores"""
@@ -321,238 +399,119 @@ class SistemaCarreras:
         mejor_tiempo_iteracion = float('inf')
         mejor_trayectoria_iteracion = None
         
-        for hormiga in self.hormigas:
-            trayectoria, tiempo = hormiga.explorar_trayectoria(self.pista, self.feromonas)
-            
-            if tiempo < mejor_tiempo_iteracion:
-                mejor_tiempo_iteracion = tiempo
-                mejor_trayectoria_iteracion = trayectoria
+        with perfilador.fase('aco.construccion'):
+            for hormiga in self.hormigas:
+                trayectoria, tiempo = hormiga.explorar_trayectoria(self.pista, self.feromonas)
                 
-            if tiempo < self.mejor_tiempo:
-                self.mejor_tiempo = tiempo
-                self.mejor_trayectoria = trayectoria.copy()
-        
-        # Actualizar feromonas (evaporación)
-        for i in range(len(self.feromonas)):
-            self.feromonas[i] *= (1 - EVAPORACION)
-            
-        # Reforzar mejor trayectoria
-        if mejor_trayectoria_iteracion:
-            for tramo in mejor_trayectoria_iteracion:
-                self.feromonas[tramo] += 1.0 / mejor_tiempo_iteracion
+                if tiempo < mejor_tiempo_iteracion:
+                    mejor_tiempo_iteracion = tiempo
+                    mejor_trayectoria_iteracion = trayectoria
+                    
+                if tiempo < self.mejor_tiempo:
+                    self.mejor_tiempo = tiempo
+                    self.mejor_trayectoria = trayectoria.copy()
+        
+        with perfilador.fase('aco.feromonas'):
+            # Actualizar feromonas (evaporación)
+            for i in range(len(self.feromonas)):
+                self.feromonas[i] *= (1 - EVAPORACION)
+                
+            # Reforzar mejor trayectoria
+            if mejor_trayectoria_iteracion:
+                for tramo in mejor_trayectoria_iteracion:
+                    self.feromonas[tramo] += 1.0 / mejor_tiempo_iteracion
                 
         return mejor_tiempo_iteracion, mejor_trayectoria_iteracion
-
-class VisualizadorCarreras:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Sistema de Control para Robot de Carreras - Algoritmos Híbridos")
-        self.root.geometry("1400x900")
-        
-        self.sistema = SistemaCarreras()
-        self.sistema.inicializar_poblacion_genetica()
-        
-        self.generacion_actual = 0
-        self.iteracion_hormigas = 0
-        
-        self.setup_ui()
-        self.actualizar_ui()
-        
-    def setup_ui(self):
-        # Frame principal
-        main_frame = ttk.Frame(self.root, padding="10")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Configurar grid
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(1, weight=1)
-        
-        # Panel de control
-        control_frame = ttk.LabelFrame(main_frame, text="Control de Simulación", padding="5")
-        control_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
-        
-        ttk.Button(control_frame, text="Ejecutar Gen. Genética", 
-                  command=self.ejecutar_generacion_genetica).grid(row=0, column=0, padx=5)
-        ttk.Button(control_frame, text="Ejecutar Hormigas", 
-                  command=self.ejecutar_hormigas).grid(row=0, column=1, padx=5)
-        ttk.Button(control_frame, text="Ejecutar PSO", 
-                  command=self.ejecutar_pso).grid(row=0, column=2, padx=5)
-        ttk.Button(control_frame, text="Ejecutar Todo 10 Iter", 
-                  command=self.ejecutar_todo).grid(row=0, column=3, padx=5)
-        ttk.Button(control_frame, text="Reiniciar", 
-                  command=self.reiniciar).grid(row=0, column=4, padx=5)
-        
-        # Información del sistema
-        info_frame = ttk.LabelFrame(main_frame, text="Estado del Sistema", padding="5")
-        info_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
-        
-        self.lbl_generacion = ttk.Label(info_frame, text="Generación Genética: 0")
-        self.lbl_generacion.grid(row=0, column=0, sticky=tk.W, pady=2)
-        
-        self.lbl_iteracion_hormigas = ttk.Label(info_frame, text="Iteración Hormigas: 0")
-        self.lbl_iteracion_hormigas.grid(row=1, column=0, sticky=tk.W, pady=2)
-        
-        self.lbl_mejor_fitness = ttk.Label(info_frame, text="Mejor Fitness: 0.00")
-        self.lbl_mejor_fitness.grid(row=2, column=0, sticky=tk.W, pady=2)
-        
-        self.lbl_mejor_tiempo = ttk.Label(info_frame, text="Mejor Tiempo: ∞")
-        self.lbl_mejor_tiempo.grid(row=3, column=0, sticky=tk.W, pady=2)
-        
-        # Mejor controlador genético
-        controlador_frame = ttk.LabelFrame(info_frame, text="Mejor Controlador Genético", padding="5")
-        controlador_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
-        
-        self.lbl_mejor_controlador = ttk.Label(controlador_frame, text="Agresividad: -, Conservador: -, Adelantamiento: -")
-        self.lbl_mejor_controlador.grid(row=0, column=0, sticky=tk.W, pady=2)
-        
-        # Mejor trayectoria
-        trayectoria_frame = ttk.LabelFrame(info_frame, text="Mejor Trayectoria", padding="5")
-        trayectoria_frame.grid(row=5, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
-        
-        self.lbl_mejor_trayectoria = ttk.Label(trayectoria_frame, text="Trayectoria: -", wraplength=300)
-        self.lbl_mejor_trayectoria.grid(row=0, column=0, sticky=tk.W, pady=2)
-        
-        # Pista y feromonas
-        pista_frame = ttk.LabelFrame(main_frame, text="Pista y Feromonas", padding="5")
-        pista_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10), pady=(10, 0))
-        
-        self.fig_pista, (self.ax_pista, self.ax_feromonas) = plt.subplots(2, 1, figsize=(8, 6))
-        self.canvas_pista = FigureCanvasTkAgg(self.fig_pista, master=pista_frame)
-        self.canvas_pista.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Gráficos de evolución
-        graficos_frame = ttk.LabelFrame(main_frame, text="Evolución de Algoritmos", padding="5")
-        graficos_frame.grid(row=1, column=1, rowspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        self.fig_evolucion, (self.ax_genetico, self.ax_hormigas) = plt.subplots(2, 1, figsize=(8, 6))
-        self.canvas_evolucion = FigureCanvasTkAgg(self.fig_evolucion, master=graficos_frame)
-        self.canvas_evolucion.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Configurar pesos de grid
-        main_frame.rowconfigure(1, weight=1)
-        main_frame.rowconfigure(2, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        
-    def ejecutar_generacion_genetica(self):
-        """Ejecuta una generación del algoritmo genético"""
-        fitness = self.sistema.ejecutar_generacion_genetica()
-        self.generacion_actual += 1
-        self.actualizar_ui()
-        
-    def ejecutar_hormigas(self):
-        """Ejecuta una iteración del algoritmo de hormigas"""
-        tiempo, trayectoria = self.sistema.ejecutar_hormigas()
-        self.iteracion_hormigas += 1
-        self.actualizar_ui()
-        
-    def ejecutar_pso(self):
-        """Ejecuta una iteración de PSO"""
-        # Simular escenario de adelantamiento
-        oponentes = [random.uniform(1, 10) for _ in range(3)]
-        decision = self.sistema.controlador_pso.decidir_adelantamiento(
-            oponentes, self.sistema.pista, self.sistema.mejor_controlador
+    
+    def ejecutar_pso(self, oponentes=None):
+        """Ejecuta una iteración de PSO en un escenario de adelantamiento"""
+        if oponentes is None:
+            # Simular escenario de adelantamiento
+            oponentes = [random.uniform(1, 10) for _ in range(3)]
+        return self.controlador_pso.decidir_adelantamiento(
+            oponentes, self.pista, self.mejor_controlador
         )
-        self.actualizar_ui()
-        
-    def ejecutar_todo(self):
-        """Ejecuta 10 iteraciones de cada algoritmo"""
-        for _ in range(10):
-            self.ejecutar_generacion_genetica()
-            self.ejecutar_hormigas()
-            self.ejecutar_pso()
-            self.root.update()
-            
-    def reiniciar(self):
-        """Reinicia la simulación"""
-        self.sistema = SistemaCarreras()
-        self.sistema.inicializar_poblacion_genetica()
-        self.generacion_actual = 0
-        self.iteracion_hormigas = 0
-        self.actualizar_ui()
-        
-    def actualizar_ui(self):
-        """Actualiza toda la interfaz de usuario"""
-        # Actualizar labels
-        self.lbl_generacion.config(text=f"Generación Genética: {self.generacion_actual}")
-        self.lbl_iteracion_hormigas.config(text=f"Iteración Hormigas: {self.iteracion_hormigas}")
-        
-        if self.sistema.mejor_controlador:
-            self.lbl_mejor_fitness.config(text=f"Mejor Fitness: {self.sistema.mejor_controlador.fitness:.4f}")
-            self.lbl_mejor_controlador.config(
-                text=f"Agresividad: {self.sistema.mejor_controlador.agresividad:.2f}, "
-                     f"Conservador: {self.sistema.mejor_controlador.conservador:.2f}, "
-                     f"Adelantamiento: {self.sistema.mejor_controlador.adelantamiento:.2f}"
-            )
-            
-        if self.sistema.mejor_trayectoria:
-            self.lbl_mejor_tiempo.config(text=f"Mejor Tiempo: {self.sistema.mejor_tiempo:.2f}")
-            trayectoria_str = " → ".join(map(str, self.sistema.mejor_trayectoria[:10]))
-            if len(self.sistema.mejor_trayectoria) > 10:
-                trayectoria_str += " ..."
-            self.lbl_mejor_trayectoria.config(text=f"Trayectoria: {trayectoria_str}")
-        
-        # Actualizar gráficos
-        self.actualizar_grafico_pista()
-        self.actualizar_grafico_evolucion()
-        
-    def actualizar_grafico_pista(self):
-        """Actualiza el gráfico de la pista y feromonas"""
-        self.ax_pista.clear()
-        self.ax_feromonas.clear()
-        
-        # Gráfico de la pista
-        tramos = range(len(self.sistema.pista))
-        dificultades = [tramo['dificultad'] for tramo in self.sistema.pista]
-        
-        self.ax_pista.plot(tramos, dificultades, 'b-', linewidth=2, label='Dificultad')
-        self.ax_pista.fill_between(tramos, 0, dificultades, alpha=0.3)
-        self.ax_pista.set_ylabel('Dificultad')
-        self.ax_pista.set_title('Pista de Carrera')
-        self.ax_pista.legend()
-        self.ax_pista.grid(True, linestyle='--', alpha=0.7)
-        
-        # Gráfico de feromonas
-        self.ax_feromonas.bar(tramos, self.sistema.feromonas, alpha=0.7, color='orange')
-        self.ax_feromonas.set_xlabel('Tramo de Pista')
-        self.ax_feromonas.set_ylabel('Feromonas')
-        self.ax_feromonas.set_title('Feromonas en la Pista')
-        self.ax_feromonas.grid(True, linestyle='--', alpha=0.7)
-        
-        self.fig_pista.tight_layout()
-        self.canvas_pista.draw()
-        
-    def actualizar_grafico_evolucion(self):
-        """Actualiza los gráficos de evolución"""
-        self.ax_genetico.clear()
-        self.ax_hormigas.clear()
-        
-        # Gráfico de evolución genética
-        if self.sistema.historial_fitness:
-            generaciones = range(1, len(self.sistema.historial_fitness) + 1)
-            self.ax_genetico.plot(generaciones, self.sistema.historial_fitness, 'g-', linewidth=2)
-            self.ax_genetico.set_ylabel('Fitness')
-            self.ax_genetico.set_title('Evolución del Algoritmo Genético')
-            self.ax_genetico.grid(True, linestyle='--', alpha=0.7)
-            
-        # Gráfico de PSO (simulado)
-        if self.sistema.controlador_pso.mejor_global_fitness > float('-inf'):
-            self.ax_hormigas.scatter([0.5], [0.5], c='red', s=100, alpha=0.7)
-            self.ax_hormigas.set_xlim(0, 1)
-            self.ax_hormigas.set_ylim(0, 1)
-            self.ax_hormigas.set_xlabel('Aceleración')
-            self.ax_hormigas.set_ylabel('Dirección')
-            self.ax_hormigas.set_title('Espacio de Búsqueda PSO')
-            self.ax_hormigas.grid(True, linestyle='--', alpha=0.7)
-            
-        self.fig_evolucion.tight_layout()
-        self.canvas_evolucion.draw()
+    
+    def diversidad_genetica(self):
+        return diversidad_genes([(c.agresividad, c.conservador, c.adelantamiento)
+                                 for c in self.controladores_geneticos])
+    
+    def entropia_feromonas(self):
+        return entropia_feromonas(self.feromonas)
+    
+    def diversidad_pso(self):
+        return diversidad_genes(self.controlador_pso.posiciones)
+    
+    def guardar_checkpoint(self, ruta):
+        """Guarda población, feromonas, enjambre PSO, historial y estado aleatorio en el directorio `ruta`"""
+        poblacion = self.controladores_geneticos
+        genes = np.array([(c.agresividad, c.conservador, c.adelantamiento) for c in poblacion]).reshape(-1, 3)
+        fitness = np.array([c.fitness for c in poblacion], dtype=np.float64)
+        pso = self.controlador_pso
+        mejor = self.mejor_controlador
+        guardar_arreglos(ruta, {
+            'genes': genes, 'fitness': fitness,
+            'feromonas': np.array(self.feromonas, dtype=np.float64),
+            'pso_posiciones': pso.posiciones, 'pso_velocidades': pso.velocidades,
+            'pso_mejores_posiciones': pso.mejores_posiciones, 'pso_mejores_fitness': pso.mejores_fitness,
+            'pso_mejor_global': pso.mejor_global,
+            'historial_fitness': np.array(self.historial_fitness, dtype=np.float64),
+        }, {
+            'tipo': type(self).__name__,
+            'poblacion_size': self.poblacion_size,
+            'modo_seleccion': self.modo_seleccion,
+            'pista': self.pista,
+            'mejor_controlador': None if mejor is None else
+                [mejor.agresividad, mejor.conservador, mejor.adelantamiento, mejor.fitness],
+            'pso_mejor_global_fitness': pso.mejor_global_fitness,
+            'mejor_trayectoria': self.mejor_trayectoria,
+            'mejor_tiempo': self.mejor_tiempo,
+            'rng': estado_rng(self.rng),
+            'random': estado_random(),
+        })
+    
+    def cargar_checkpoint(self, ruta, mmap=True):
+        """Reanuda desde un checkpoint guardado con guardar_checkpoint"""
+        arreglos, meta = cargar_arreglos(ruta, mmap)
+        comprobar_tipo(meta, type(self).__name__)
+        self.poblacion_size = meta['poblacion_size']
+        self.modo_seleccion = meta['modo_seleccion']
+        self.pista = meta['pista']
         
-    def run(self):
-        self.root.mainloop()
+        self.controladores_geneticos = []
+        for genes, fitness in zip(arreglos['genes'].tolist(), arreglos['fitness'].tolist()):
+            controlador = ControladorGenetico(*genes)
+            # Sin volver a normalizar, para que los genes queden idénticos
+            controlador.agresividad, controlador.conservador, controlador.adelantamiento = genes
+            controlador.fitness = fitness
+            self.controladores_geneticos.append(controlador)
+        if meta['mejor_controlador'] is None:
+            self.mejor_controlador = None
+        else:
+            *genes, fitness = meta['mejor_controlador']
+            self.mejor_controlador = ControladorGenetico(*genes)
+            self.mejor_controlador.agresividad, self.mejor_controlador.conservador, \
+                self.mejor_controlador.adelantamiento = genes
+            self.mejor_controlador.fitness = fitness
+        self.feromonas = arreglos['feromonas'].tolist()
+        
+        # Copias: si el enjambre quedara mapeado, el próximo guardar_checkpoint no podría reemplazar los archivos
+        pso = self.controlador_pso
+        pso.posiciones = np.array(arreglos['pso_posiciones'])
+        pso.velocidades = np.array(arreglos['pso_velocidades'])
+        pso.mejores_posiciones = np.array(arreglos['pso_mejores_posiciones'])
+        pso.mejores_fitness = np.array(arreglos['pso_mejores_fitness'])
+        pso.mejor_global = np.array(arreglos['pso_mejor_global'])
+        pso.mejor_global_fitness = meta['pso_mejor_global_fitness']
+        
+        self.historial_fitness = arreglos['historial_fitness'].tolist()
+        self.mejor_trayectoria = meta['mejor_trayectoria']
+        self.mejor_tiempo = meta['mejor_tiempo']
+        restaurar_rng(self.rng, meta['rng'])
+        restaurar_random(meta['random'])
 
-# Ejecutar la aplicación
+# Ejecutar la aplicación (la interfaz vive en Interfaz_Carreras.py)
 if __name__ == "__main__":
+    from Interfaz_Carreras import VisualizadorCarreras
     app = VisualizadorCarreras()
-    app.run()
\ No newline at end of file
+    app.run()
@@ -0,0 +1,8 @@
+"""Las pruebas importan los módulos igual que Ejecutar_Lote: cada punto del taller es una carpeta en sys.path."""
+import os
+import sys
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+for carpeta in ('Primer Punto', 'Segundo Punto', 'Tercer Punto'):
+    sys.path.insert(0, os.path.join(RAIZ, carpeta))
+sys.path.insert(0, RAIZ)
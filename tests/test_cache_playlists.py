@@ -0,0 +1,73 @@
+"""Caché de playlists: aciertos, vencimiento, deriva y expulsión LRU."""
+import numpy as np
+
+import Cache_Playlists
+from Almacen_Feromonas import FeromonasDensas, FeromonasDispersas
+from Cache_Playlists import CachePlaylists
+
+PREFERENCIAS = {'rock': 0.9, 'pop': 0.2}
+
+
+def test_acierto_con_preferencias_casi_iguales():
+    cache, almacen = CachePlaylists(), FeromonasDensas(10, 0.1)
+    assert cache.obtener(cache.clave(PREFERENCIAS, 'A', 5), almacen) is None
+    cache.guardar(cache.clave(PREFERENCIAS, 'A', 5), ['A', 'B'], almacen)
+    assert cache.obtener(cache.clave({'rock': 0.9001, 'pop': 0.2}, 'A', 5), almacen) == ['A', 'B']
+    assert cache.obtener(cache.clave(PREFERENCIAS, 'A', 6), almacen) is None
+    assert (cache.aciertos, cache.fallos) == (1, 2)
+
+
+def test_vence_por_tiempo(monkeypatch):
+    reloj = [100.0]
+    monkeypatch.setattr(Cache_Playlists.time, 'monotonic', lambda: reloj[0])
+    cache, almacen = CachePlaylists(ttl=5.0), FeromonasDensas(10, 0.1)
+    cache.guardar('clave', 'playlist', almacen)
+    reloj[0] += 4.9
+    assert cache.obtener('clave', almacen) == 'playlist'
+    reloj[0] += 0.2
+    assert cache.obtener('clave', almacen) is None
+    assert cache.invalidadas == 1 and len(cache) == 0
+
+
+def test_se_invalida_por_deriva():
+    for almacen in (FeromonasDensas(10, 0.1), FeromonasDispersas(10, 0.1)):
+        cache = CachePlaylists(ttl=None, umbral_deriva=0.2)
+        cache.guardar('clave', 'playlist', almacen)
+        almacen.evaporar(0.5)  # Evaporar no cambia las proporciones
+        assert cache.obtener('clave', almacen) == 'playlist'
+        almacen.depositar([0], [1], 0.001)
+        assert cache.obtener('clave', almacen) == 'playlist'
+        almacen.depositar(np.zeros(5, dtype=int), np.arange(1, 6), 1.0)
+        assert cache.obtener('clave', almacen) is None
+
+
+def test_otro_almacen_invalida():
+    cache = CachePlaylists()
+    cache.guardar('clave', 'playlist', FeromonasDensas(10, 0.1))  # Sin otra referencia: se libera
+    assert cache.obtener('clave', FeromonasDensas(10, 0.1)) is None
+
+    almacen, otro = FeromonasDensas(10, 0.1), FeromonasDensas(10, 0.1)
+    cache.guardar('clave', 'playlist', almacen)
+    assert cache.obtener('clave', otro) is None
+
+
+def test_asignar_y_restaurar_cuentan_como_deriva_total():
+    almacen = FeromonasDispersas(10, 0.1)
+    marca = almacen.marca()
+    almacen.asignar(0, 1, 0.1)
+    assert almacen.deriva(marca) == 1.0
+
+    densa = FeromonasDensas(10, 0.1)
+    marca = densa.marca()
+    densa.restaurar(*densa.arreglos())
+    assert densa.deriva(marca) == 1.0
+
+
+def test_expulsa_el_menos_usado():
+    cache, almacen = CachePlaylists(capacidad=2, ttl=None), FeromonasDensas(10, 0.1)
+    cache.guardar('a', 1, almacen)
+    cache.guardar('b', 2, almacen)
+    cache.obtener('a', almacen)
+    cache.guardar('c', 3, almacen)
+    assert cache.obtener('b', almacen) is None
+    assert cache.obtener('a', almacen) == 1 and cache.obtener('c', almacen) == 3
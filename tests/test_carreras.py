@@ -0,0 +1,74 @@
+"""Robot de carreras: enjambre PSO en estructura de arreglos y checkpoints."""
+import random
+
+import numpy as np
+import pytest
+
+from Pista_Carreras import ControladorPSO, ControladorGenetico, SistemaCarreras
+
+
+def test_enjambre_vectorizado_igual_que_particula_por_particula():
+    enjambre = ControladorPSO(25, rng=np.random.default_rng(0))
+    enjambre.mejores_posiciones = np.random.default_rng(1).random((25, 2))
+    mejor_global = np.array([0.9, 0.2])
+
+    # Referencia: la actualización clásica, una partícula a la vez, con los mismos r1 y r2
+    sorteos = np.random.default_rng()
+    sorteos.bit_generator.state = enjambre.rng.bit_generator.state
+    r1, r2 = sorteos.random((25, 1)), sorteos.random((25, 1))
+    posiciones, velocidades = enjambre.posiciones.copy(), enjambre.velocidades.copy()
+    for i in range(25):
+        velocidad = 0.7 * velocidades[i] + 1.4 * r1[i] * (enjambre.mejores_posiciones[i] - posiciones[i]) \
+            + 1.4 * r2[i] * (mejor_global - posiciones[i])
+        velocidades[i] = np.clip(velocidad, -0.2, 0.2)
+        posiciones[i] = np.clip(posiciones[i] + velocidades[i], 0, 1)
+
+    enjambre.actualizar_enjambre(mejor_global)
+    assert np.allclose(enjambre.velocidades, velocidades, rtol=0, atol=1e-15)
+    assert np.allclose(enjambre.posiciones, posiciones, rtol=0, atol=1e-15)
+
+
+def test_evaluacion_por_lotes_igual_que_de_a_una():
+    enjambre = ControladorPSO(30, rng=np.random.default_rng(2))
+    controlador = ControladorGenetico(0.3, 0.4, 0.5)
+    oponentes = [2.5, 4.0, 7.0]
+    lote = enjambre.evaluar_adelantamientos(enjambre.posiciones, oponentes, None, controlador)
+    for i, posicion in enumerate(enjambre.posiciones):
+        assert lote[i] == pytest.approx(enjambre.evaluar_adelantamiento(posicion, oponentes, None, controlador))
+
+
+def test_particulas_son_vistas_del_enjambre():
+    enjambre = ControladorPSO(5, rng=np.random.default_rng(3))
+    particula = enjambre.particulas[2]
+    particula.posicion = [0.25, 0.75]
+    assert enjambre.posiciones[2].tolist() == [0.25, 0.75]
+    particula.mejor_fitness = 1.5
+    assert enjambre.mejores_fitness[2] == 1.5
+
+
+def correr(sistema, iteraciones):
+    for _ in range(iteraciones):
+        sistema.ejecutar_generacion_genetica()
+        sistema.ejecutar_hormigas()
+        sistema.ejecutar_pso()
+    return sistema
+
+
+def test_reanudar_checkpoint_igual_que_sin_interrumpir(tmp_path):
+    random.seed(5)
+    sistema = SistemaCarreras(semilla=5)
+    sistema.inicializar_poblacion_genetica()
+    completo = correr(sistema, 12)
+
+    random.seed(5)
+    sistema = SistemaCarreras(semilla=5)
+    sistema.inicializar_poblacion_genetica()
+    correr(sistema, 5).guardar_checkpoint(str(tmp_path / 'estado'))
+    random.seed(99)  # El checkpoint restaura el estado de `random`
+    reanudado = SistemaCarreras(semilla=0)
+    reanudado.cargar_checkpoint(str(tmp_path / 'estado'))
+    correr(reanudado, 7)
+
+    assert reanudado.historial_fitness == completo.historial_fitness
+    assert reanudado.mejor_tiempo == completo.mejor_tiempo
+    assert np.array_equal(reanudado.controlador_pso.posiciones, completo.controlador_pso.posiciones)
@@ -0,0 +1,151 @@
+"""Checkpoints binarios: ida y vuelta, escritura atómica y reanudación de la colonia de playlists."""
+import os
+
+import numpy as np
+import pytest
+
+from Comun.Checkpoint import (guardar_arreglos, cargar_arreglos, leer_meta, existe_checkpoint, comprobar_tipo,
+                              AutoCheckpoint)
+from Catalogo_Canciones import cargar_catalogo
+from Spotify import SistemaRecomendacion
+from Pokemon import AlgoritmoGeneticoVectorizado
+from Pista_Carreras import SistemaCarreras
+
+
+def test_ida_y_vuelta(tmp_path):
+    ruta = str(tmp_path / 'estado')
+    arreglos = {'a': np.arange(12.0).reshape(3, 4), 'b': np.array([1, 2], dtype=np.int8)}
+    guardar_arreglos(ruta, arreglos, {'tipo': 'Prueba', 'x': [1, 2]})
+    assert existe_checkpoint(ruta)
+
+    cargados, meta = cargar_arreglos(ruta)
+    assert meta['x'] == [1, 2] and leer_meta(ruta)['tipo'] == 'Prueba'
+    for nombre, arreglo in arreglos.items():
+        assert isinstance(cargados[nombre], np.memmap)
+        assert cargados[nombre].dtype == arreglo.dtype
+        assert np.array_equal(cargados[nombre], arreglo)
+
+
+def test_mapa_copia_en_escritura_no_toca_el_archivo(tmp_path):
+    ruta = str(tmp_path / 'estado')
+    guardar_arreglos(ruta, {'a': np.zeros(5)}, {})
+    cargados, _ = cargar_arreglos(ruta)
+    cargados['a'][:] = 7
+    assert np.array_equal(cargar_arreglos(ruta)[0]['a'], np.zeros(5))
+
+
+def test_escritura_fallida_conserva_el_anterior(tmp_path):
+    ruta = str(tmp_path / 'estado')
+    guardar_arreglos(ruta, {'a': np.ones(3)}, {'version': 1})
+    with pytest.raises(TypeError):
+        guardar_arreglos(ruta, {'a': np.zeros(3)}, {'version': object()})  # meta no serializable
+    arreglos, meta = cargar_arreglos(ruta)
+    assert meta['version'] == 1 and np.array_equal(arreglos['a'], np.ones(3))
+
+    guardar_arreglos(ruta, {'a': np.zeros(3)}, {'version': 2})
+    assert leer_meta(ruta)['version'] == 2
+    assert sorted(os.listdir(tmp_path)) == ['estado']
+
+
+def test_corte_entre_apartar_y_reemplazar_usa_el_anterior(tmp_path):
+    ruta = str(tmp_path / 'estado')
+    guardar_arreglos(ruta, {'a': np.ones(3)}, {'version': 1})
+    os.replace(ruta, ruta + '.old')  # Como si el proceso muriera antes de mover `ruta.tmp` a `ruta`
+    assert existe_checkpoint(ruta) and leer_meta(ruta)['version'] == 1
+    assert np.array_equal(cargar_arreglos(ruta)[0]['a'], np.ones(3))
+
+    guardar_arreglos(ruta, {'a': np.zeros(3)}, {'version': 2})
+    assert leer_meta(ruta)['version'] == 2
+    assert sorted(os.listdir(tmp_path)) == ['estado']
+
+
+def test_tipo_equivocado(tmp_path):
+    with pytest.raises(ValueError):
+        comprobar_tipo({'tipo': 'SistemaCarreras'}, 'AlgoritmoGenetico')
+
+
+def test_autocheckpoint_cada_n_pasos():
+    guardados = []
+    auto = AutoCheckpoint('ruta', guardados.append, cada=3)
+    assert [auto.paso() for _ in range(7)] == [False, False, True, False, False, True, False]
+    assert guardados == ['ruta', 'ruta']
+
+
+def correr(sistema, iteraciones, perfil='JazzFan'):
+    for _ in range(iteraciones):
+        sistema.ejecutar_iteracion(sistema.tipos_usuario[perfil], num_hormigas=20)
+    return sistema
+
+
+@pytest.mark.parametrize('dispersas', [False, True])
+def test_colonia_reanudada_igual_que_sin_interrumpir(tmp_path, dispersas):
+    completo = correr(SistemaRecomendacion(semilla=3, feromonas_dispersas=dispersas), 15)
+
+    ruta = str(tmp_path / 'estado')
+    correr(SistemaRecomendacion(semilla=3, feromonas_dispersas=dispersas), 6).guardar_checkpoint(ruta)
+    reanudado = SistemaRecomendacion(semilla=0, feromonas_dispersas=dispersas)
+    reanudado.cargar_checkpoint(ruta)
+    correr(reanudado, 9)
+
+    assert reanudado.historial_calidad == completo.historial_calidad
+    assert reanudado.mejor_playlist_global == completo.mejor_playlist_global
+    assert np.array_equal(reanudado.tau, completo.tau)
+
+
+def crear(clase):
+    if clase is SistemaRecomendacion:
+        return SistemaRecomendacion(semilla=3)
+    if clase is AlgoritmoGeneticoVectorizado:
+        objeto = AlgoritmoGeneticoVectorizado(20, 5, 0.1, 2, semilla=3)
+        objeto.inicializar_poblacion()
+        return objeto
+    objeto = SistemaCarreras(semilla=3)
+    objeto.inicializar_poblacion_genetica()
+    return objeto
+
+
+def arreglos_en_uso(objeto):
+    if isinstance(objeto, SistemaRecomendacion):
+        return [objeto.almacen.densa()]
+    if isinstance(objeto, AlgoritmoGeneticoVectorizado):
+        return [objeto.genes, objeto.tipos, objeto.fitness, objeto.sucios]
+    pso = objeto.controlador_pso
+    return [pso.posiciones, pso.velocidades, pso.mejores_posiciones, pso.mejores_fitness]
+
+
+@pytest.mark.parametrize('clase', [SistemaRecomendacion, AlgoritmoGeneticoVectorizado, SistemaCarreras])
+def test_reanudar_no_deja_el_checkpoint_mapeado(tmp_path, clase):
+    ruta = str(tmp_path / 'estado')
+    crear(clase).guardar_checkpoint(ruta)
+    reanudado = crear(clase)
+    reanudado.cargar_checkpoint(ruta)
+    # Un mapa vivo impediría reemplazar el directorio al volver a guardar en la misma ruta
+    assert not any(isinstance(arreglo, np.memmap) for arreglo in arreglos_en_uso(reanudado))
+    reanudado.guardar_checkpoint(ruta)
+    assert existe_checkpoint(ruta)
+
+
+def test_checkpoint_de_otro_catalogo(tmp_path):
+    ruta = str(tmp_path / 'estado')
+    SistemaRecomendacion(semilla=1).guardar_checkpoint(ruta)
+    otro = SistemaRecomendacion({'a': {'rock': 1.0}, 'b': {'rock': 0.5}})
+    with pytest.raises(ValueError):
+        otro.cargar_checkpoint(ruta)
+
+
+def test_catalogo_se_regenera_si_cambia_el_csv(tmp_path):
+    ruta_csv = str(tmp_path / 'canciones.csv')
+    with open(ruta_csv, 'w', encoding='utf-8') as archivo:
+        archivo.write('nombre,rock,jazz\nUno,0.1,0.9\nDos,0.8,0.2\n')
+    viejo = cargar_catalogo(ruta_csv)
+    assert list(viejo.nombres) == ['Uno', 'Dos']
+    assert cargar_catalogo(ruta_csv).huella == viejo.huella
+
+    with open(ruta_csv, 'w', encoding='utf-8') as archivo:
+        archivo.write('nombre,rock,jazz\nTres,0.5,0.5\nCuatro,0.3,0.7\nCinco,1.0,0.0\n')
+    os.utime(ruta_csv, ns=(0, 0))  # Firma distinta aunque el sistema de archivos tenga poca resolución
+    nuevo = cargar_catalogo(ruta_csv)
+
+    assert list(nuevo.nombres) == ['Tres', 'Cuatro', 'Cinco'] and nuevo.huella != viejo.huella
+    assert np.array_equal(viejo.caracteristicas, [[0.1, 0.9], [0.8, 0.2]])  # El mapa viejo sigue intacto
+    assert sorted(os.listdir(tmp_path)) == ['canciones.csv', 'canciones.csv.catalogo']
@@ -0,0 +1,101 @@
+"""Almacén disperso de feromonas contra la matriz densa."""
+import numpy as np
+import pytest
+
+import Almacen_Feromonas
+from Almacen_Feromonas import FeromonasDensas, FeromonasDispersas
+from Spotify import SistemaRecomendacion
+
+N = 40
+
+
+def mismas_operaciones(semilla, pasos=60, aristas=25):
+    """Los dos almacenes después de la misma secuencia aleatoria de evaporaciones y depósitos"""
+    rng = np.random.default_rng(semilla)
+    densa, dispersa = FeromonasDensas(N, 0.1), FeromonasDispersas(N, 0.1)
+    for _ in range(pasos):
+        if rng.random() < 0.5:
+            factor = rng.uniform(0.5, 0.99)
+            densa.evaporar(factor)
+            dispersa.evaporar(factor)
+        origenes = rng.integers(0, N, aristas)
+        destinos = (origenes + rng.integers(1, N, aristas)) % N
+        delta = rng.uniform(0.01, 1.0)
+        densa.depositar(origenes, destinos, delta)
+        dispersa.depositar(origenes, destinos, delta)
+    return densa, dispersa
+
+
+@pytest.fixture(params=[False, True], ids=['sin_fusionar', 'fusionando'])
+def pendientes(request, monkeypatch):
+    if request.param:
+        monkeypatch.setattr(Almacen_Feromonas, 'MIN_PENDIENTES', 8)
+    return request.param
+
+
+def test_igual_que_la_densa(pendientes):
+    densa, dispersa = mismas_operaciones(1)
+    assert (len(dispersa.claves) > 0) == pendientes  # Con el umbral chico ya se fusionó alguna vez
+    np.testing.assert_allclose(dispersa.densa(), densa.densa(), rtol=1e-12)
+
+    origenes = np.array([0, 5, 5, 39])
+    np.testing.assert_allclose(dispersa.filas(origenes), densa.filas(origenes), rtol=1e-12)
+    destinos = np.array([3, 5, 7, 0])
+    np.testing.assert_allclose(dispersa.valores(origenes, destinos), densa.valores(origenes, destinos), rtol=1e-12)
+    np.testing.assert_allclose(dispersa.masas_crudas(origenes) * dispersa.escala,
+                               densa.densa()[origenes].sum(axis=1), rtol=1e-12)
+    assert dispersa.entropia() == pytest.approx(densa.entropia(), rel=1e-12)
+    assert dispersa.deriva_acumulada == pytest.approx(densa.deriva_acumulada, rel=1e-9)
+
+
+def test_renormaliza_sin_cambiar_valores():
+    densa, dispersa = mismas_operaciones(2)
+    for _ in range(400):
+        densa.evaporar(0.3)
+        dispersa.evaporar(0.3)
+    assert dispersa.escala > Almacen_Feromonas.ESCALA_MINIMA
+    np.testing.assert_allclose(dispersa.densa(), densa.densa(), rtol=1e-9, atol=0)
+
+
+def test_asignar_y_deriva():
+    dispersa = FeromonasDispersas(N, 0.1)
+    marca = dispersa.marca()
+    dispersa.asignar(3, 4, 2.5)
+    assert dispersa.valores([3], [4])[0] == 2.5
+    assert dispersa.deriva(marca) == 1.0
+
+
+def test_podar_conserva_las_mas_recientes():
+    dispersa = FeromonasDispersas(N, 0.1, max_aristas=10)
+    for paso in range(30):
+        dispersa.depositar([paso % N], [(paso + 1) % N], 1.0)
+        dispersa.evaporar(0.9)
+    assert dispersa.num_aristas <= 10
+    dispersa.fusionar()
+    origenes = dispersa.claves // N
+    assert set(origenes) == set(range(20, 30))
+
+
+def test_arreglos_y_restaurar(pendientes):
+    _, dispersa = mismas_operaciones(3)
+    arreglos, meta = dispersa.arreglos()
+    copia = FeromonasDispersas(N, 0.0)
+    copia.restaurar(arreglos, meta)
+    assert np.array_equal(copia.densa(), dispersa.densa())
+
+
+def test_combinar_igual_en_los_dos_almacenes():
+    densa_a, dispersa_a = mismas_operaciones(4)
+    densa_b, dispersa_b = mismas_operaciones(5)
+    np.testing.assert_allclose(dispersa_a.combinar(dispersa_b, 0.3).densa(),
+                               densa_a.combinar(densa_b, 0.3).densa(), rtol=1e-12)
+
+
+def test_colonia_igual_con_los_dos_almacenes():
+    sistemas = [SistemaRecomendacion(semilla=7, feromonas_dispersas=dispersas) for dispersas in (False, True)]
+    for sistema in sistemas:
+        for _ in range(10):
+            sistema.ejecutar_iteracion(sistema.tipos_usuario['Rockero'], num_hormigas=20)
+    densa, dispersa = sistemas
+    assert dispersa.historial_calidad == pytest.approx(densa.historial_calidad, rel=1e-12)
+    assert dispersa.mejor_playlist_global == densa.mejor_playlist_global
@@ -0,0 +1,45 @@
+"""Feromonas por perfil guardadas entre sesiones."""
+import numpy as np
+import pytest
+
+from Memoria_Feromonas import MemoriaFeromonas
+from Spotify import SistemaRecomendacion
+
+
+@pytest.mark.parametrize('dispersas', [False, True])
+def test_guardar_calentar_y_mezclar(tmp_path, dispersas):
+    memoria = MemoriaFeromonas(str(tmp_path), peso_mezcla=0.25)
+    sistema = SistemaRecomendacion(semilla=1, feromonas_dispersas=dispersas)
+    preferencias = sistema.tipos_usuario['JazzFan']
+    assert not memoria.calentar(sistema, preferencias)
+
+    for _ in range(5):
+        sistema.ejecutar_iteracion(preferencias, num_hormigas=20)
+    aprendido = sistema.almacen.densa().copy()
+    memoria.guardar_sistema(sistema, preferencias)
+
+    nuevo = SistemaRecomendacion(semilla=2, feromonas_dispersas=dispersas)
+    assert memoria.calentar(nuevo, preferencias)
+    # Sin mapas de los archivos vivos: sincronizar tiene que poder reemplazar el directorio
+    assert not any(isinstance(arreglo, np.memmap) for arreglo in nuevo.almacen.arreglos()[0].values())
+    np.testing.assert_allclose(nuevo.almacen.densa(), aprendido, rtol=1e-12)
+
+    # La segunda sesión se mezcla con lo guardado: 0.75 * guardado + 0.25 * actual
+    nuevo.ejecutar_iteracion(preferencias, num_hormigas=20)
+    actual = nuevo.almacen.densa().copy()
+    memoria.guardar_sistema(nuevo, preferencias)
+    tercero = SistemaRecomendacion(feromonas_dispersas=dispersas)
+    assert memoria.calentar(tercero, preferencias)
+    np.testing.assert_allclose(tercero.almacen.densa(), 0.75 * aprendido + 0.25 * actual, rtol=1e-12)
+
+
+def test_otro_catalogo_u_otro_almacen_arranca_en_frio(tmp_path):
+    memoria = MemoriaFeromonas(str(tmp_path))
+    sistema = SistemaRecomendacion(semilla=1)
+    preferencias = sistema.tipos_usuario['Rockero']
+    memoria.guardar_sistema(sistema, preferencias)
+
+    assert not memoria.calentar(SistemaRecomendacion(feromonas_dispersas=True), preferencias)
+    otro = SistemaRecomendacion({'a': {'rock': 1.0}, 'b': {'rock': 0.5}})
+    assert not memoria.calentar(otro, preferencias)
+    assert not memoria.calentar(SistemaRecomendacion(), sistema.tipos_usuario['JazzFan'])
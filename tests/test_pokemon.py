@@ -0,0 +1,99 @@
+"""Motores del algoritmo genético de Pokémon: reproducibilidad, equivalencias y checkpoints."""
+import numpy as np
+import pytest
+
+import Pokemon
+from Pokemon import AlgoritmoGenetico, AlgoritmoGeneticoVectorizado, TIPOS
+from Estacionario import AlgoritmoGeneticoEstacionario
+from Cache_Fitness import CacheFitness
+from Islas import ModeloIslas
+
+
+def crear(clase, semilla=7, **opciones):
+    ag = clase(40, 30, 0.2, 2, semilla=semilla, **opciones)
+    ag.inicializar_poblacion()
+    return ag
+
+
+def correr(ag, generaciones):
+    for _ in range(generaciones):
+        ag.ejecutar_generacion()
+    return ag.historial_fitness
+
+
+@pytest.mark.parametrize('clase', [AlgoritmoGenetico, AlgoritmoGeneticoVectorizado, AlgoritmoGeneticoEstacionario])
+def test_misma_semilla_mismo_historial(clase):
+    assert correr(crear(clase), 25) == correr(crear(clase), 25)
+    assert correr(crear(clase), 25) != correr(crear(clase, semilla=8), 25)
+
+
+def test_semilla_no_depende_del_modulo_random():
+    import random
+    random.seed(1)
+    a = correr(crear(AlgoritmoGenetico), 10)
+    random.seed(2)
+    assert correr(crear(AlgoritmoGenetico), 10) == a
+
+
+@pytest.mark.parametrize('modo', ['ruleta', 'alias', 'torneo', 'rango'])
+def test_cache_no_cambia_el_resultado(modo):
+    sin_cache = correr(crear(AlgoritmoGenetico, modo_seleccion=modo), 20)
+    ag = crear(AlgoritmoGenetico, modo_seleccion=modo, cache=CacheFitness())
+    assert correr(ag, 20) == sin_cache
+    assert ag.cache.aciertos > 0
+
+
+def test_fitness_vectorizado_igual_al_de_objetos():
+    ag = crear(AlgoritmoGeneticoVectorizado)
+    ag.evaluar_poblacion()
+    for i in range(len(ag.genes)):
+        pokemon = Pokemon.Pokemon(*ag.genes[i].tolist(), TIPOS[ag.tipos[i]])
+        assert ag.fitness[i] == pytest.approx(pokemon.calcular_fitness(), rel=1e-12)
+
+
+@pytest.mark.parametrize('clase', [AlgoritmoGenetico, AlgoritmoGeneticoVectorizado])
+def test_estadisticas_coinciden_con_la_poblacion(clase):
+    ag = crear(clase)
+    correr(ag, 5)
+    ag.evaluar_poblacion()
+    fitness = np.array([p.fitness for p in ag.poblacion])
+    mejor, promedio, peor = ag.estadisticas
+    assert (mejor, peor) == (fitness.max(), fitness.min())
+    assert promedio == pytest.approx(fitness.mean())
+    assert ag.mejor_historico.fitness >= mejor
+
+
+@pytest.mark.parametrize('clase', [AlgoritmoGenetico, AlgoritmoGeneticoVectorizado])
+def test_elitismo_mayor_que_la_poblacion(clase):
+    ag = clase(5, 3, 0.1, 8, semilla=1)
+    ag.inicializar_poblacion()
+    assert len(correr(ag, 3)) == 3
+    assert len(ag.poblacion) == 5
+
+
+def test_estacionario_mantiene_la_poblacion_ordenada():
+    ag = crear(AlgoritmoGeneticoEstacionario, hijos_por_paso=3)
+    for mejor, promedio, peor in correr(ag, 40):
+        fitness = [p.fitness for p in ag.poblacion]
+    assert fitness == sorted(fitness, reverse=True)
+    assert (mejor, peor) == (fitness[0], fitness[-1])
+    assert promedio == pytest.approx(np.mean(fitness))
+
+
+@pytest.mark.parametrize('clase', [AlgoritmoGenetico, AlgoritmoGeneticoVectorizado])
+def test_reanudar_checkpoint_igual_que_sin_interrumpir(clase, tmp_path):
+    completo = correr(crear(clase), 20)
+
+    ag = crear(clase)
+    correr(ag, 8)
+    ag.guardar_checkpoint(str(tmp_path / 'estado'))
+    reanudado = clase(1, 1, 0.0, 0)
+    reanudado.cargar_checkpoint(str(tmp_path / 'estado'))
+    assert correr(reanudado, 12) == completo
+
+
+def test_islas_mejor_historico_sale_del_historial():
+    for semilla in range(4):
+        with ModeloIslas(3, 40, 20, 0.2, 2, 5, semilla=semilla, procesos=False) as modelo:
+            historial = modelo.ejecutar()
+        assert modelo.mejor_historico.fitness == max(mejor for mejor, _, _ in historial)
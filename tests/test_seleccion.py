@@ -0,0 +1,56 @@
+"""Selectores por lotes: las probabilidades de cada modo son las de la ruleta clásica."""
+import numpy as np
+import pytest
+
+from Comun.Seleccion import SelectorAlias, SelectorRuleta, SelectorRango, crear_selector, MODOS_SELECCION
+
+
+def probabilidades_alias(selector):
+    """Probabilidad exacta de cada índice según la tabla alias"""
+    p = selector.probabilidad.copy()
+    np.add.at(p, selector.alias, 1 - selector.probabilidad)
+    return p / selector.n
+
+
+@pytest.mark.parametrize('fitness', [
+    np.array([1.0, 2.0, 3.0, 4.0]),
+    np.random.default_rng(0).random(1000),
+    np.array([0.0, 0.0, 5.0, 0.0, 1.0]),
+])
+def test_tabla_alias_reproduce_las_proporciones(fitness):
+    selector = SelectorAlias(fitness, np.random.default_rng(0))
+    assert probabilidades_alias(selector) == pytest.approx(fitness / fitness.sum(), abs=1e-12)
+
+
+@pytest.mark.parametrize('clase', [SelectorRuleta, SelectorAlias])
+def test_frecuencias_proporcionales_al_fitness(clase):
+    fitness = np.array([1.0, 2.0, 3.0, 4.0, 0.0])
+    indices = clase(fitness, np.random.default_rng(1)).muestrear(200_000)
+    frecuencias = np.bincount(indices, minlength=len(fitness)) / len(indices)
+    assert frecuencias == pytest.approx(fitness / fitness.sum(), abs=0.005)
+    assert frecuencias[-1] == 0
+
+
+@pytest.mark.parametrize('modo', MODOS_SELECCION)
+def test_fitness_nulo_sortea_uniforme(modo):
+    indices = crear_selector(modo, np.zeros(10), np.random.default_rng(2)).muestrear(50_000)
+    assert indices.min() >= 0 and indices.max() < 10
+    if modo != 'rango':
+        assert np.bincount(indices, minlength=10) / len(indices) == pytest.approx(np.full(10, 0.1), abs=0.01)
+
+
+def test_rango_depende_solo_del_orden():
+    a = SelectorRango(np.array([0.1, 5.0, 3.0]), np.random.default_rng(3))
+    b = SelectorRango(np.array([1.0, 100.0, 2.0]), np.random.default_rng(3))
+    assert np.array_equal(a.muestrear(1000), b.muestrear(1000))
+
+
+def test_torneo_elige_al_mejor_de_cada_grupo():
+    fitness = np.random.default_rng(4).random(50)
+    selector = crear_selector('torneo', fitness, np.random.default_rng(5), tamano_torneo=50)
+    assert (selector.muestrear(100) == np.argmax(fitness)).mean() > 0.5
+
+
+def test_modo_desconocido():
+    with pytest.raises(ValueError):
+        crear_selector('sorteo', np.ones(3), np.random.default_rng())
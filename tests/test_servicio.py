@@ -0,0 +1,85 @@
+"""Servicio de playlists: toda línea recibe respuesta y un lote que falla no detiene el servicio."""
+import asyncio
+import json
+
+import pytest
+
+from Servicio_Playlists import ServicioPlaylists
+
+
+async def conversar(servicio, lineas, antes_de=None):
+    """Respuestas del servicio a `lineas`, enviadas de a una por una conexión TCP local
+
+    `antes_de(i)` se llama antes de enviar la línea i (para cambiar el servicio entre pedidos).
+    """
+    await servicio.iniciar()
+    servidor = await asyncio.start_server(servicio.atender_conexion, '127.0.0.1', 0)
+    puerto = servidor.sockets[0].getsockname()[1]
+    lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+    respuestas = []
+    try:
+        for i, linea in enumerate(lineas):
+            if antes_de is not None:
+                antes_de(i)
+            escritor.write((linea + '\n').encode('utf-8'))
+            await escritor.drain()
+            respuestas.append(json.loads(await asyncio.wait_for(lector.readline(), 30)))
+    finally:
+        escritor.close()
+        servidor.close()
+        await servicio.cerrar()
+    return respuestas
+
+
+@pytest.mark.parametrize('linea', [
+    '{"id": 1, "preferencias": [1, 2]}',
+    '{"id": 1, "preferencias": {}}',
+    '{"id": 1, "preferencias": {"rock": "mucho"}}',
+    '{"id": 1, "preferencias": {"rock": NaN}}',
+    '{"id": 1, "preferencias": {"rock": true}}',
+    '{"id": 1, "perfil": "Rockero", "longitud": "x"}',
+    '{"id": 1, "perfil": "Rockero", "longitud": 0}',
+    '{"id": 1, "perfil": "Rockero", "longitud": 2.5}',
+    '{"id": 1, "perfil": ["Rockero"]}',
+    '{"id": 1, "perfil": "Nadie"}',
+    '{"id": 1, "perfil": "Rockero", "inicio": [1]}',
+    '{"id": 1, "perfil": "Rockero", "inicio": "no existe"}',
+    '{"id": 1, "orden": "apagar"}',
+    '{"id": 1}',
+])
+def test_pedido_mal_formado_recibe_error_con_su_id(linea):
+    respuesta, = asyncio.run(conversar(ServicioPlaylists(), [linea]))
+    assert set(respuesta) == {'id', 'error'} and respuesta['id'] == 1
+
+
+@pytest.mark.parametrize('linea', ['no es json', '[1, 2]', '"texto"'])
+def test_linea_que_no_es_un_objeto(linea):
+    respuesta, = asyncio.run(conversar(ServicioPlaylists(), [linea]))
+    assert set(respuesta) == {'error'}
+
+
+def test_pedido_valido_y_metricas():
+    servicio = ServicioPlaylists()
+    playlist, metricas = asyncio.run(conversar(servicio, [
+        '{"id": 7, "preferencias": {"rock": 0.3, "jazz": 0.9}, "longitud": 4, "inicio": "song3"}',
+        '{"orden": "metricas"}',
+    ]))
+    assert playlist['id'] == 7 and len(playlist['playlist']) == 4 and playlist['playlist'][0] == 'song3'
+    assert metricas['pedidos'] == 1 and metricas['errores'] == 0
+
+
+def test_lote_que_falla_no_detiene_el_servicio():
+    servicio = ServicioPlaylists()
+    atender_lote = servicio.atender_lote
+
+    def fallar(lote):
+        raise OSError("disco lleno")
+
+    def antes_de(i):
+        servicio.atender_lote = fallar if i == 0 else atender_lote
+
+    fallido, siguiente = asyncio.run(conversar(servicio, ['{"id": 1, "perfil": "Rockero"}',
+                                                          '{"id": 2, "perfil": "Rockero"}'], antes_de))
+    assert fallido['id'] == 1 and 'disco lleno' in fallido['error']
+    assert siguiente['id'] == 2 and len(siguiente['playlist']) == 8
+    assert servicio.errores == 1
@@ -0,0 +1,55 @@
+"""Vecinos más cercanos: la rejilla da lo mismo que la fuerza bruta."""
+import warnings
+
+import numpy as np
+import pytest
+
+import Vecinos_Cercanos
+from Vecinos_Cercanos import vecinos_mas_cercanos, vecinos_rejilla, vecinos_fuerza_bruta
+
+
+def catalogos():
+    rng = np.random.default_rng(0)
+    uniforme = rng.random((8000, 5))
+    centros = rng.random((6, 5))
+    agrupado = centros[rng.integers(0, 6, 8000)] + rng.normal(0, 0.01, (8000, 5))
+    duplicados = np.repeat(rng.random((2000, 3)), 4, axis=0)
+    return {'uniforme': uniforme, 'agrupado': agrupado, 'duplicados': duplicados}
+
+
+@pytest.mark.parametrize('nombre', ['uniforme', 'agrupado', 'duplicados'])
+def test_rejilla_igual_que_fuerza_bruta(nombre):
+    caracteristicas = catalogos()[nombre]
+    rejilla = vecinos_rejilla(caracteristicas, 10, bloque=200_000)
+    assert rejilla is not None
+    indices, distancias = rejilla
+    _, esperadas = vecinos_fuerza_bruta(caracteristicas, 10, 4_000_000)
+    np.testing.assert_allclose(distancias, esperadas, rtol=1e-12, atol=1e-12)
+
+    # Los índices pueden diferir solo entre empatados: sus distancias tienen que coincidir
+    reales = np.linalg.norm(caracteristicas[indices] - caracteristicas[:, None, :], axis=2)
+    np.testing.assert_allclose(reales, distancias, rtol=1e-12, atol=1e-12)
+    assert not (indices == np.arange(len(caracteristicas))[:, None]).any()
+
+
+def test_rejilla_no_se_usa_en_catalogos_chicos():
+    assert vecinos_rejilla(np.random.default_rng(1).random((50, 4)), 5) is None
+    assert vecinos_rejilla(np.ones((5000, 3)), 5) is None  # Sin rango no hay rejilla
+
+
+def test_nunca_incluye_a_la_propia_cancion():
+    caracteristicas = np.random.default_rng(2).random((300, 4))
+    indices, distancias = vecinos_mas_cercanos(caracteristicas, 400)
+    assert indices.shape == (300, 299)
+    assert not (indices == np.arange(300)[:, None]).any()
+    assert (np.diff(distancias, axis=1) >= 0).all()
+
+
+def test_fuerza_bruta_grande_avisa(monkeypatch):
+    monkeypatch.setattr(Vecinos_Cercanos, 'cKDTree', None)
+    monkeypatch.setattr(Vecinos_Cercanos, 'AVISO_FUERZA_BRUTA', 100)
+    with pytest.warns(RuntimeWarning, match='fuerza bruta'):
+        vecinos_mas_cercanos(np.random.default_rng(3).random((200, 4)), 5)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        vecinos_mas_cercanos(np.random.default_rng(3).random((99, 4)), 5)